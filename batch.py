@@ -0,0 +1,162 @@
+"""
+헤드리스 배치: 프로젝트를 한 번 로드하고 JSONL 파일의 요청마다 최종 프롬프트를 만들어 JSONL로 저장
+(화면 없이 main.py와 같은 파이프라인: 분석(파일 선택) → 최종 프롬프트)
+
+사용법 (프로젝트 루트에서, Ollama가 실행 중이어야 함):
+    python batch.py --project D:/work/shop --input tasks.jsonl --output prompts.jsonl
+        [--model phi3:mini] [--concurrency 2] [--field request] [--id-field id]
+        [--race-mode race --race-models qwen2.5:1.5b,llama3.2:1b] [--resume] [--quiet]
+
+입력 줄: {"id": "t-1", "request": "결제 실패 시 장바구니 유지"} 또는 "요청 문장"
+출력 줄: id, request, state, model, analysis, prompt, error, timings(wait/first_token/run/prompt 초)
+  - 끝나는 순서대로 한 줄씩 바로 기록 (--resume: 이미 완료된 id는 건너뛰고 이어서 기록)
+  - 요청별 시간은 표준 출력, 파이프라인 로그는 표준 오류 (--quiet면 버림)
+종료 코드: 0 = 모두 완료, 1 = 실패/중지된 요청 있음, 2 = 실행 불가 (Ollama 꺼짐, 입력 오류 등)
+"""
+
+import os
+import sys
+import time
+import argparse
+import contextlib
+
+from controllers.batch_runner import load_finished_ids, load_requests, run_batch
+from utils.model_race import RACE_MODES
+from utils.ollama_health import get_health_monitor
+from utils.ollama_http import STATUS_TIMEOUT
+from utils.ollama_manager import apply_ollama_model, list_ollama_models
+from utils.request_scheduler import DONE
+from viewmodels.prompt_viewmodel import DEFAULT_MODEL, PromptViewModel
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="JSONL 요청 파일로 프롬프트를 한꺼번에 생성 (화면 없음)"
+    )
+    parser.add_argument("--project", required=True, help="분석할 프로젝트 폴더")
+    parser.add_argument("--input", required=True, help="요청 JSONL 파일")
+    parser.add_argument("--output", required=True, help="결과 JSONL 파일")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="동시 분석 요청 수 (기본: OLLAMA_NUM_PARALLEL, 없으면 1)",
+    )
+    parser.add_argument("--field", default="request", help="요청 문장 필드 이름")
+    parser.add_argument("--id-field", default="id", help="요청 id 필드 이름")
+    parser.add_argument("--race-mode", choices=RACE_MODES, default=None)
+    parser.add_argument(
+        "--race-models", default="", help="경주에 함께 보낼 모델 (쉼표로 구분)"
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="출력 파일에서 완료된 요청은 건너뜀"
+    )
+    parser.add_argument("--quiet", action="store_true", help="파이프라인 로그 숨김")
+    return parser.parse_args(argv)
+
+
+def _report(message):
+    print(message, file=sys.__stdout__, flush=True)
+
+
+def _prepare(args, viewmodel):
+    """Ollama/모델/프로젝트 준비 → 실패하면 오류 문구 (성공하면 None)"""
+    snapshot = get_health_monitor().wait_first_check(STATUS_TIMEOUT + 1)
+    if not snapshot.up:
+        return f"Ollama가 꺼져 있습니다: {snapshot.error}"
+    _report(snapshot.status_text())
+
+    race_models = [m.strip() for m in args.race_models.split(",") if m.strip()]
+    installed = list_ollama_models()
+    missing = [m for m in [args.model] + race_models if m not in installed]
+    if missing:
+        return f"설치되지 않은 모델: {', '.join(missing)}"
+
+    _report(f"⏳ {args.model} 올리는 중...")
+    if not apply_ollama_model(args.model):
+        return f"모델을 올리지 못했습니다: {args.model}"
+    viewmodel.set_current_model(args.model)
+    viewmodel.set_race_mode(args.race_mode, race_models)
+    if args.concurrency:
+        viewmodel.scheduler.set_concurrency(args.concurrency)
+
+    start = time.perf_counter()
+    success, msg, used_cache = viewmodel.load_project(args.project)
+    if not success:
+        return msg
+    _report(
+        f"📁 프로젝트 로드 ({time.perf_counter() - start:.1f}s, "
+        f"{'캐시 사용' if used_cache else '새로 분석'}): {args.project}"
+    )
+    return None
+
+
+def run(args):
+    try:
+        jobs = load_requests(args.input, args.field, args.id_field)
+    except (OSError, ValueError) as e:
+        _report(f"❌ 요청 파일을 읽지 못했습니다: {e}")
+        return 2
+    skipped = 0
+    if args.resume:
+        finished_ids = load_finished_ids(args.output)
+        skipped = sum(1 for job_id, _ in jobs if job_id in finished_ids)
+        jobs = [(job_id, text) for job_id, text in jobs if job_id not in finished_ids]
+
+    viewmodel = PromptViewModel()
+    error = _prepare(args, viewmodel)
+    if error:
+        _report(f"❌ {error}")
+        return 2
+
+    total = len(jobs)
+    _report(
+        f"🚀 요청 {total}개 시작 (건너뜀 {skipped}, "
+        f"{viewmodel.scheduler.status_text()})"
+    )
+    counts = {"done": 0}
+
+    def on_record(record, request):
+        counts["done"] += 1
+        prompt_seconds = record["timings"]["prompt"]
+        _report(
+            f"[{counts['done']}/{total}] {record['id']} · {request.summary_text()}"
+            f" · 프롬프트 {prompt_seconds:.2f}s"
+        )
+
+    start = time.perf_counter()
+    records = []
+    with open(args.output, "a" if args.resume else "w", encoding="utf-8") as out:
+        try:
+            records = run_batch(viewmodel, jobs, out, on_record)
+        except KeyboardInterrupt:
+            _report("🛑 중지됨 (끝난 요청은 저장됨, --resume 으로 이어서 실행)")
+            return 1
+
+    elapsed = time.perf_counter() - start
+    completed = [r for r in records if r["state"] == DONE]
+    runs = [r["timings"]["run"] for r in completed if r["timings"]["run"] is not None]
+    average = sum(runs) / len(runs) if runs else 0.0
+    _report(
+        f"✅ 완료 {len(completed)}/{total} · 전체 {elapsed:.1f}s · "
+        f"요청당 평균 실행 {average:.1f}s → {args.output}"
+    )
+    return 0 if len(completed) == total else 1
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    # 파이프라인의 print 로그는 표준 오류로 (표준 출력에는 요청별 결과 줄만)
+    with contextlib.ExitStack() as stack:
+        log = (
+            stack.enter_context(open(os.devnull, "w", encoding="utf-8"))
+            if args.quiet
+            else sys.stderr
+        )
+        stack.enter_context(contextlib.redirect_stdout(log))
+        return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
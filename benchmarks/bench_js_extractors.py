@@ -0,0 +1,78 @@
+"""
+JS/TS 함수 추출: Node(Babel) 상주 프로세스 vs Python 토크나이저 비교
+
+사용법 (프로젝트 루트에서):
+    python benchmarks/bench_js_extractors.py <대상 폴더> [--show-diff N]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.project_scanner import scan_project
+from utils.js_extractor import ExtractionError, extract_js_functions_batch
+
+JS_EXTENSIONS = {".js", ".jsx", ".ts", ".tsx"}
+
+
+def _timed(mode, paths):
+    start = time.perf_counter()
+    result = extract_js_functions_batch(paths, mode=mode)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("target")
+    parser.add_argument("--show-diff", type=int, default=10)
+    args = parser.parse_args()
+
+    manifest = scan_project(args.target)
+    entries = list(manifest.iter_files(None, JS_EXTENSIONS))
+    paths = [e.path for e in entries]
+    total_mb = sum(e.size for e in entries) / (1024 * 1024)
+    print(f"📄 대상 파일: {len(paths)}개 ({total_mb:.2f} MB)")
+    if not paths:
+        return
+
+    py_result, py_time = _timed("python", paths)
+    print(
+        f"⚡ Python 토크나이저: {py_time:.3f}s "
+        f"({len(paths) / py_time:.0f} files/s, {total_mb / py_time:.1f} MB/s)"
+    )
+
+    node_result, node_time = _timed("node", paths)
+    print(
+        f"🟢 Node(Babel) 풀   : {node_time:.3f}s "
+        f"({len(paths) / node_time:.0f} files/s, {total_mb / node_time:.1f} MB/s)"
+    )
+
+    same = 0
+    diffs = []
+    for path in paths:
+        node_funcs = node_result.get(path, [])
+        if isinstance(node_funcs, ExtractionError):
+            continue  # Babel이 파싱하지 못한 파일은 비교 제외
+        if py_result.get(path, []) == node_funcs:
+            same += 1
+        else:
+            diffs.append(path)
+
+    compared = same + len(diffs)
+    if compared:
+        print(f"🔍 출력 일치: {same}/{compared} ({same / compared:.1%})")
+    for path in diffs[: args.show_diff]:
+        py_set = set(py_result.get(path, []))
+        node_set = set(node_result.get(path, []))
+        print(f"\n📄 {os.path.relpath(path, args.target)}")
+        for line in sorted(node_set - py_set):
+            print(f"  - Node만: {line}")
+        for line in sorted(py_set - node_set):
+            print(f"  + Python만: {line}")
+
+
+if __name__ == "__main__":
+    main()
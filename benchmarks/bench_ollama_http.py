@@ -0,0 +1,95 @@
+"""
+Ollama 호출: 호출마다 새 연결(requests.get/post) vs 공유 keep-alive 세션(OllamaHTTPClient)
+
+스텁 서버를 띄우고 앱 시작 시의 상태 확인 묶음(실행 여부 + 모델 목록 + 모델 준비 확인)과
+비스트리밍 generate 호출을 반복해 호출당 시간과 새로 맺은 TCP 연결 수를 비교합니다.
+
+사용법 (프로젝트 루트에서):
+    python benchmarks/bench_ollama_http.py [--rounds 300] [--threads 4]
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_ollama_server import StubOllamaHandler, start_stub_server
+from utils.ollama_http import OllamaHTTPClient
+
+
+def _status_bare(base_url):
+    requests.get(base_url, timeout=3)
+    requests.get(f"{base_url}/api/tags", timeout=3).json()
+    requests.get(f"{base_url}/api/tags", timeout=3).json()
+    requests.post(
+        f"{base_url}/api/generate",
+        json={"model": "stub", "prompt": "Hello", "stream": False},
+        timeout=5,
+    ).json()
+
+
+def _status_pooled(client):
+    client.is_running()
+    client.list_models()
+    client.list_models()
+    client.generate({"model": "stub", "prompt": "Hello", "stream": False}).json()
+
+
+CALLS_PER_ROUND = 4
+
+
+def _measure(label, fn, rounds, threads):
+    StubOllamaHandler.connections = 0
+    per_thread = max(1, rounds // threads)
+
+    def worker():
+        for _ in range(per_thread):
+            fn()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+
+    calls = per_thread * threads * CALLS_PER_ROUND
+    print(
+        f"{label:<18} {elapsed:6.2f}s  {elapsed / calls * 1000:6.3f} ms/호출  "
+        f"{calls / elapsed:7.0f} 호출/s  새 연결 {StubOllamaHandler.connections}개"
+    )
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=300)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server()
+    client = OllamaHTTPClient(base_url, pool_size=args.threads)
+    print(f"🧪 스텁 서버 {base_url}, 라운드 {args.rounds} × 호출 {CALLS_PER_ROUND}")
+
+    for threads in sorted({1, args.threads}):
+        print(f"── 스레드 {threads}개")
+        bare = _measure(
+            "새 연결 (기존)", lambda: _status_bare(base_url), args.rounds, threads
+        )
+        pooled = _measure(
+            "공유 세션", lambda: _status_pooled(client), args.rounds, threads
+        )
+        print(f"   → {bare / pooled:.1f}배")
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+파일 선택 프롬프트: 요청마다 달라지는 프롬프트(기존) vs 고정 접두부 + keep_alive(세션 모드)
+
+대상 폴더를 임시 폴더에 복사해 로드한 뒤, 같은 질문 묶음을 스텁 서버에 차례로 보내
+요청마다 새로 평가한 프롬프트 토큰 수(prompt_eval_count)와 걸린 시간을 비교합니다.
+스텁 서버는 Ollama처럼 직전 프롬프트와 겹치는 앞부분을 다시 평가하지 않습니다.
+(구조가 예산을 넘는 큰 프로젝트일수록 차이가 큼: 기존 방식은 질문마다 구조 요약이 달라짐)
+
+사용법 (프로젝트 루트에서):
+    python benchmarks/bench_prompt_prefix.py <대상 폴더> [--eval-ms 0.5]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_ollama_server import StubOllamaHandler, start_stub_server
+from utils.ollama_http import configure_client, get_client
+from utils.token_budget import get_num_ctx
+
+QUESTIONS = [
+    "로그인 세션 만료 처리를 고치고 싶어",
+    "설정 파일을 읽는 부분에 기본값을 추가해줘",
+    "테스트가 느린 이유를 찾아줘",
+    "HTTP 요청 재시도 로직을 어디서 바꾸면 돼?",
+    "캐시 저장 경로를 사용자 폴더로 옮기고 싶어",
+    "로그 메시지를 영어로 바꿔줘",
+]
+MODEL = "stub"
+
+
+def _ask(prompt, options, keep_alive):
+    from utils.ollama_client import FILE_SELECTION_RULES
+
+    payload = {
+        "model": MODEL,
+        "prompt": FILE_SELECTION_RULES + prompt,
+        "stream": False,
+        "options": options,
+    }
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    return get_client().generate(payload, timeout=600).json()["prompt_eval_count"]
+
+
+def _run(vm, session_mode, options):
+    from utils.ollama_client import prewarm_prompt
+
+    StubOllamaHandler.prompt_cache.clear()
+    vm.session_mode = session_mode
+    vm._stream_prefix = None
+    label = "세션 모드" if session_mode else "기존"
+
+    warm = 0
+    if session_mode:
+        warm = prewarm_prompt(
+            MODEL, vm.stream_prompt_prefix(MODEL), options, vm.stream_keep_alive()
+        )["prompt_eval_count"]
+
+    evaluated = []
+    start = time.perf_counter()
+    for question in QUESTIONS:
+        prompt = vm.build_stream_prompt(question)
+        evaluated.append(_ask(prompt, options, vm.stream_keep_alive()))
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{label:<8} 질문 {len(QUESTIONS)}개 {elapsed:6.2f}s  "
+        f"평가 토큰 {sum(evaluated):6d} (질문별 {evaluated})"
+        + (f"  예열 {warm}토큰" if warm else "")
+    )
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("target")
+    parser.add_argument("--eval-ms", type=float, default=0.5, help="토큰당 평가 시간")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server()
+    configure_client(base_url)
+    StubOllamaHandler.eval_delay_per_token = args.eval_ms / 1000
+
+    from viewmodels.prompt_viewmodel import PromptViewModel
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = os.path.join(tmp, os.path.basename(os.path.abspath(args.target)))
+        shutil.copytree(args.target, project, ignore=shutil.ignore_patterns(".git"))
+        vm = PromptViewModel()
+        vm.session_mode = False  # 로드 직후 백그라운드 예열이 측정에 섞이지 않도록
+        vm.current_model = MODEL
+        vm.load_project(project)
+        options = {"num_ctx": get_num_ctx(MODEL)}  # 앱과 같은 컨텍스트 크기
+
+        print(f"🧪 스텁 서버 {base_url}, 토큰당 평가 {args.eval_ms}ms")
+        baseline = _run(vm, False, options)
+        session = _run(vm, True, options)
+        print(f"   → {baseline / session:.1f}배")
+        vm.stop_watching()
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
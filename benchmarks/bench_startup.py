@@ -0,0 +1,107 @@
+"""
+앱 시작 시간: 프로세스 실행 → 첫 화면을 그릴 때까지
+
+main.py를 GPT_ASSISTANT_STARTUP_PROBE=1 로 여러 번 실행해 구간별 시간을 모읍니다.
+(첫 화면을 그린 직후 STARTUP_READY 줄을 출력하고 종료하는 모드)
+  - wall: 이 스크립트가 잰 실행 → 종료 시간 (PyInstaller 단일 파일이면 압축 해제 포함)
+  - import / build / paint / total: 앱 안에서 잰 구간 (인터프리터 시작 이후)
+--max-ms 를 주면 wall 중앙값이 넘을 때 종료 코드 1 (회귀 확인용)
+
+사용법 (프로젝트 루트에서, 화면(디스플레이)이 필요):
+    python benchmarks/bench_startup.py [--runs 5] [--importtime]
+    python benchmarks/bench_startup.py --exe dist/main.exe [--max-ms 3000]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROBE_ENV = "GPT_ASSISTANT_STARTUP_PROBE"
+_READY_RE = re.compile(r"STARTUP_READY (.*)")
+_IMPORT_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)")
+
+
+def _run_once(cmd, timeout):
+    env = dict(os.environ, **{PROBE_ENV: "1"})
+    start = time.perf_counter()
+    proc = subprocess.run(
+        cmd, cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout
+    )
+    wall = (time.perf_counter() - start) * 1000
+    match = _READY_RE.search(proc.stdout)
+    if match is None:
+        raise RuntimeError(
+            f"STARTUP_READY 출력 없음 (종료 코드 {proc.returncode})\n{proc.stderr[-2000:]}"
+        )
+    values = {k: float(v) for k, v in (p.split("=") for p in match.group(1).split())}
+    values["wall_ms"] = wall
+    return values
+
+
+def _print_importtime(limit=15):
+    """python -X importtime 으로 시작 시 불러오는 모듈 중 누적 시간이 큰 것"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import views.main_view"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORT_RE.match(line)
+        if match:
+            self_us, cumulative_us, name = match.groups()
+            rows.append((int(cumulative_us), int(self_us), name))
+    rows.sort(reverse=True)
+    print(f"── import 누적 시간 상위 {limit}개 (views.main_view 기준)")
+    for cumulative_us, self_us, name in rows[:limit]:
+        print(f"  {cumulative_us / 1000:7.1f}ms (자체 {self_us / 1000:5.1f}ms)  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--exe", help="PyInstaller로 만든 실행 파일 (없으면 python main.py)"
+    )
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--max-ms", type=float, help="wall 중앙값 한도 (넘으면 실패)")
+    parser.add_argument("--importtime", action="store_true")
+    args = parser.parse_args()
+
+    cmd = [os.path.abspath(args.exe)] if args.exe else [sys.executable, "main.py"]
+    print(f"🚀 {' '.join(cmd)} × {args.runs}")
+    runs = []
+    for i in range(args.runs):
+        values = _run_once(cmd, args.timeout)
+        runs.append(values)
+        print(
+            f"  {i + 1:2d}: wall {values['wall_ms']:7.1f}ms  "
+            f"import {values['import_ms']:6.1f}  build {values['build_ms']:6.1f}  "
+            f"paint {values['paint_ms']:6.1f}  total {values['total_ms']:7.1f}"
+        )
+
+    medians = {k: statistics.median(r[k] for r in runs) for k in runs[0]}
+    print(
+        f"  중앙값: wall {medians['wall_ms']:.1f}ms, import {medians['import_ms']:.1f}, "
+        f"build {medians['build_ms']:.1f}, paint {medians['paint_ms']:.1f}"
+    )
+    # 첫 실행은 디스크 캐시/압축 해제 영향이 커서 따로 표시
+    if len(runs) > 1:
+        print(f"  첫 실행 wall {runs[0]['wall_ms']:.1f}ms")
+
+    if args.importtime and not args.exe:
+        _print_importtime()
+
+    if args.max_ms is not None and medians["wall_ms"] > args.max_ms:
+        print(f"❌ 시작 시간 {medians['wall_ms']:.1f}ms > 한도 {args.max_ms:.1f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
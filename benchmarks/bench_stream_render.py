@@ -0,0 +1,120 @@
+"""
+스트리밍 출력창 갱신: 토큰마다 after() vs 프레임 단위 묶음 갱신 비교
+
+- 생산 스레드가 토큰을 최대 속도(또는 --rate tok/s)로 보냄
+- 50ms마다 after(0) 탐침을 넣어 이벤트 루프 지연(=입력 반응 지연)을 측정
+
+사용법 (프로젝트 루트에서, 화면이 있는 환경):
+    python benchmarks/bench_stream_render.py [--tokens 20000] [--rate 0]
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import tkinter as tk
+from tkinter import scrolledtext
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from views.stream_renderer import StreamRenderer
+
+PROBE_INTERVAL_MS = 50
+SAMPLE_TOKENS = [
+    "def",
+    " ",
+    "load",
+    "_project",
+    "(",
+    "self",
+    "):",
+    "\n",
+    "    ",
+    "# 한글",
+]
+
+
+def _produce(push, count, rate, done):
+    delay = 1.0 / rate if rate else 0
+    for i in range(count):
+        push(SAMPLE_TOKENS[i % len(SAMPLE_TOKENS)])
+        if delay:
+            time.sleep(delay)
+    done()
+
+
+def _run(root, box, mode, count, rate):
+    box.delete("1.0", tk.END)
+    lags = []
+    finished = threading.Event()
+    state = {"end": None}
+
+    def probe():
+        sent = time.perf_counter()
+        root.after(0, lambda: lags.append(time.perf_counter() - sent))
+        if not state["end"]:
+            root.after(PROBE_INTERVAL_MS, probe)
+
+    if mode == "per-token":
+
+        def append(token):
+            box.insert(tk.END, token)
+            box.see(tk.END)
+
+        def push(token):
+            root.after(0, lambda: append(token))
+
+        def done():
+            root.after(0, lambda: finished.set())
+
+        renderer = None
+    else:
+        renderer = StreamRenderer(box)
+        push = renderer.buffer.push
+
+        def done():
+            renderer.buffer.close()
+            root.after(0, lambda: (renderer.finish(), finished.set()))
+
+        renderer.start()
+
+    start = time.perf_counter()
+    root.after(0, probe)
+    threading.Thread(
+        target=_produce, args=(push, count, rate, done), daemon=True
+    ).start()
+    while not finished.is_set():
+        root.update()
+    state["end"] = time.perf_counter()
+    root.update()
+
+    elapsed = state["end"] - start
+    lags.sort()
+    p95 = lags[int(len(lags) * 0.95)] if lags else 0
+    print(
+        f"{mode:>9}: {elapsed:.2f}s ({count / elapsed:,.0f} tok/s), "
+        f"입력 지연 p95 {p95 * 1000:.1f}ms / 최대 {max(lags or [0]) * 1000:.1f}ms"
+    )
+    if renderer:
+        print(f"           {renderer.summary_text()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=20000)
+    parser.add_argument("--rate", type=float, default=0, help="0이면 최대 속도")
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    box = scrolledtext.ScrolledText(root, wrap=tk.WORD, height=30)
+    box.pack(fill="both", expand=True)
+    root.update()
+
+    for mode in ("per-token", "buffered"):
+        _run(root, box, mode, args.tokens, args.rate)
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
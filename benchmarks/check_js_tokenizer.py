@@ -0,0 +1,77 @@
+"""
+Python JS 토크나이저 함수 추출 확인 (Node 없이 실행)
+
+사용법 (프로젝트 루트에서):
+    python benchmarks/check_js_tokenizer.py
+틀린 경우가 있으면 종료 코드 1
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.js_tokenizer import extract_js_symbols
+
+# (설명, 소스, 기대하는 함수 이름 목록)
+CASES = [
+    (
+        "세미콜론 있는 선언",
+        "import React from 'react';\nfunction App() { return 1 }",
+        ["App"],
+    ),
+    # ── 세미콜론 생략 (React / Standard JS 스타일) ──
+    (
+        "import 다음 줄의 선언",
+        "import React from 'react'\nfunction App() { return 1 }",
+        ["App"],
+    ),
+    (
+        "식 문장 사이의 선언",
+        "const a = 1\nfunction B() {}\nfoo()\nfunction C() {}",
+        ["B", "C"],
+    ),
+    (
+        "문자열/배열 다음 줄의 async 선언",
+        'const s = "x"\nasync function D() {}\nconst r = [1]\nfunction E() {}',
+        ["D", "E"],
+    ),
+    (
+        "템플릿 리터럴 다음 줄의 선언",
+        "const t = `a${b}`\nfunction F() {}",
+        ["F"],
+    ),
+    (
+        "export default 다음의 선언",
+        "export default function G() {}\nfunction H() {}",
+        ["G", "H"],
+    ),
+    # ── 선언이 아닌 함수 식 ──
+    (
+        "줄바꿈된 삼항 안의 익명 함수 식",
+        "const f = a\n  ? function () {}\n  : null",
+        [],
+    ),
+    (
+        "반환하는 함수 식",
+        "function I() {\n  return function () {}\n}",
+        ["I"],
+    ),
+]
+
+
+def main():
+    failed = 0
+    for label, source, expected in CASES:
+        names = [record["name"] for record in extract_js_symbols(source)]
+        if names == expected:
+            print(f"✅ {label}")
+        else:
+            failed += 1
+            print(f"❌ {label}: 기대 {expected}, 결과 {names}")
+    print(f"\n{len(CASES) - failed}/{len(CASES)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
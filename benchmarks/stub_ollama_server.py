@@ -0,0 +1,275 @@
+"""
+Ollama API 흉내만 내는 로컬 스텁 서버 (벤치마크/수동 검증용)
+
+- GET  /             → "Ollama is running"
+- GET  /api/tags     → StubOllamaHandler.models 목록 (기본: 빈 목록)
+- POST /api/embeddings → 단어 해시 기반 결정적 벡터 (같은 단어가 많을수록 코사인 유사도가 높음)
+- POST /api/generate   → 프롬프트 단어를 그대로 돌려주는 응답 (stream이면 chunked 줄 단위 JSON)
+  (StubOllamaHandler.prompt_delay / token_delay 로 모델 속도 흉내)
+  모델별로 직전 프롬프트를 기억해 겹치는 앞부분은 다시 평가하지 않음 (Ollama 프롬프트 캐시 흉내)
+  → prompt_eval_count = 새로 평가한 부분의 토큰 수(4자 ≈ 1토큰), eval_delay_per_token 만큼 추가 대기
+  처음 쓰는 모델은 load_delay 만큼 로드 시간, keep_alive=0 이면 응답 후 모델을 내림
+  (빈 프롬프트 → 모델만 올림, 빈 프롬프트 + keep_alive=0 → 내리기만 함)
+- GET  /api/version  → {"version": STUB_VERSION}
+- GET  /api/ps       → 올라와 있는 모델 목록 (크기 MODEL_SIZE)
+- POST /api/chat       → 마지막 메시지를 그대로 돌려주는 응답
+
+사용법 (프로젝트 루트에서):
+    python benchmarks/stub_ollama_server.py [--port 11500]
+    python benchmarks/stub_ollama_server.py --check <대상 폴더> "요청 문장"
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import select
+import socket
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+STUB_DIM = 256
+STUB_REPLY_WORDS = 32
+MODEL_SIZE = 2 * 1024**3
+STUB_VERSION = "0.0.0-stub"
+_WORD_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[가-힣]+|\d+")
+
+
+def stub_embedding(text, dim=STUB_DIM):
+    vector = [0.0] * dim
+    for word in _WORD_RE.findall(text):
+        h = zlib.crc32(word.lower().encode("utf-8"))
+        vector[h % dim] += 1.0 if (h >> 16) & 1 else -1.0
+    return vector
+
+
+def stub_reply(prompt, limit=STUB_REPLY_WORDS):
+    words = prompt.split()[:limit] or ["ok"]
+    return [w + " " for w in words]
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive 지원 (세션 재사용 측정용)
+    connections = 0  # 지금까지 받은 TCP 연결 수
+    aborted = 0  # 생성 중 클라이언트가 연결을 끊은 스트림 수
+    prompt_delay = 0.0  # 프롬프트 평가 시간 흉내 (첫 토큰 전 대기)
+    token_delay = 0.0  # 토큰 사이 대기
+    eval_delay_per_token = 0.0  # 새로 평가하는 프롬프트 토큰당 대기
+    prompt_cache = {}  # 모델 → 직전 프롬프트
+    load_delay = 0.0  # 올라와 있지 않은 모델의 로드 시간
+    loaded = set()  # 올라와 있는 모델
+    models = []  # /api/tags 로 보여줄 모델 이름
+    _count_lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StubOllamaHandler._count_lock:
+            StubOllamaHandler.connections += 1
+        # 헤더와 본문을 따로 쓰므로 Nagle + delayed ACK 지연(~40ms)을 끔
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, data, status=200):
+        self._send_body(json.dumps(data).encode("utf-8"), status)
+
+    def _send_body(self, body, status=200, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _wait_connected(self, seconds):
+        """seconds 동안 대기하되 클라이언트가 연결을 끊으면 바로 중단 (Ollama의 생성 취소 흉내)"""
+        deadline = time.monotonic() + seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            readable, _, _ = select.select([self.connection], [], [], remaining)
+            if readable and not self.connection.recv(1, socket.MSG_PEEK):
+                with StubOllamaHandler._count_lock:
+                    StubOllamaHandler.aborted += 1
+                self.close_connection = True
+                return False
+
+    def _evaluate_prompt(self, model, prompt, tokens):
+        """직전 프롬프트와 겹치는 앞부분을 뺀 나머지만 평가한 것으로 침 → (응답 통계, 첫 토큰 전 대기)"""
+        load = self._load(model)
+        with StubOllamaHandler._count_lock:
+            previous = StubOllamaHandler.prompt_cache.get(model, "")
+            StubOllamaHandler.prompt_cache[model] = prompt
+        reused = len(os.path.commonprefix([previous, prompt]))
+        count = max(1, (len(prompt) - reused) // 4)
+        seconds = self.prompt_delay + count * self.eval_delay_per_token
+        return {
+            "load_duration": int(load * 1e9),
+            "prompt_eval_count": count,
+            "prompt_eval_duration": int(seconds * 1e9),
+            "eval_count": len(tokens),
+            "eval_duration": int(max(len(tokens) * self.token_delay, 1e-6) * 1e9),
+        }, load + seconds
+
+    def _load(self, model):
+        """모델을 올림 → 로드에 걸리는 시간 (이미 올라와 있으면 0)"""
+        with StubOllamaHandler._count_lock:
+            load = 0.0 if model in StubOllamaHandler.loaded else self.load_delay
+            StubOllamaHandler.loaded.add(model)
+        return load
+
+    def _unload(self, model):
+        with StubOllamaHandler._count_lock:
+            StubOllamaHandler.loaded.discard(model)
+            StubOllamaHandler.prompt_cache.pop(model, None)
+
+    def _stream_tokens(self, tokens, stats):
+        """실제 Ollama처럼 chunked 전송으로 토큰을 한 줄씩 보냄 (클라이언트가 끊으면 중단)"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        lines = [{"response": t, "done": False} for t in tokens]
+        lines.append(dict(stats, response="", done=True))
+        try:
+            for data in lines:
+                line = (json.dumps(data) + "\n").encode("utf-8")
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                self.wfile.flush()
+                time.sleep(self.token_delay)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            with StubOllamaHandler._count_lock:
+                StubOllamaHandler.aborted += 1
+            self.close_connection = True
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        if self.path == "/":
+            body = b"Ollama is running"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == "/api/version":
+            self._send_json({"version": STUB_VERSION})
+        elif self.path == "/api/ps":
+            self._send_json(
+                {
+                    "models": [
+                        {"name": n, "size": MODEL_SIZE, "size_vram": MODEL_SIZE}
+                        for n in sorted(self.loaded)
+                    ]
+                }
+            )
+        elif self.path == "/api/tags":
+            self._send_json(
+                {"models": [{"name": n, "digest": f"stub-{n}"} for n in self.models]}
+            )
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        payload = self._read_json()
+        if self.path == "/api/embeddings":
+            self._send_json({"embedding": stub_embedding(payload.get("prompt", ""))})
+        elif self.path == "/api/generate":
+            model = payload.get("model")
+            prompt = payload.get("prompt", "")
+            unload = payload.get("keep_alive") in (0, "0", "0s")
+            if not prompt:
+                if unload:
+                    self._unload(model)
+                else:
+                    self._wait_connected(self._load(model))
+                reason = "unload" if unload else "load"
+                self._send_json({"model": model, "done": True, "done_reason": reason})
+                return
+            tokens = stub_reply(prompt)
+            stats, seconds = self._evaluate_prompt(model, prompt, tokens)
+            if not self._wait_connected(seconds):
+                return
+            if payload.get("stream", True):
+                self._stream_tokens(tokens, stats)
+            else:
+                self._send_json(dict(stats, response="".join(tokens), done=True))
+            if unload:
+                self._unload(model)
+        elif self.path == "/api/chat":
+            messages = payload.get("messages") or [{"content": ""}]
+            content = "".join(stub_reply(messages[-1].get("content", "")))
+            self._send_json({"message": {"role": "assistant", "content": content}})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+
+def start_stub_server(port=0, handler=StubOllamaHandler):
+    """백그라운드 스레드로 스텁 서버 시작. (server, base_url) 반환"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _check_semantic(target, query):
+    """스텁 서버로 의미 검색 색인을 만들고 query 결과를 출력"""
+    import tempfile
+
+    from utils.project_scanner import scan_project
+    from utils.symbol_index import SymbolIndex
+    from utils.semantic_index import SemanticIndex
+
+    server, base_url = start_stub_server()
+    manifest = scan_project(target)
+    symbols = SymbolIndex(manifest.root)
+    symbols.update(manifest)
+    symbols_by_path = {p: rec[2] for p, rec in symbols.files.items()}
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        index = SemanticIndex(cache_dir, manifest.root, base_url=base_url)
+        start = time.perf_counter()
+        embedded = index.update(manifest.iter_files(), symbols_by_path)
+        print(
+            f"🧠 임베딩: {embedded}개 파일, {len(index.rows)}행 "
+            f"({time.perf_counter() - start:.2f}s)"
+        )
+
+        again = SemanticIndex(cache_dir, manifest.root, base_url=base_url)
+        print(f"♻️ 재실행 시 다시 임베딩: {again.update(manifest.iter_files())}개 파일")
+
+        start = time.perf_counter()
+        hits = again.search(query, limit=8)
+        print(f"🔎 조회: {(time.perf_counter() - start) * 1000:.1f}ms")
+        for score, rel_path, label, line, _ in hits:
+            print(f"  {score:.3f}  {rel_path}:{line}  {label}")
+    server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--check", nargs=2, metavar=("TARGET", "QUERY"))
+    args = parser.parse_args()
+
+    if args.check:
+        _check_semantic(*args.check)
+        return
+
+    server, base_url = start_stub_server(args.port)
+    print(f"🧪 스텁 Ollama 서버: {base_url} (Ctrl+C 종료)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+# controllers/api_server.py
+
+import os
+import hmac
+import json
+import time
+import queue
+import select
+import socket
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from controllers.batch_runner import make_record, submit_prompt_request
+from utils.ollama_health import get_health_monitor
+from utils.ollama_http import STATUS_TIMEOUT
+from utils.request_scheduler import RequestScheduler
+from viewmodels.prompt_viewmodel import PromptViewModel
+
+# 📌 로컬 HTTP API (에디터/스크립트에서 창 없이 사용)
+#   - 프로젝트마다 PromptViewModel 하나를 메모리에 유지 (manifest/색인/세션 접두부가 계속 따뜻함)
+#     처음 쓰는 프로젝트는 요청 때 로드, 파일 감시로 변경도 바로 반영
+#   - 룰 기반 조회(관련 파일/함수/최종 프롬프트)는 Ollama 없이 동작
+#   - 분석은 NDJSON 스트리밍 (토큰 줄 → 마지막에 결과/최종 프롬프트 줄)
+#     연결이 끊기면 그 연결의 구독만 뗌 (같은 요청을 기다리는 다른 연결이 없으면 생성 중지)
+#   - 모든 프로젝트가 스케줄러 하나를 공유 (동시 실행 수 = Ollama 병렬 슬롯 수)
+#   - 브라우저에서 열린 다른 사이트가 로컬 서버를 부르지 못하게 (DNS 리바인딩/CSRF)
+#     · Host 헤더가 127.0.0.1:<포트> / localhost:<포트> 가 아니면 거부
+#     · POST는 Content-Type: application/json 만 받음 (브라우저는 사전 요청 없이 못 보냄)
+#     · 모든 요청에 Authorization: Bearer <토큰> 필요 (토큰은 서버 시작 때 출력)
+#
+#   GET  /health                   Ollama 상태, 모델, 로드된 프로젝트 수
+#   GET  /projects                 로드된 프로젝트 목록
+#   POST /projects      {"path", "reload"}
+#   POST /related-files {"project", "request", "limit"}
+#   POST /functions     {"project", "query", "limit", "body"}
+#   POST /prompt        {"project", "request", "analysis"}
+#   POST /analyze       {"project", "request"}  → application/x-ndjson 스트림
+
+DEFAULT_HOST = "127.0.0.1"  # 로컬 전용 (다른 PC에서 프로젝트 경로를 열지 못하게)
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1024 * 1024
+STREAM_POLL_INTERVAL = 0.5  # 분석 스트림이 토큰을 기다리며 연결 끊김을 확인하는 간격
+SLOW_REQUEST_MS = 50  # 룰 기반 조회 목표 시간 (넘으면 로그)
+
+
+def generate_token():
+    return secrets.token_urlsafe(24)
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+class ProjectRegistry:
+    """프로젝트 경로 → 로드된 PromptViewModel"""
+
+    def __init__(self, model=None, watch=True, concurrency=None):
+        self.model = model
+        self.watch = watch
+        self.scheduler = RequestScheduler(concurrency)
+        self._projects = {}
+        self._loading = {}  # 경로 → 로드 잠금 (같은 프로젝트를 두 번 로드하지 않게)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    def open(self, path, reload=False):
+        """
+        로드(이미 있으면 재사용) → (viewmodel, 정보)
+        Raises:
+            ApiError: 폴더가 없거나 로드 실패
+        """
+        if not path or not os.path.isdir(path):
+            raise ApiError(404, f"프로젝트 폴더가 없습니다: {path}")
+        key = self._key(path)
+        with self._lock:
+            loading = self._loading.setdefault(key, threading.Lock())
+        with loading:
+            viewmodel = self._projects.get(key)
+            if viewmodel is not None and not reload:
+                return viewmodel, self.info(viewmodel)
+            if viewmodel is None:
+                viewmodel = PromptViewModel()
+                viewmodel.scheduler = self.scheduler
+                viewmodel.set_current_model(self.model)
+            start = time.perf_counter()
+            success, msg, used_cache = viewmodel.load_project(
+                os.path.abspath(path), force_reload=reload
+            )
+            if not success:
+                raise ApiError(500, msg)
+            viewmodel.warm_indexes()  # 캐시로 로드해도 첫 조회가 색인을 만들지 않게
+            if self.watch and not viewmodel.is_watching():
+                viewmodel.start_watching()
+            with self._lock:
+                self._projects[key] = viewmodel
+            info = self.info(viewmodel)
+            info.update(load_ms=_elapsed_ms(start), used_cache=used_cache)
+            print(f"📁 API 프로젝트 로드 ({info['load_ms']}ms): {path}")
+            return viewmodel, info
+
+    def get(self, path):
+        """로드된 프로젝트 (처음이면 지금 로드)"""
+        viewmodel = self._projects.get(self._key(path))
+        if viewmodel is None:
+            viewmodel, _ = self.open(path)
+        return viewmodel
+
+    def info(self, viewmodel):
+        tree = viewmodel.context.project_tree
+        return {
+            "path": viewmodel.context.project_path,
+            "code_root": viewmodel.context.code_root,
+            "files": len(list(tree.iter_files())) if tree else 0,
+            "index_version": viewmodel.index_version,
+            "model": viewmodel.get_current_model(),
+            "watching": viewmodel.is_watching(),
+        }
+
+    def __len__(self):
+        return len(self._projects)
+
+    def list(self):
+        with self._lock:
+            projects = list(self._projects.values())
+        return [self.info(viewmodel) for viewmodel in projects]
+
+    def close_all(self):
+        with self._lock:
+            projects, self._projects = list(self._projects.values()), {}
+        for viewmodel in projects:
+            viewmodel.stop_streaming()
+            viewmodel.stop_watching()
+            if viewmodel.response_cache is not None:
+                viewmodel.response_cache.flush()
+
+
+def _symbol_dict(symbol):
+    return {
+        "name": symbol.name,
+        "qualname": symbol.qualname,
+        "kind": symbol.kind,
+        "path": symbol.rel_path,
+        "start": symbol.start,
+        "end": symbol.end,
+        "signature": symbol.signature,
+    }
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive (에디터가 연결을 재사용)
+    server_version = "GPTPromptAssistantAPI"
+
+    @property
+    def registry(self):
+        return self.server.registry
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 print 하지 않음 (느린 요청만 아래에서 기록)
+
+    # ── 요청/응답 ───────────────────────────────────────────
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True  # 본문을 읽지 않았으므로 연결 재사용 불가
+            raise ApiError(413, "요청 본문이 너무 큽니다.")
+        if not length:
+            return {}
+        try:
+            data = json.loads(self.rfile.read(length).decode("utf-8"))
+        except ValueError as e:
+            raise ApiError(400, f"JSON 형식 오류: {e}")
+        if not isinstance(data, dict):
+            raise ApiError(400, "JSON 객체를 보내야 합니다.")
+        return data
+
+    def _send_json(self, data, status=200):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _check_access(self):
+        """Host / Content-Type / 토큰 확인 (실패하면 본문을 읽지 않고 연결을 닫음)"""
+        if self.headers.get("Host", "").lower() not in self.server.allowed_hosts:
+            self.close_connection = True
+            raise ApiError(403, "허용되지 않은 Host 헤더입니다.")
+        if self.command == "POST":
+            content_type = self.headers.get("Content-Type", "")
+            if content_type.split(";")[0].strip().lower() != "application/json":
+                self.close_connection = True
+                raise ApiError(415, "Content-Type: application/json 이어야 합니다.")
+        scheme, _, token = self.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(
+            token.strip().encode("utf-8"), self.server.token.encode("utf-8")
+        ):
+            self.close_connection = True
+            raise ApiError(401, "Authorization: Bearer <토큰> 이 필요합니다.")
+
+    def _dispatch(self, routes):
+        path = urlparse(self.path).path.rstrip("/") or "/"
+        handler = routes.get(path)
+        start = time.perf_counter()
+        try:
+            self._check_access()
+            body = self._read_json()  # 경로가 없어도 읽어야 다음 요청을 받을 수 있음
+            if handler is None:
+                raise ApiError(404, f"없는 경로: {path}")
+            data = handler(self, body)
+            if data is not None:
+                data["elapsed_ms"] = _elapsed_ms(start)
+                self._send_json(data)
+                if data["elapsed_ms"] > SLOW_REQUEST_MS:
+                    print(f"🐢 API {self.command} {path}: {data['elapsed_ms']}ms")
+        except ApiError as e:
+            self._send_json({"error": e.message}, e.status)
+        except Exception as e:
+            print(f"[API 오류] {self.command} {path}: {e}")
+            self._send_json({"error": str(e)}, 500)
+
+    def do_GET(self):
+        self._dispatch(GET_ROUTES)
+
+    def do_POST(self):
+        self._dispatch(POST_ROUTES)
+
+    # ── 조회 (Ollama 없이) ──────────────────────────────────
+    def _project_and_text(self, data, field):
+        project, text = data.get("project"), data.get(field)
+        if not isinstance(project, str) or not project:
+            raise ApiError(400, "'project' 경로가 필요합니다.")
+        if not isinstance(text, str) or not text.strip():
+            raise ApiError(400, f"'{field}' 문자열이 필요합니다.")
+        return self.registry.get(project), text
+
+    @staticmethod
+    def _limit(data, default=5):
+        try:
+            return max(1, int(data.get("limit", default)))
+        except (TypeError, ValueError):
+            raise ApiError(400, "'limit'은 정수여야 합니다.")
+
+    def handle_health(self, data):
+        snapshot = get_health_monitor().snapshot
+        return {
+            "ollama": {
+                "checked": snapshot.checked,
+                "up": snapshot.up,
+                "version": snapshot.version,
+                "latency_ms": snapshot.latency_ms,
+            },
+            "model": self.registry.model,
+            "projects": len(self.registry),
+            "scheduler": self.registry.scheduler.status_text(),
+        }
+
+    def handle_list_projects(self, data):
+        return {"projects": self.registry.list()}
+
+    def handle_open_project(self, data):
+        _, info = self.registry.open(data.get("path"), bool(data.get("reload")))
+        return info
+
+    def handle_related_files(self, data):
+        viewmodel, text = self._project_and_text(data, "request")
+        files = viewmodel.search_related_files(text, self._limit(data))
+        return {"files": files}
+
+    def handle_functions(self, data):
+        viewmodel, query = self._project_and_text(data, "query")
+        symbols = viewmodel.search_symbols(query, self._limit(data))
+        result = {"symbols": [_symbol_dict(s) for s in symbols]}
+        if data.get("body"):
+            result["context"] = viewmodel.render_symbols(symbols)
+        return result
+
+    def handle_prompt(self, data):
+        """분석 결과(analysis)를 주면 그것으로, 없으면 분석 없이 최종 프롬프트"""
+        viewmodel, text = self._project_and_text(data, "request")
+        prompt = viewmodel.generate_prompt(text, data.get("analysis") or "")
+        return {"prompt": prompt, "tokens": viewmodel.token_summary_text()}
+
+    # ── 분석 스트리밍 ───────────────────────────────────────
+    def handle_analyze(self, data):
+        viewmodel, text = self._project_and_text(data, "request")
+        if not get_health_monitor().wait_first_check(STATUS_TIMEOUT + 1).up:
+            raise ApiError(503, "Ollama가 꺼져 있습니다.")
+        if not viewmodel.get_current_model():
+            raise ApiError(503, "사용할 모델이 정해지지 않았습니다.")
+
+        events = queue.Queue()
+
+        def on_finished(request, prompt, seconds):
+            record = make_record(request.id, text, request, prompt, seconds)
+            events.put(dict(record, done=True, summary=request.summary_text()))
+
+        request, is_new, unsubscribe = submit_prompt_request(
+            viewmodel,
+            text,
+            on_finished,
+            on_token=lambda token: events.put({"token": token}),
+        )
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            # 같은 요청이 진행 중이면 합쳐짐 → 토큰 없이 마지막 결과만
+            self._write_chunk(
+                {
+                    "id": request.id,
+                    "coalesced": not is_new,
+                    "queue_position": viewmodel.scheduler.queue_position(request),
+                }
+            )
+            while True:
+                try:
+                    event = events.get(timeout=STREAM_POLL_INTERVAL)
+                except queue.Empty:
+                    if self._client_gone():
+                        raise ConnectionAbortedError()
+                    continue
+                self._write_chunk(event)
+                if event.get("done"):
+                    break
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            self.close_connection = True
+            unsubscribe()  # 합쳐진 다른 연결이 남아 있으면 생성은 계속
+        return None
+
+    def _write_chunk(self, data):
+        line = (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+        self.wfile.flush()
+
+    def _client_gone(self):
+        """클라이언트가 연결을 닫았는지 (읽을 데이터 없이 EOF)"""
+        try:
+            readable, _, _ = select.select([self.connection], [], [], 0)
+            return bool(readable) and not self.connection.recv(1, socket.MSG_PEEK)
+        except OSError:
+            return True
+
+
+GET_ROUTES = {
+    "/health": ApiRequestHandler.handle_health,
+    "/projects": ApiRequestHandler.handle_list_projects,
+}
+POST_ROUTES = {
+    "/projects": ApiRequestHandler.handle_open_project,
+    "/related-files": ApiRequestHandler.handle_related_files,
+    "/functions": ApiRequestHandler.handle_functions,
+    "/prompt": ApiRequestHandler.handle_prompt,
+    "/analyze": ApiRequestHandler.handle_analyze,
+}
+
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, registry, host=DEFAULT_HOST, port=DEFAULT_PORT, token=None):
+        """token이 없으면 새로 만듦 (self.token 을 클라이언트에 알려줘야 함)"""
+        super().__init__((host, port), ApiRequestHandler)
+        self.registry = registry
+        self.token = token or generate_token()
+        port = self.server_address[1]  # port=0 이면 실제로 열린 포트
+        names = {"127.0.0.1", "localhost", host.lower()}
+        self.allowed_hosts = {f"{name}:{port}" for name in names}
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
@@ -0,0 +1,155 @@
+# controllers/batch_runner.py
+
+import json
+import time
+import threading
+
+from controllers.output_handler import start_ollama_analysis
+from utils.request_scheduler import DONE
+
+# 📌 UI 없이 프롬프트 생성 (배치 CLI / 로컬 API 서버용)
+#   - 분석(파일 선택 단계) → 최종 프롬프트 생성까지 화면과 같은 파이프라인 사용
+#   - 동시 실행/대기열/중복 합치기는 viewmodel.scheduler 가 담당
+
+
+def _ignore_token(token):
+    pass  # 배치는 토큰을 화면에 그리지 않음
+
+
+def submit_prompt_request(viewmodel, user_input, on_finished, on_token=None):
+    """
+    분석 요청을 스케줄러에 넣고 바로 반환합니다.
+    분석이 끝나면(완료 스레드) 최종 프롬프트를 만들고 on_finished(request, prompt, prompt_seconds)
+    (완료가 아니면(중지/실패) prompt는 None, on_token은 새로 만든 요청일 때만 받음)
+    Returns:
+        (request, is_new, unsubscribe) — unsubscribe()는 이 호출의 구독만 떼어냄
+        (같은 요청을 기다리는 다른 쪽이 없을 때만 생성 중지)
+    """
+
+    def on_complete(request):
+        prompt, seconds = None, 0.0
+        if request.state == DONE:
+            start = time.perf_counter()
+            prompt = viewmodel.generate_prompt(user_input, request.result or "")
+            seconds = time.perf_counter() - start
+        on_finished(request, prompt, seconds)
+
+    request, is_new = start_ollama_analysis(
+        viewmodel, user_input, on_token or _ignore_token, on_complete
+    )
+
+    def unsubscribe():
+        return viewmodel.scheduler.unsubscribe(request, on_complete)
+
+    return request, is_new, unsubscribe
+
+
+def load_requests(path, field="request", id_field="id"):
+    """
+    JSONL 요청 파일 → [(id, 요청 문장), ...]
+    줄마다 {"id": ..., "request": "..."} 형태의 객체 또는 문자열 하나. id가 없으면 줄 번호
+    """
+    jobs = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_no}: JSON 형식 오류: {e}") from e
+            if isinstance(item, str):
+                jobs.append((str(line_no), item))
+                continue
+            if not isinstance(item, dict) or not isinstance(item.get(field), str):
+                raise ValueError(f"{path}:{line_no}: '{field}' 문자열 필드가 없습니다.")
+            jobs.append((str(item.get(id_field, line_no)), item[field]))
+    return jobs
+
+
+def load_finished_ids(path):
+    """이전 출력 파일에서 완료된 요청 id (이어서 실행할 때 건너뜀)"""
+    finished = set()
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # 중단되며 잘린 마지막 줄
+                if record.get("state") == DONE:
+                    finished.add(str(record.get("id")))
+    except FileNotFoundError:
+        pass
+    return finished
+
+
+def make_record(job_id, user_input, request, prompt, prompt_seconds):
+    """출력 JSONL 한 줄 (시간은 초)"""
+    wait, ttft, run = request.timings()
+
+    def rounded(value):
+        return round(value, 3) if value is not None else None
+
+    return {
+        "id": job_id,
+        "request": user_input,
+        "state": request.state,
+        "model": request.model,
+        "analysis": request.result,
+        "prompt": prompt,
+        "error": str(request.error) if request.error is not None else None,
+        "timings": {
+            "wait": rounded(wait),
+            "first_token": rounded(ttft),
+            "run": rounded(run),
+            "prompt": rounded(prompt_seconds),
+        },
+    }
+
+
+def run_batch(viewmodel, jobs, out_file, on_record=None, poll_interval=0.5):
+    """
+    jobs = [(id, 요청 문장), ...] 을 한꺼번에 스케줄러에 넣고, 끝나는 순서대로 out_file에 한 줄씩 기록
+    - on_record(record, request): 기록할 때마다 (진행 표시용)
+    - Ctrl+C 면 남은 요청을 모두 중지하고 그때까지의 결과를 기록한 뒤 KeyboardInterrupt 다시 발생
+    Returns:
+        list[dict]: 기록한 결과 (끝난 순서)
+    """
+    records = []
+    lock = threading.Lock()
+    all_done = threading.Event()
+    remaining = [len(jobs)]
+    if not jobs:
+        return records
+
+    def on_finished_for(job_id, user_input):
+        def on_finished(request, prompt, seconds):
+            record = make_record(job_id, user_input, request, prompt, seconds)
+            with lock:
+                out_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out_file.flush()  # 밤새 돌다 멈춰도 끝난 것은 남도록
+                records.append(record)
+                remaining[0] -= 1
+                if on_record:
+                    on_record(record, request)
+                if remaining[0] == 0:
+                    all_done.set()
+
+        return on_finished
+
+    for job_id, user_input in jobs:
+        submit_prompt_request(
+            viewmodel, user_input, on_finished_for(job_id, user_input)
+        )
+
+    try:
+        # 메인 스레드가 Ctrl+C를 받을 수 있도록 짧게 나눠 대기
+        while not all_done.wait(poll_interval):
+            pass
+    except KeyboardInterrupt:
+        viewmodel.stop_streaming()
+        all_done.wait(poll_interval * 10)
+        raise
+    return records
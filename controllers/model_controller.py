@@ -1,8 +1,9 @@
 import subprocess
 from models.ollama_model import OllamaModel
 from viewmodels.prompt_viewmodel import viewmodel  # 전역 ViewModel
+from utils.model_benchmark import ModelScoreStore, benchmark_model
 from utils.ollama_manager import (
-    list_ollama_models,
+    list_ollama_model_info,
     apply_ollama_model,
     start_ollama_model_background,
     stop_ollama_process,
@@ -13,32 +14,71 @@ class ModelController:
     def __init__(self):
         self.models = []
         self.selected_model = None
+        self.score_store = ModelScoreStore()
 
     def load_models(self):
-        names = list_ollama_models()  # 예: ['llama3', 'mistral', ...]
-        print(f"[모델 목록 로드]: {names}")
-        self.models = [OllamaModel(name) for name in names]
+        infos = list_ollama_model_info()  # 예: [{'name': 'llama3', 'digest': ...}, ...]
+        print(f"[모델 목록 로드]: {[info['name'] for info in infos]}")
+        self.models = [
+            OllamaModel(info["name"], digest=info.get("digest", "")) for info in infos
+        ]
+        # ✅ 저장된 속도 측정 결과 적용 (모델을 다시 받아 digest가 바뀌었으면 무시)
+        for model in self.models:
+            model.set_benchmark(self.score_store.get(model.name, model.digest))
         return self.models
 
+    def benchmark_models(self, on_progress=None):
+        """
+        설치된 모델을 차례로 측정하고 점수를 저장합니다. (모델마다 수 초~수 분: 작업 스레드에서 호출)
+        :param on_progress: on_progress(완료 수, 전체 수, 모델, 결과 문구)
+        """
+        total = len(self.models)
+        for done, model in enumerate(self.models, 1):
+            try:
+                result = benchmark_model(model.name, model.digest)
+                self.score_store.put(result)
+                model.set_benchmark(result)
+                message = result.detail_text()
+            except Exception as e:
+                message = f"[측정 실패] {e}"
+            print(f"[모델 측정 {done}/{total}] {message}")
+            if on_progress:
+                on_progress(done, total, model, message)
+
+        # 측정하면서 모델을 내렸으므로 사용 중이던 모델을 다시 올림
+        current = viewmodel.get_current_model()
+        if current:
+            apply_ollama_model(current)
+        return self.select_fastest_model()
+
     def select_fastest_model(self):
-        # TODO: 실제 속도 측정 로직 필요
-        if self.models:
-            self.selected_model = self.models[0]  # 우선 첫 번째 모델을 선택
+        scored = [m for m in self.models if m.speed_score > 0]
+        if scored:
+            self.selected_model = max(scored, key=lambda m: m.speed_score)
+        elif self.models:
+            self.selected_model = self.models[0]  # 측정 전이면 첫 번째 모델
         return self.selected_model
 
+    def display_names(self):
+        return [m.display_name() for m in self.models]
+
+    def find_model(self, label: str):
+        """모델 이름 또는 드롭다운 표시 문자열로 모델 찾기"""
+        return next(
+            (m for m in self.models if label in (m.name, m.display_name())), None
+        )
+
     def apply_selected_model(self, name: str):
-        model = next((m for m in self.models if m.name == name), None)
+        model = self.find_model(name)
 
         if model is None:
             print(f"[모델 적용 실패]: '{name}' 모델을 찾을 수 없습니다.")
             return False
 
-        try:
-            apply_ollama_model(model.name)
-            print(f"[모델 적용 성공]: {model.name}")
-            viewmodel.set_current_model(model.name)  # ✅ 성공한 경우만 적용
-
-            return True
-        except Exception as e:
-            print(f"[Ollama 오류] 모델 적용 실패: {e}")
+        # 올라와 있던 다른 모델은 내리고 이 모델만 올림 (생성 없이 로드만)
+        if not apply_ollama_model(model.name, switch=True):
+            print(f"[모델 적용 실패]: '{model.name}' 모델을 올리지 못했습니다.")
             return False
+        print(f"[모델 적용 성공]: {model.name}")
+        viewmodel.set_current_model(model.name)  # ✅ 성공한 경우만 적용
+        return True
@@ -1,43 +1,152 @@
 # controllers/output_handler.py
 
-from utils.ollama_client import ask_ollama_stream
+from utils.ollama_client import FILE_SELECTION_RULES, start_ollama_stream
+from utils.model_race import start_model_race
+from utils.response_cache import normalize_prompt, split_for_replay
+from utils.token_budget import get_num_ctx
 
 
 def start_ollama_analysis(
-    viewmodel, user_input, on_token_callback, on_complete_callback
+    viewmodel, user_input, on_token_callback, on_complete_callback, on_start=None
 ):
+    """
+    분석 요청을 스케줄러에 넣고 바로 반환합니다.
+    (동시 실행 수를 넘으면 대기, 같은 요청이 진행 중이면 새로 만들지 않고 합침)
+    - on_token_callback(token): 이 호출로 새로 만든 요청일 때만 받음
+    - on_start(request): 요청이 대기열에서 나와 실행을 시작할 때
+    - on_complete_callback(request): 완료/중지/실패 때 한 번 (request.result = 분석 결과)
+    Returns:
+        (request, is_new)
+    """
     print("🚀 start_ollama_analysis 진입")
+    model = viewmodel.get_current_model()
+    key = (model, normalize_prompt(user_input or ""), viewmodel.index_version)
+
+    def runner(request, finish):
+        if on_start:
+            on_start(request)
+        _run_analysis(viewmodel, model, user_input, request, on_token_callback, finish)
+
+    return viewmodel.scheduler.submit(
+        key, runner, on_done=on_complete_callback, label=(user_input or "")[:40]
+    )
+
+
+def _run_analysis(viewmodel, model, user_input, request, on_token_callback, finish):
+    """
+    스케줄러 작업 스레드에서 실행: 프롬프트를 만들고 스트리밍 시작 (응답 캐시가 있으면 재생)
+    스트림이 끝나면(이벤트 루프 스레드) finish(결과) 호출 → 다음 대기 요청 시작
+    """
     if not user_input:
-        on_complete_callback("요청 내용을 입력하세요.")
+        finish(error="요청 내용을 입력하세요.")
         return
-
-    model = viewmodel.get_current_model()
     if not model:
-        on_complete_callback("[오류] 현재 모델이 선택되지 않았습니다.")
+        finish(error="[오류] 현재 모델이 선택되지 않았습니다.")
         return
 
+    # 핵심: 전체 컨텍스트를 포함한 프롬프트 사용
+    full_prompt = viewmodel.build_stream_prompt(user_input)
+    options = {"num_ctx": get_num_ctx(model)}  # 토큰 예산과 같은 컨텍스트 크기
+    models = viewmodel.race_models_for(model)
+    request.model = model
+
+    # ✅ 같은 모델/프롬프트/옵션/프로젝트 상태로 받은 응답이 있으면 모델 호출 없이 재생
+    #    (경주 모드는 모드/참가 모델까지 키에 포함)
+    cache = viewmodel.response_cache
+    cache_options = options
+    if len(models) > 1:
+        cache_options = dict(options, race=f"{viewmodel.race_mode}:{','.join(models)}")
+    cache_key = viewmodel.response_cache_key(
+        model, FILE_SELECTION_RULES + full_prompt, cache_options
+    )
+    cached = cache.get(cache_key) if cache_key else None
+    if cache_key:
+        print("💾 응답 캐시:", cache.summary_text())
+
     result_accumulator = []
 
     def on_token(token):
+        request.mark_first_token()
         result_accumulator.append(token)
         on_token_callback(token)
 
     def on_done(*args, **kwargs):
-        print("🔥 on_done 호출됨")
+        print(f"🔥 on_done 호출됨 (#{request.id})")
         result = "".join(result_accumulator)
-        viewmodel.set_last_ollama_result(result)
-        on_complete_callback(result)
+        # 끝까지 받은 응답만 저장 (중지/오류 제외)
+        failed = args and str(args[0]).startswith("[오류 발생]")
+        try:
+            if (
+                cached is None
+                and cache_key
+                and not failed
+                and not request.should_stop()
+            ):
+                cache.put(cache_key, model, result)
+            viewmodel.set_last_ollama_result(result)
+        finally:
+            # 캐시 오류가 나도 요청은 끝내야 스케줄러 자리가 비워짐
+            finish(result, error=args[0] if failed else None)
+
+    if cached is not None:
+        for token in split_for_replay(cached):
+            if request.should_stop():
+                break
+            on_token(token)
+        on_done()
+        return
 
-    # 핵심: 전체 컨텍스트를 포함한 프롬프트 사용
-    full_prompt = viewmodel.build_stream_prompt(user_input)
+    if request.should_stop():
+        on_done()  # 대기 중이거나 프롬프트를 만드는 동안 중지됨
+        return
+
+    if len(models) > 1:
+        _run_race(viewmodel, models, user_input, request, on_token, on_done)
+        return
 
-    ask_ollama_stream(
+    handle = start_ollama_stream(
         model=model,
         prompt=full_prompt,  # ⬅️ 핵심 수정!
         on_token_callback=on_token,
         on_complete_callback=on_done,
-        should_stop_callback=viewmodel.should_stop,
+        options=options,
+        keep_alive=viewmodel.stream_keep_alive(),  # 세션 모드: 프롬프트 캐시 유지
+    )
+    request.set_cancel_hook(handle.cancel)
+
+
+def _run_race(viewmodel, models, user_input, request, on_token, on_done):
+    """여러 모델에 같은 파일 선택 요청 → 이긴(또는 합친) 답변을 재생하고 on_done"""
+    entries = [
+        (
+            name,
+            viewmodel.build_stream_prompt(user_input, model=name),
+            {"num_ctx": get_num_ctx(name)},
+        )
+        for name in models
+    ]
+
+    def on_race_done(result):
+        viewmodel.record_race(result)
+        if result.winner is not None:
+            request.model = result.winner
+        if result.failed:
+            on_done(result.text)
+            return
+        for token in split_for_replay(result.text):
+            if request.should_stop():
+                break
+            on_token(token)
+        on_done()
+
+    race = start_model_race(
+        entries,
+        on_race_done,
+        viewmodel.project_files(),
+        mode=viewmodel.race_mode,
+        keep_alive=viewmodel.stream_keep_alive(),
     )
+    request.set_cancel_hook(race.cancel)
 
 
 # def start_ollama_analysis(
@@ -42,6 +42,30 @@ class ProjectController:
         else:
             messagebox.showerror("❌ 새로고침 실패", msg)
 
+    def set_watch(self, enabled: bool):
+        """파일 감시(자동 갱신) 켜기/끄기"""
+        if not enabled:
+            self.viewmodel.stop_watching()
+            return
+
+        if not self.view.project_loaded:
+            messagebox.showwarning("경고", "먼저 프로젝트를 열어주세요.")
+            self.view.watch_var.set(False)
+            return
+        self.viewmodel.start_watching(on_update=self._on_project_changed)
+
+    def set_semantic_search(self, enabled: bool):
+        """임베딩 기반 의미 검색 켜기/끄기 (NumPy와 Ollama 임베딩 모델 필요)"""
+        if not self.viewmodel.set_semantic_search(enabled):
+            messagebox.showwarning(
+                "의미 검색", "의미 검색에는 NumPy가 필요합니다.\npip install numpy"
+            )
+            self.view.semantic_var.set(False)
+
+    def _on_project_changed(self):
+        # 감시 스레드에서 호출됨 → UI 갱신은 메인 루프에서
+        self.view.after(0, lambda: update_tree_structure(self.view))
+
     def _update_cache_label(self, used_cache: bool):
         label = "✅ 캐시 사용됨" if used_cache else "❌ 캐시 미사용"
         self.view.cache_label.config(text=label)
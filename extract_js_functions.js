@@ -1,5 +1,6 @@
 import fs from 'fs';
 import path from 'path';
+import readline from 'readline';
 import { fileURLToPath } from 'url';
 import { parse } from '@babel/parser';
 import traverseModule from '@babel/traverse';
@@ -33,7 +34,8 @@ function extractFunctionsFromFile(filePath) {
       plugins: ['jsx', 'typescript', 'classProperties'],
     });
   } catch (err) {
-    console.log(chalk.red(`❌ [파싱 오류] ${filePath}: ${err.message}`));
+    // stdout은 --serve 모드의 응답 채널이므로 로그는 stderr로
+    console.error(chalk.red(`❌ [파싱 오류] ${filePath}: ${err.message}`));
     return { error: err.message, functions: [] };
   }
 
@@ -132,7 +134,11 @@ function extractDocSummary(node) {
   const comments = node.leadingComments;
   if (!comments || comments.length === 0) return '';
   const doc = comments[comments.length - 1].value.trim();
-  const firstLine = doc.split('\n')[0].replace(/[*\/]/g, '').trim();
+  // JSDoc(/**\n * 설명) 처럼 첫 줄이 비어 있으면 첫 번째 내용 줄을 사용
+  const firstLine = doc
+    .split('\n')
+    .map((line) => line.replace(/[*\/]/g, '').trim())
+    .find((line) => line) || '';
   return firstLine;
 }
 
@@ -197,13 +203,51 @@ function main(targetDir) {
   printResults(allFunctions);
 }
 
+// 📌 상주 모드: stdin으로 JSON 한 줄 요청, stdout으로 JSON 한 줄 응답
+//   요청: {"id": 1, "paths": ["a.js", "b.tsx"]}
+//   응답: {"id": 1, "results": [{"path", "error", "functions": [{name, line, summary}]}]}
+function toRecord(fn) {
+  return { name: fn.name, line: fn.loc ? fn.loc.start.line : null, summary: fn.summary };
+}
+
+function serve() {
+  const rl = readline.createInterface({ input: process.stdin, terminal: false });
+
+  rl.on('line', (line) => {
+    if (!line.trim()) return;
+
+    let request;
+    try {
+      request = JSON.parse(line);
+    } catch (err) {
+      process.stdout.write(JSON.stringify({ id: null, error: err.message, results: [] }) + '\n');
+      return;
+    }
+
+    const results = (request.paths || []).map((filePath) => {
+      try {
+        const { error, functions } = extractFunctionsFromFile(filePath);
+        return { path: filePath, error, functions: functions.map(toRecord) };
+      } catch (err) {
+        return { path: filePath, error: err.message, functions: [] };
+      }
+    });
+
+    process.stdout.write(JSON.stringify({ id: request.id, results }) + '\n');
+  });
+}
+
 // 📌 CLI 실행
 if (process.argv[1] === fileURLToPath(import.meta.url)) {
-  const targetDir = process.argv[2];
-  if (!targetDir) {
-    // console.log(chalk.red('Usage: node extract_js_functions.js <target_directory>'));
-    process.exit(1);
-  }
+  if (process.argv[2] === '--serve') {
+    serve();
+  } else {
+    const targetDir = process.argv[2];
+    if (!targetDir) {
+      // console.log(chalk.red('Usage: node extract_js_functions.js <target_directory>'));
+      process.exit(1);
+    }
 
-  main(targetDir);
+    main(targetDir);
+  }
 }
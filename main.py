@@ -1,16 +1,30 @@
+import os
+import time
+
+# 시작 시간 측정 기준점 (무거운 import 전에 기록)
+_STARTED = time.perf_counter()
+
 import tkinter as tk
 
 
 from views.main_view import MainView
-from utils.ollama_manager import is_ollama_running, start_ollama_model_background
+from utils.ollama_manager import start_ollama_model_background
+from utils.ollama_health import get_health_monitor
+from utils.ollama_http import STATUS_TIMEOUT
 
 # from viewmodels.prompt_viewmodel import viewmodel, initialize_model_on_start
 import threading
+import multiprocessing
 from tkinter import messagebox
 
+# 설정하면 첫 화면을 그린 직후 시간을 출력하고 종료 (benchmarks/bench_startup.py)
+STARTUP_PROBE_ENV = "GPT_ASSISTANT_STARTUP_PROBE"
+
 
 def check_and_prompt_ollama(model="phi3:mini"):
-    if not is_ollama_running():
+    # 감시 스레드의 첫 확인 결과를 기다림 (직접 요청하지 않음)
+    snapshot = get_health_monitor().wait_first_check(STATUS_TIMEOUT + 1)
+    if snapshot.checked and not snapshot.up:
 
         def prompt():
             answer = messagebox.askyesno(
@@ -23,10 +37,32 @@ def check_and_prompt_ollama(model="phi3:mini"):
         app.after(1000, prompt)
 
 
+def report_startup_and_exit(app, imported, built):
+    """첫 화면이 그려지면 구간별 시간(ms)을 한 줄로 출력하고 종료"""
+    app.update()  # 대기 중인 그리기 작업까지 처리
+    painted = time.perf_counter()
+    print(
+        "STARTUP_READY "
+        f"import_ms={(imported - _STARTED) * 1000:.1f} "
+        f"build_ms={(built - imported) * 1000:.1f} "
+        f"paint_ms={(painted - built) * 1000:.1f} "
+        f"total_ms={(painted - _STARTED) * 1000:.1f}",
+        flush=True,
+    )
+    app.destroy()
+
+
 if __name__ == "__main__":
+    # ✅ PyInstaller 단일 실행파일에서 병렬 함수 추출(프로세스 풀) 지원
+    multiprocessing.freeze_support()
+    imported = time.perf_counter()
     # initialize_model_on_start(viewmodel)
     app = MainView()
-    # Ollama 비동기 상태 체크 (UI 띄운 후 실행)
-    threading.Thread(target=check_and_prompt_ollama, daemon=True).start()
+    built = time.perf_counter()
+    if os.environ.get(STARTUP_PROBE_ENV):
+        app.after_idle(lambda: report_startup_and_exit(app, imported, built))
+    else:
+        # Ollama 비동기 상태 체크 (UI 띄운 후 실행)
+        threading.Thread(target=check_and_prompt_ollama, daemon=True).start()
 
     app.mainloop()
@@ -2,9 +2,21 @@
 
 
 class OllamaModel:
-    def __init__(self, name: str, speed_score: float = 0.0):
+    def __init__(self, name: str, speed_score: float = 0.0, digest: str = ""):
         self.name = name
         self.speed_score = speed_score
+        self.digest = digest
+        self.benchmark = None  # BenchmarkResult (측정 전이면 None)
+
+    def set_benchmark(self, result):
+        self.benchmark = result
+        self.speed_score = result.speed_score if result else 0.0
+
+    def display_name(self):
+        """드롭다운 표시용: 측정 결과가 있으면 이름 뒤에 속도 요약"""
+        if self.benchmark is None:
+            return self.name
+        return f"{self.name}  ({self.benchmark.summary_text()})"
 
     def __repr__(self):
         return f"<OllamaModel name={self.name}, speed_score={self.speed_score}>"
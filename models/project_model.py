@@ -1,10 +1,26 @@
 class ProjectContext:
     def __init__(self):
         self.project_path = ""
-        self.tree_structure = ""
+        self.project_tree = None  # PathTrie (구조 텍스트는 필요할 때 렌더링)
+        self._tree_text = ""
         self.function_summary = ""
         self.config_summary = ""
         self.project_context = ""
 
+    @property
+    def tree_structure(self):
+        if self._tree_text is None:
+            self._tree_text = self.project_tree.render() if self.project_tree else ""
+        return self._tree_text
+
+    @tree_structure.setter
+    def tree_structure(self, text):
+        self._tree_text = text
+
+    def set_project_tree(self, tree):
+        """트리를 바꾸고 전체 구조 텍스트는 다음 조회 때 다시 렌더링"""
+        self.project_tree = tree
+        self._tree_text = None
+
     def is_loaded(self):
         return self.project_path != ""
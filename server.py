@@ -0,0 +1,110 @@
+"""
+로컬 HTTP API 서버: 프로젝트 색인과 모델 세션을 메모리에 유지한 채 에디터/스크립트 요청 처리
+(경로와 요청 형식은 controllers/api_server.py 참고)
+
+사용법 (프로젝트 루트에서):
+    python server.py [--project D:/work/shop ...] [--port 8765] [--model phi3:mini]
+        [--concurrency 2] [--token 토큰] [--no-watch] [--quiet]
+
+    (시작할 때 출력되는 토큰을 TOKEN 에 넣고)
+    curl -s localhost:8765/related-files -H "Authorization: Bearer $TOKEN" \
+        -H "Content-Type: application/json" \
+        -d '{"project": "D:/work/shop", "request": "결제 실패"}'
+    curl -N localhost:8765/analyze -H "Authorization: Bearer $TOKEN" \
+        -H "Content-Type: application/json" \
+        -d '{"project": "D:/work/shop", "request": "결제 실패"}'
+
+--project 로 준 프로젝트는 시작할 때 미리 로드 (나머지는 처음 요청할 때 로드)
+Ollama가 꺼져 있어도 룰 기반 조회(/related-files, /functions, /prompt)는 동작
+"""
+
+import os
+import sys
+import argparse
+import contextlib
+
+from controllers.api_server import (
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    ApiError,
+    ApiServer,
+    ProjectRegistry,
+)
+from utils.ollama_health import get_health_monitor
+from utils.ollama_http import STATUS_TIMEOUT
+from utils.ollama_manager import apply_ollama_model
+from viewmodels.prompt_viewmodel import DEFAULT_MODEL
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="GPT Prompt Assistant 로컬 API 서버")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument(
+        "--project", action="append", default=[], help="미리 로드할 프로젝트 (여러 번)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="동시 분석 요청 수 (기본: OLLAMA_NUM_PARALLEL, 없으면 1)",
+    )
+    parser.add_argument(
+        "--token",
+        default=os.environ.get("GPT_PROMPT_API_TOKEN"),
+        help="요청에 필요한 토큰 (기본: GPT_PROMPT_API_TOKEN, 없으면 시작할 때마다 새로 만듦)",
+    )
+    parser.add_argument("--no-watch", action="store_true", help="파일 감시 끄기")
+    parser.add_argument("--quiet", action="store_true", help="파이프라인 로그 숨김")
+    return parser.parse_args(argv)
+
+
+def _report(message):
+    print(message, file=sys.__stdout__, flush=True)
+
+
+def serve(args):
+    snapshot = get_health_monitor().wait_first_check(STATUS_TIMEOUT + 1)
+    _report(snapshot.status_text())
+    if snapshot.up:
+        # 분석 첫 요청이 모델 로드를 기다리지 않도록 미리 올림
+        apply_ollama_model(args.model)
+
+    registry = ProjectRegistry(args.model, not args.no_watch, args.concurrency)
+    for path in args.project:
+        try:
+            _, info = registry.open(path)
+        except ApiError as e:
+            _report(f"❌ {e.message}")
+            return 2
+        _report(f"📁 {info['path']} (파일 {info['files']}개, {info['load_ms']}ms)")
+
+    server = ApiServer(registry, args.host, args.port, args.token)
+    _report(f"🌐 API 서버: {server.url} (Ctrl+C 로 종료)")
+    _report(f"🔑 토큰: {server.token} (헤더 Authorization: Bearer <토큰>)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        _report("🛑 종료")
+    finally:
+        server.server_close()
+        registry.close_all()
+    return 0
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    # 파이프라인의 print 로그는 표준 오류로 (표준 출력에는 서버 상태만)
+    with contextlib.ExitStack() as stack:
+        log = (
+            stack.enter_context(open(os.devnull, "w", encoding="utf-8"))
+            if args.quiet
+            else sys.stderr
+        )
+        stack.enter_context(contextlib.redirect_stdout(log))
+        return serve(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
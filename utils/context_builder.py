@@ -1,31 +1,32 @@
 import os
 import ast
-import re
 
+from utils.project_scanner import scan_project
+from utils.js_tokenizer import extract_js_symbols
+
+
+def infer_project_context(folder_path, manifest=None):
+    if manifest is None:
+        manifest = scan_project(folder_path)
 
-def infer_project_context(folder_path):
-    EXCLUDE_DIRS = {"venv", ".venv", "__pycache__", ".git", "node_modules"}
     language_set = set()
     file_count = 0
     notebook = False
 
-    for root, dirs, files in os.walk(folder_path):
-        # 디렉토리 제외
-        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
-
-        for file in files:
-            ext = os.path.splitext(file)[1].lower()
-            if ext in [".py", ".ipynb", ".js", ".ts", ".html", ".css"]:
-                file_count += 1
-
-                if ext == ".py":
-                    language_set.add("Python")
-                elif ext == ".ipynb":
-                    notebook = True
-                elif ext == ".js":
-                    language_set.add("JavaScript")
-                elif ext == ".html":
-                    language_set.add("HTML")
+    for entry in manifest.iter_files(
+        folder_path, {".py", ".ipynb", ".js", ".ts", ".html", ".css"}
+    ):
+        file_count += 1
+        ext = entry.ext
+
+        if ext == ".py":
+            language_set.add("Python")
+        elif ext == ".ipynb":
+            notebook = True
+        elif ext == ".js":
+            language_set.add("JavaScript")
+        elif ext == ".html":
+            language_set.add("HTML")
 
     return {
         "language": ", ".join(sorted(language_set)) or "Unknown",
@@ -54,25 +55,17 @@ def extract_functions_from_file(filepath: str) -> list[str]:
 
 def extract_functions_from_js_file(filepath: str) -> list[str]:
     """
-    .js 또는 .jsx 파일에서 함수 이름 추출 (function, arrow function, export default 등)
+    .js/.jsx/.ts/.tsx 파일에서 함수 이름 추출 (function, arrow function, export default 등)
     """
     try:
         with open(filepath, "r", encoding="utf-8") as f:
             content = f.read()
 
-        patterns = [
-            r"function\s+(\w+)\s*\(",  # function Foo(
-            r"const\s+(\w+)\s*=\s*\(",  # const Foo = (
-            r"const\s+(\w+)\s*=\s*function",  # const Foo = function
-            r"export\s+default\s+function\s+(\w+)",  # export default function Foo
-            r"export\s+function\s+(\w+)",  # export function Foo
-        ]
-
-        matches = []
-        for pattern in patterns:
-            matches += re.findall(pattern, content)
-
-        return list(set(matches))  # 중복 제거
+        names = []
+        for rec in extract_js_symbols(content):
+            if rec["name"] not in names:  # 중복 제거
+                names.append(rec["name"])
+        return names
     except Exception:
         return []
 
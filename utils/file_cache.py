@@ -0,0 +1,138 @@
+import os
+import json
+import hashlib
+
+CACHE_FILE_NAME = "files.json"
+CACHE_VERSION = 1
+
+
+def hash_bytes(data):
+    """이미 읽은 파일 내용의 해시 (hash_file과 같은 값)"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def hash_file(path, chunk_size=1 << 16):
+    """파일 내용의 blake2b 해시 (16바이트 hex)"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class FileRecordCache:
+    """
+    .gptcache/files.json 에 파일별 기록(size, mtime, hash, 함수 요약 블록)을 저장합니다.
+    - size/mtime이 같으면 해시 계산 없이 재사용
+    - size는 같고 mtime만 바뀐 경우 해시를 비교해 실제 변경 여부 판단
+    - code_root가 바뀌면 요약 블록의 상대 경로가 달라지므로 전체 무효화
+    """
+
+    def __init__(self, cache_dir, code_root):
+        self.path = os.path.join(cache_dir, CACHE_FILE_NAME)
+        self.code_root = os.path.abspath(code_root)
+        self.records = {}
+        self.dirty = False
+        self.reset_stats()
+        self._load()
+
+    def reset_stats(self):
+        self.stats = {"reused": 0, "added": 0, "changed": 0, "removed": 0}
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[캐시 경고] {self.path} 읽기 실패, 전체 재분석: {e}")
+            return
+
+        if (
+            data.get("version") != CACHE_VERSION
+            or data.get("code_root") != self.code_root
+        ):
+            return
+        self.records = data.get("files", {})
+
+    def lookup(self, entry):
+        """변경되지 않은 파일이면 캐시된 요약 블록을, 아니면 None을 반환"""
+        rec = self.records.get(entry.rel_path)
+        if rec is None:
+            self.stats["added"] += 1
+            return None
+
+        if rec["size"] == entry.size and rec["mtime"] == entry.mtime:
+            self.stats["reused"] += 1
+            return rec["summary"]
+
+        if rec["size"] == entry.size:
+            try:
+                same = hash_file(entry.path) == rec["hash"]
+            except OSError:
+                same = False
+            if same:
+                # ✅ 내용은 그대로 (touch, git checkout 등) → mtime만 갱신
+                rec["mtime"] = entry.mtime
+                self.dirty = True
+                self.stats["reused"] += 1
+                return rec["summary"]
+
+        self.stats["changed"] += 1
+        return None
+
+    def store(self, entry, summary, digest=None):
+        """
+        요약 블록 저장. digest는 요약을 만들 때 읽은 내용의 해시 (없으면 지금 계산)
+        스캔 이후 파일이 바뀌었으면 저장하지 않음 (옛 요약이 새 내용의 해시로 남지 않게)
+        Returns:
+            bool: 저장했으면 True
+        """
+        try:
+            if digest is None:
+                digest = hash_file(entry.path)
+            st = os.stat(entry.path)
+        except OSError:
+            return False
+        if st.st_size != entry.size or st.st_mtime != entry.mtime:
+            return False
+        self.records[entry.rel_path] = {
+            "size": entry.size,
+            "mtime": entry.mtime,
+            "hash": digest,
+            "summary": summary,
+        }
+        self.dirty = True
+        return True
+
+    def prune(self, live_paths):
+        """manifest에 더 이상 없는(삭제된) 파일의 기록 제거"""
+        live = set(live_paths)
+        removed = [p for p in self.records if p not in live]
+        for p in removed:
+            del self.records[p]
+        if removed:
+            self.stats["removed"] += len(removed)
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        data = {
+            "version": CACHE_VERSION,
+            "code_root": self.code_root,
+            "files": self.records,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def summary_text(self):
+        s = self.stats
+        return (
+            f"추가 {s['added']}, 변경 {s['changed']}, "
+            f"삭제 {s['removed']}, 재사용 {s['reused']}"
+        )
@@ -1,8 +1,7 @@
 import os
-import re
 
-# 📌 Python 함수 파싱용
-import ast
+from utils.project_scanner import scan_project
+from utils.symbol_index import extract_python_symbols, extract_js_file_symbols
 
 # ✅ 키워드 유사어 매핑
 KEYWORD_VARIANTS = {
@@ -21,58 +20,63 @@ def expand_keywords(keywords):
     return list(set(expanded))
 
 
+def _function_bodies(filepath, symbols):
+    with open(filepath, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    return [
+        (sym.name, "\n".join(lines[sym.start - 1 : sym.end]))
+        for sym in symbols
+        if sym.kind != "class"
+    ]
+
+
 def extract_function_bodies_from_python(filepath):
+    """(함수/메서드 이름, 데코레이터 포함 본문) 목록"""
     try:
         with open(filepath, "r", encoding="utf-8") as f:
-            source = f.read()
-        tree = ast.parse(source)
-        return [
-            (node.name, ast.get_source_segment(source, node))
-            for node in ast.walk(tree)
-            if isinstance(node, ast.FunctionDef)
-        ]
+            symbols = extract_python_symbols(f.read())
+        return _function_bodies(filepath, symbols)
     except Exception:
         return []
 
 
 def extract_function_bodies_from_js(filepath):
+    """(함수 이름, 함수 본문) 목록 — 심볼 색인과 같은 JS 토크나이저 사용"""
     try:
         with open(filepath, "r", encoding="utf-8") as f:
-            source = f.read()
-        pattern = re.compile(
-            r"(?:function\s+|const\s+)(\w+)\s*=\s*\(.*?\)\s*=>\s*{.*?}", re.DOTALL
-        )
-        matches = pattern.findall(source)
-        return [(name, source) for name in matches]
+            symbols = extract_js_file_symbols(f.read())
+        return _function_bodies(filepath, symbols)
     except Exception:
         return []
 
 
-EXCLUDED_DIRS = {".venv", "venv", "__pycache__", ".git", ".idea", ".gptcache"}
-SUPPORTED_EXTS = [".py", ".js", ".jsx"]
-
+SUPPORTED_EXTS = {".py", ".js", ".jsx"}
 
-def find_related_files(root_dir: str, keywords: list[str]) -> list[str]:
-    matched_files = []
-
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        # 📌 제외할 디렉토리 필터링
-        dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
 
-        for fname in filenames:
-            # 📌 제외할 파일 확장자 필터링
-            if not any(fname.endswith(ext) for ext in SUPPORTED_EXTS):
-                continue
+def find_related_files(
+    root_dir: str, keywords: list[str], manifest=None, index=None, limit=None
+) -> list[str]:
+    """
+    keywords 중 하나라도 포함하는 소스 파일 목록 (root_dir 기준 상대 경로)
+    - index(TrigramIndex)가 주어지면 파일을 모두 읽지 않고 색인으로 후보를 좁혀
+      관련도(키워드 희귀도 × 등장 횟수) 순으로 반환
+    """
+    if index is not None:
+        return index.search(keywords, root_dir, limit)
 
-            # 📌 전체 경로
-            full_path = os.path.join(dirpath, fname)
+    if manifest is None:
+        manifest = scan_project(root_dir)
 
-            try:
-                with open(full_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    if any(keyword in content for keyword in keywords):
-                        matched_files.append(os.path.relpath(full_path, root_dir))
-            except Exception:
-                continue
+    matched_files = []
 
-    return matched_files
+    # 📌 제외 디렉토리/확장자 필터링은 manifest가 담당
+    for entry in manifest.iter_files(root_dir, SUPPORTED_EXTS):
+        try:
+            with open(entry.path, "r", encoding="utf-8") as f:
+                content = f.read()
+                if any(keyword in content for keyword in keywords):
+                    matched_files.append(os.path.relpath(entry.path, root_dir))
+        except Exception:
+            continue
+
+    return matched_files[:limit] if limit is not None else matched_files
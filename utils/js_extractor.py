@@ -0,0 +1,242 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import shutil
+import platform
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.js_tokenizer import extract_js_symbols
+
+DEFAULT_BATCH_SIZE = 32
+
+# "auto": Node(Babel) 우선, 실행할 수 없으면 Python 토크나이저
+# "node": Node만 사용 / "python": Python 토크나이저만 사용 (가장 빠름)
+JS_EXTRACTOR_MODE = "auto"
+
+
+def resolve_node_paths():
+    """
+    node 실행파일과 extract_js_functions.js 경로를 반환합니다.
+    - PyInstaller 빌드 시 내장된 node.exe 우선, 없으면 PATH의 node
+    """
+    base_dir = getattr(sys, "_MEIPASS", os.path.abspath("."))  # 배포 환경 대응
+    node_path = os.path.join(base_dir, "node.exe")  # ✅ 내장된 node 실행파일
+    if not os.path.exists(node_path):
+        node_path = shutil.which("node") or node_path
+    js_script = os.path.join(base_dir, "extract_js_functions.js")
+    return node_path, js_script
+
+
+class ExtractionError(list):
+    """
+    추출 실패 표시 (내용은 요약에 보여 줄 오류 문구 한 줄)
+    일반 목록과 구분되므로 호출하는 쪽은 문구가 아니라 isinstance로 판단
+    """
+
+    def __init__(self, message):
+        super().__init__([f"[⚠️ {message}]"])
+
+
+def format_js_function(record):
+    """Node CLI 출력과 같은 형식: 'name (Line N) // summary'"""
+    line = f" (Line {record['line']})" if record.get("line") else ""
+    summary = f" // {record['summary']}" if record.get("summary") else ""
+    return f"{record['name']}{line}{summary}"
+
+
+class NodeExtractorWorker:
+    """
+    `node extract_js_functions.js --serve` 상주 프로세스 하나.
+    요청/응답은 JSON 한 줄씩 주고받고, 프로세스가 죽으면 다음 요청에서 재시작합니다.
+    """
+
+    def __init__(self, node_path, js_script):
+        self.node_path = node_path
+        self.js_script = js_script
+        self.proc = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _start(self):
+        # ✅ 콘솔창 없이 실행 옵션 추가 (Windows 한정)
+        startup_flags = 0
+        if platform.system() == "Windows":
+            startup_flags = subprocess.CREATE_NO_WINDOW
+
+        self.proc = subprocess.Popen(
+            [self.node_path, self.js_script, "--serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            creationflags=startup_flags,
+        )
+
+    def _ensure_running(self):
+        if self.proc is None or self.proc.poll() is not None:
+            self._start()
+
+    def close(self):
+        proc, self.proc = self.proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=2)
+        except Exception:
+            proc.kill()
+
+    def request(self, paths):
+        """paths 배치를 분석해 [{path, error, functions}] 목록을 반환"""
+        with self._lock:
+            last_error = None
+            for _ in range(2):  # 프로세스가 죽어 있으면 한 번 재시작 후 재시도
+                self._ensure_running()
+                self._next_id += 1
+                request_id = self._next_id
+                try:
+                    self.proc.stdin.write(
+                        json.dumps({"id": request_id, "paths": paths}) + "\n"
+                    )
+                    self.proc.stdin.flush()
+                    line = self.proc.stdout.readline()
+                    if not line:
+                        raise EOFError("Node 추출 프로세스가 종료되었습니다.")
+                    response = json.loads(line)
+                    if response.get("id") != request_id:
+                        raise ValueError(f"응답 ID 불일치: {response.get('id')}")
+                    return response.get("results", [])
+                except (OSError, EOFError, ValueError) as e:
+                    print(f"[JS 추출 경고] Node 프로세스 재시작: {e}")
+                    last_error = e
+                    self.close()
+            raise RuntimeError(f"Node 추출 실패: {last_error}")
+
+
+class NodeExtractorPool:
+    """
+    상주 Node 추출 프로세스 풀.
+    - 파일 목록을 batch_size 단위로 나눠 유휴 워커에 분배
+    - 워커는 처음 필요할 때 생성되고, 앱 종료 시 정리됨
+    """
+
+    def __init__(self, size=None, batch_size=DEFAULT_BATCH_SIZE):
+        self.size = size or min(4, os.cpu_count() or 1)
+        self.batch_size = batch_size
+        self.node_path, self.js_script = resolve_node_paths()
+        self._workers = []
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        with self._lock:
+            if self._idle.empty() and len(self._workers) < self.size:
+                worker = NodeExtractorWorker(self.node_path, self.js_script)
+                self._workers.append(worker)
+                return worker
+        return self._idle.get()
+
+    def _run_batch(self, batch):
+        worker = self._acquire()
+        try:
+            return worker.request(batch)
+        finally:
+            self._idle.put(worker)
+
+    def available(self):
+        return os.path.isfile(self.node_path) and os.path.isfile(self.js_script)
+
+    def extract(self, paths):
+        """
+        paths의 함수 목록을 반환합니다.
+        Node 실행 자체가 실패하면 FileNotFoundError / RuntimeError를 그대로 올림.
+        Returns:
+            dict[str, list[str]]: 경로 → 'name (Line N) // summary' 목록
+        """
+        if not paths:
+            return {}
+
+        batches = [
+            paths[i : i + self.batch_size]
+            for i in range(0, len(paths), self.batch_size)
+        ]
+        results = {}
+
+        with ThreadPoolExecutor(max_workers=min(self.size, len(batches))) as ex:
+            for batch_results in ex.map(self._run_batch, batches):
+                for item in batch_results:
+                    if item.get("error"):
+                        results[item["path"]] = ExtractionError(
+                            f"JS 파싱 오류: {item['error']}"
+                        )
+                    else:
+                        results[item["path"]] = [
+                            format_js_function(fn) for fn in item["functions"]
+                        ]
+        return results
+
+    def shutdown(self):
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.close()
+        self._idle = queue.Queue()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_node_extractor_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = NodeExtractorPool()
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def extract_js_functions_python(path):
+    """Node 없이 Python 토크나이저로 JS/TS 파일의 함수 목록을 추출"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+        return [format_js_function(rec) for rec in extract_js_symbols(source)]
+    except Exception as e:
+        return ExtractionError(f"JS 파싱 오류: {e}")
+
+
+def extract_js_functions_batch(paths, mode=None):
+    """
+    JS/TS 파일 목록의 함수 목록을 추출합니다.
+    Returns:
+        dict[str, list[str]]: 경로 → 'name (Line N) // summary' 목록
+        (추출하지 못한 파일은 ExtractionError)
+    """
+    mode = mode or JS_EXTRACTOR_MODE
+    if not paths:
+        return {}
+
+    if mode != "python":
+        pool = get_node_extractor_pool()
+        if mode == "node" or pool.available():
+            try:
+                return pool.extract(paths)
+            except FileNotFoundError:
+                print("❌ Node.js 실행파일(node)을 찾을 수 없습니다.")
+                if mode == "node":
+                    return {p: ExtractionError("Node.js not found") for p in paths}
+            except RuntimeError as e:
+                print(f"❌ {e}")
+                if mode == "node":
+                    return {p: ExtractionError(f"JS 파싱 오류: {e}") for p in paths}
+        print("⚡ Node 대신 Python 토크나이저로 JS/TS 함수 추출")
+
+    return {p: extract_js_functions_python(p) for p in paths}
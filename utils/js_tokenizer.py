@@ -0,0 +1,582 @@
+import re
+
+# 📌 Node(Babel) 없이 JS/TS/JSX/TSX 함수 목록을 뽑기 위한 경량 토크나이저
+#   - 문자열, 주석, 템플릿 리터럴, 정규식 리터럴을 건너뛰고 코드 토큰만 남김
+#   - extract_js_functions.js 의 방문자(visitor)와 같은 구문을 같은 이름/줄번호로 추출
+
+# 한 번의 match로 토큰 하나를 읽는 통합 정규식 (lastgroup으로 종류 판별)
+_TOKEN_RE = re.compile(
+    r"(?P<ws>[ \t\n\r\f\v\u00a0\ufeff\u2028\u2029]+)"
+    r"|(?P<lc>//[^\n]*)"
+    r"|(?P<bc>/\*[\s\S]*?(?:\*/|\Z))"
+    r"|(?P<name>[A-Za-z_$\u0080-\uffff][\w$\u0080-\uffff]*)"
+    r"|(?P<num>\.?\d[\w.]*)"
+    r"|(?P<str>\"(?:[^\"\\\n]|\\[\s\S])*\"|'(?:[^'\\\n]|\\[\s\S])*')"
+    r"|(?P<tick>`)"
+    r"|(?P<punct>>>>=|\.\.\.|===|!==|\*\*=|<<=|>>=|&&=|\|\|=|\?\?=|>>>|=>|==|!="
+    r"|<=|>=|&&|\|\||\?\?|\?\.|\+\+|--|\+=|-=|\*=|/=|%=|&=|\|=|\^=|<<|>>|\*\*"
+    r"|[{}()\[\];,<>+\-*/%&|^!~?:=.@#'\"])"
+)
+_TEMPLATE_CHUNK_RE = re.compile(r"(?:[^`\\$]|\\[\s\S]|\$(?!\{))*")
+_REGEX_RE = re.compile(r"/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*")
+
+# 이 토큰 뒤의 "/" 는 나눗셈이 아니라 정규식 리터럴의 시작
+_REGEX_AFTER_NAMES = {
+    "return",
+    "typeof",
+    "instanceof",
+    "in",
+    "of",
+    "new",
+    "delete",
+    "void",
+    "throw",
+    "case",
+    "do",
+    "else",
+    "yield",
+    "await",
+}
+
+NAME, PUNCT, STRING, NUMBER, TEMPLATE, REGEX = range(6)
+
+
+class Token:
+    __slots__ = ("kind", "value", "line", "comment")
+
+    def __init__(self, kind, value, line, comment):
+        self.kind = kind
+        self.value = value
+        self.line = line
+        # 바로 앞(이전 토큰과의 사이)에 있는 마지막 주석의 내용 (Babel leadingComments)
+        self.comment = comment
+
+    def __repr__(self):
+        return f"<Token {self.value!r} L{self.line}>"
+
+
+def tokenize_js(source):
+    """
+    JS/TS 소스를 토큰 목록으로 변환합니다.
+    - 템플릿 리터럴의 ${ ... } 내부 코드는 일반 토큰으로 내보내고,
+      앞뒤를 가상의 "(" / ")" 로 감싸 괄호 균형을 유지
+    - 줄바꿈 없이 닫히지 않는 따옴표/정규식은 한 글자 구두점으로 처리 (JSX 텍스트 대비)
+    """
+    tokens = []
+    pos = 0
+    line = 1
+    length = len(source)
+    comment = None
+    template_depths = []  # ${ 안에서의 중괄호 깊이 스택
+
+    def emit(kind, value):
+        nonlocal comment
+        tokens.append(Token(kind, value, line, comment))
+        comment = None
+
+    def scan_template_chunk(start):
+        """` 또는 } 다음부터 템플릿 문자열 조각을 읽고 끝 위치를 반환"""
+        nonlocal line
+        m = _TEMPLATE_CHUNK_RE.match(source, start)
+        end = m.end()
+        line += source.count("\n", start, end)
+        if source.startswith("${", end):
+            template_depths.append(0)
+            emit(PUNCT, "(")
+            return end + 2
+        emit(TEMPLATE, "`")
+        return end + 1
+
+    while pos < length:
+        m = _TOKEN_RE.match(source, pos)
+        if m is None:
+            pos += 1  # 알 수 없는 문자는 무시
+            continue
+
+        kind = m.lastgroup
+        text = m.group()
+
+        if kind == "ws":
+            line += text.count("\n")
+            pos = m.end()
+            continue
+        if kind == "lc":
+            comment = text[2:]
+            pos = m.end()
+            continue
+        if kind == "bc":
+            comment = text[2:-2] if text.endswith("*/") else text[2:]
+            line += text.count("\n")
+            pos = m.end()
+            continue
+        if kind == "name":
+            emit(NAME, text)
+        elif kind == "num":
+            emit(NUMBER, text)
+        elif kind == "str":
+            emit(STRING, text)
+            line += text.count("\n")
+        elif kind == "tick":
+            pos = scan_template_chunk(m.end())
+            continue
+        else:
+            if text[0] == "/":
+                prev = tokens[-1] if tokens else None
+                if (
+                    prev is None
+                    or (prev.kind == PUNCT and prev.value not in (")", "]", "}", "<"))
+                    or (prev.kind == NAME and prev.value in _REGEX_AFTER_NAMES)
+                ):
+                    r = _REGEX_RE.match(source, pos)
+                    if r:
+                        emit(REGEX, r.group())
+                        pos = r.end()
+                        continue
+            elif template_depths and text == "{":
+                template_depths[-1] += 1
+            elif template_depths and text == "}":
+                if template_depths[-1] == 0:
+                    template_depths.pop()
+                    emit(PUNCT, ")")
+                    pos = scan_template_chunk(m.end())
+                    continue
+                template_depths[-1] -= 1
+            emit(PUNCT, text)
+
+        pos = m.end()
+
+    return tokens
+
+
+def _doc_summary(comment):
+    """extract_js_functions.js 의 extractDocSummary 와 같은 규칙 (첫 번째 내용 줄)"""
+    if comment is None:
+        return ""
+    for line in comment.strip().split("\n"):
+        line = re.sub(r"[*/]", "", line).strip()
+        if line:
+            return line
+    return ""
+
+
+_OPEN = {"(": ")", "[": "]", "{": "}"}
+_CLOSE = {")", "]", "}"}
+
+# 뒤에 "{" 가 오면 블록이 아니라 객체 리터럴이 되는 키워드
+_EXPR_KEYWORDS = {
+    "return",
+    "typeof",
+    "in",
+    "of",
+    "new",
+    "delete",
+    "void",
+    "throw",
+    "case",
+    "yield",
+    "await",
+}
+# 타입 주석이 끝날 수 있는 토큰 (이 뒤의 "{" 는 함수 본문)
+_TYPE_END_PUNCT = {">", "]", ")", "}"}
+# 줄이 바뀌어도 타입이 이어지는 토큰
+_TYPE_CONTINUE = {"|", "&", "?", ":", ".", "=>", "extends", "keyof", "[", "<", ">", "="}
+
+
+class _SymbolScanner:
+    def __init__(self, tokens):
+        self.toks = tokens
+        self.n = len(tokens)
+        self.match = self._match_brackets()
+        self.opener = {c: o for o, c in self.match.items()}
+        self.ternary_colon = None
+        self.pending_header = None
+        self.records = []
+        self._seen = set()
+
+    def _match_brackets(self):
+        match = {}
+        stack = []
+        for i, tok in enumerate(self.toks):
+            if tok.kind != PUNCT:
+                continue
+            if tok.value in _OPEN:
+                stack.append(i)
+            elif tok.value in _CLOSE:
+                # 짝이 안 맞는 닫는 괄호는 같은 종류의 여는 괄호가 있을 때만 되감기
+                k = len(stack) - 1
+                while k >= 0 and _OPEN[self.toks[stack[k]].value] != tok.value:
+                    k -= 1
+                if k >= 0:
+                    del stack[k + 1 :]
+                    match[stack.pop()] = i
+        return match
+
+    def _v(self, i):
+        if i is not None and 0 <= i < self.n:
+            tok = self.toks[i]
+            if tok.kind in (NAME, PUNCT):
+                return tok.value
+        return None
+
+    def _add(self, name, start):
+        tok = self.toks[start]
+        key = (name, tok.line)
+        if key not in self._seen:
+            self._seen.add(key)
+            self.records.append(
+                {
+                    "name": name,
+                    "line": tok.line,
+                    "end_line": self._end_line(start),
+                    "summary": _doc_summary(tok.comment),
+                }
+            )
+
+    def _end_line(self, start):
+        """start에서 시작하는 함수의 마지막 줄 (본문 "}" 또는 화살표 함수 식의 끝)"""
+        j = start
+        limit = min(self.n, start + 64)
+        while j < limit and self._v(j) not in ("(", "=>"):
+            if self._v(j) == "[":
+                j = self._close_of(j)
+            elif self._v(j) == "<":
+                j = self._skip_type(j + 1, {">"})
+            j += 1
+
+        body = self._function_end(j) if self._v(j) == "(" else j
+        if body is None or body >= self.n:
+            return self.toks[start].line
+        if self._v(body) == "=>":
+            if self._v(body + 1) == "{":
+                body += 1
+            else:
+                k = self._skip_type(body + 1, {",", ";"}, newline_stop=True)
+                return self.toks[max(body, min(k, self.n) - 1)].line
+        if self._v(body) == "{":
+            return self.toks[self._close_of(body)].line
+        return self.toks[start].line
+
+    def _ends_statement_at_newline(self, i):
+        """
+        i 토큰이 새 줄에서 시작하고 바로 앞 토큰에서 문장이 끝날 수 있는지
+        (세미콜론을 생략한 코드: 자동 세미콜론 삽입(ASI) 규칙)
+        """
+        if i == 0:
+            return False
+        prev = self.toks[i - 1]
+        if self.toks[i].line <= prev.line:
+            return False
+        if prev.kind == NAME:
+            return prev.value not in _EXPR_KEYWORDS
+        return prev.kind != PUNCT or prev.value in (")", "]")
+
+    def _close_of(self, i):
+        return self.match.get(i, self.n - 1)
+
+    def _can_end_type(self, j):
+        tok = self.toks[j]
+        return tok.kind != PUNCT or tok.value in _TYPE_END_PUNCT
+
+    def _skip_type(self, i, stops, newline_stop=False):
+        """
+        타입 주석을 건너뛰고 stops 중 하나(같은 깊이)가 나오는 위치를 반환합니다.
+        - "{" 는 타입을 끝낼 수 있는 토큰 뒤에서만 멈춤 (함수 본문 시작)
+        - newline_stop: 세미콜론 없는 코드에서 줄바꿈을 선언의 끝으로 간주
+        """
+        angle = 0
+        j = i
+        limit = min(self.n, i + 256)
+        while j < limit:
+            v = self._v(j)
+            if v in _CLOSE:
+                return j
+            if (
+                newline_stop
+                and angle == 0
+                and j > i
+                and self.toks[j].line > self.toks[j - 1].line
+                and self._can_end_type(j - 1)
+                and v not in _TYPE_CONTINUE
+            ):
+                return j
+            if angle == 0 and v in stops:
+                if v != "{" or self._can_end_type(j - 1):
+                    return j
+            if v in _OPEN:
+                j = self._close_of(j) + 1
+                continue
+            if v == "<":
+                angle += 1
+            elif v == ">" and angle:
+                angle -= 1
+            elif v == ">>" and angle:
+                angle = max(0, angle - 2)
+            j += 1
+        return j
+
+    def _function_end(self, paren):
+        """파라미터 "(" 위치에서 함수 본문 "{" 또는 "=>" 위치를 찾음 (없으면 None)"""
+        j = self._close_of(paren) + 1
+        if self._v(j) == ":":
+            j = self._skip_type(j + 1, {"{", "=>", ";"})
+        if self._v(j) in ("{", "=>"):
+            return j
+        return None
+
+    def _is_function_init(self, i):
+        """i 위치에서 함수 표현식/화살표 함수가 시작되는지"""
+        v = self._v(i)
+        if v == "async" and self._v(i + 1) not in ("=", ".", ",", ")", ";", ":"):
+            i += 1
+            v = self._v(i)
+        if v == "function":
+            return True
+        if v == "<":  # 제네릭 화살표 함수 <T,>(x: T) => x
+            j = self._skip_type(i + 1, {">"})
+            if self._v(j) != ">":
+                return False
+            i = j + 1
+            v = self._v(i)
+        if v == "(":
+            return self._v(self._function_end(i)) == "=>"
+        tok = self.toks[i] if i < self.n else None
+        return tok is not None and tok.kind == NAME and self._v(i + 1) == "=>"
+
+    def _function_name(self, i):
+        """i = 'function' 위치. (이름, 본문 있음 여부)"""
+        j = i + 1
+        if self._v(j) == "*":
+            j += 1
+        name = None
+        if j < self.n and self.toks[j].kind == NAME:
+            name = self.toks[j].value
+            j += 1
+        if self._v(j) == "<":
+            j = self._skip_type(j + 1, {">"}) + 1
+        if self._v(j) != "(":
+            return name, False
+        return name, self._v(self._function_end(j)) == "{"
+
+    def _brace_kind(self, i, stack):
+        if self.pending_header is not None and self.pending_header[1] == len(stack):
+            kind = self.pending_header[0]
+            self.pending_header = None
+            return kind
+
+        top = stack[-1][0]
+        prev = self.toks[i - 1] if i else None
+        if prev is None:
+            return "block"
+        pv = prev.value
+
+        if prev.kind == PUNCT:
+            if pv in (")", "=>", ";", "}"):
+                return "block"
+            if pv == "{":
+                return "object" if top in ("object", "pattern") else "block"
+            if pv == ":":
+                if top == "object" or self.ternary_colon == i - 1:
+                    return "object"
+                return "block"
+            if pv == ">":
+                return "block"
+            return "object"  # =, (, [, ,, ?, 연산자 뒤
+        if prev.kind == NAME:
+            if pv in ("const", "let", "var"):
+                return "pattern"
+            if pv in _EXPR_KEYWORDS:
+                return "object"
+            return "block"
+        return "block"
+
+    def scan(self):
+        toks = self.toks
+        stack = [["block", 0]]  # [kind, 삼항 연산자 "?" 개수], 맨 아래는 최상위
+        decl_depth = None  # const/let/var 선언이 진행 중인 깊이
+        expect_decl_name = False
+
+        i = 0
+        while i < self.n:
+            tok = toks[i]
+            v = tok.value if tok.kind in (NAME, PUNCT) else None
+            top = stack[-1][0]
+            prev_v = self._v(i - 1)
+
+            if v is None:
+                i += 1
+                continue
+
+            # ── 괄호/중괄호 문맥 ─────────────────────────────
+            if v == "{":
+                stack.append([self._brace_kind(i, stack), 0])
+                i += 1
+                continue
+            if v in ("(", "["):
+                stack.append(["paren" if v == "(" else "bracket", 0])
+                i += 1
+                continue
+            if v in _CLOSE:
+                if len(stack) > 1:
+                    stack.pop()
+                if decl_depth is not None and len(stack) < decl_depth:
+                    decl_depth = None
+                i += 1
+                continue
+
+            if v == ";":
+                if decl_depth is not None and len(stack) <= decl_depth:
+                    decl_depth = None
+                    expect_decl_name = False
+                self.pending_header = None
+                i += 1
+                continue
+
+            if v == "?":
+                if self._v(i + 1) not in (":", ")", ",", "=", "."):
+                    stack[-1][1] += 1
+                i += 1
+                continue
+
+            if v == "," and decl_depth is not None and len(stack) == decl_depth:
+                expect_decl_name = True
+                i += 1
+                continue
+
+            if prev_v == ".":  # 멤버 접근 (obj.function 등)은 무시
+                i += 1
+                continue
+
+            # ── 클래스/인터페이스 헤더 ───────────────────────
+            if v in ("class", "interface", "enum") and self._v(i + 1) != ":":
+                kind = "class" if v == "class" else "type"
+                self.pending_header = (kind, len(stack))
+                i += 1
+                continue
+
+            # ── TS type 별칭: 선언 끝까지 건너뜀 ─────────────
+            if (
+                v == "type"
+                and tok.kind == NAME
+                and i + 2 < self.n
+                and toks[i + 1].kind == NAME
+                and self._v(i + 2) in ("=", "<")
+                and prev_v in (None, ";", "{", "}", "export", "declare")
+            ):
+                i = self._skip_type(i + 1, {";"}, newline_stop=True)
+                continue
+
+            # ── 콜론: 삼항 / 객체 속성 / 타입 주석 ───────────
+            if v == ":":
+                if stack[-1][1] > 0:
+                    stack[-1][1] -= 1
+                    self.ternary_colon = i
+                    i += 1
+                    continue
+                if prev_v == ")":  # 반환 타입
+                    i = self._skip_type(i + 1, {"{", "=>", ";"})
+                    continue
+                if top == "object":
+                    key_start = i - 1
+                    if prev_v == "]":
+                        key_start = self.opener.get(i - 1, i - 1)
+                    if self._v(key_start - 1) in ("{", ","):
+                        if self._is_function_init(i + 1):
+                            key = toks[i - 1]
+                            name = key.value if key.kind == NAME else "(anonymous)"
+                            self._add(name, i + 1)
+                    i += 1
+                    continue
+                if top == "paren":
+                    i = self._skip_type(i + 1, {",", "="})
+                    continue
+                if top == "class":
+                    i = self._skip_type(i + 1, {";", "="}, newline_stop=True)
+                    continue
+                i += 1
+                continue
+
+            # ── const / let / var 선언 ──────────────────────
+            if v in ("const", "let", "var") and tok.kind == NAME:
+                decl_depth = len(stack)
+                expect_decl_name = True
+                i += 1
+                continue
+
+            if expect_decl_name and tok.kind == NAME and len(stack) == decl_depth:
+                expect_decl_name = False
+                j = i + 1
+                if self._v(j) == "!":
+                    j += 1
+                if self._v(j) == ":":
+                    j = self._skip_type(j + 1, {"=", ",", ";"}, newline_stop=True)
+                if self._v(j) == "=" and self._is_function_init(j + 1):
+                    self._add(tok.value, j + 1)
+                i = j
+                continue
+            expect_decl_name = False if tok.kind == PUNCT else expect_decl_name
+
+            # ── export default ──────────────────────────────
+            if v == "default" and prev_v == "export":
+                j = i + 1
+                if self._is_function_init(j):
+                    k = j + 1 if self._v(j) == "async" else j
+                    name = None
+                    if self._v(k) == "function":
+                        name, _ = self._function_name(k)
+                    self._add(name or "defaultExport", j)
+                i += 1
+                continue
+
+            # ── function 선언 ───────────────────────────────
+            if v == "function":
+                start = i - 1 if prev_v == "async" else i
+                before = self._v(start - 1)
+                if (
+                    start == 0
+                    or before in (";", "{", "}", "export", "default")
+                    or self._ends_statement_at_newline(start)
+                ):
+                    if top not in ("object", "class", "pattern"):
+                        name, has_body = self._function_name(i)
+                        if has_body:
+                            self._add(name or "익명 함수", start)
+                i += 1
+                continue
+
+            # ── 객체 메서드: key() {}, async key() {}, get key() {} ──
+            if top == "object" and prev_v in ("{", ","):
+                j = i
+                while self._v(j) in ("async", "get", "set", "*") and self._v(
+                    j + 1
+                ) not in ("(", ":", ",", "}", "="):
+                    j += 1
+                key = toks[j] if j < self.n else None
+                if key is not None:
+                    if self._v(j) == "[":
+                        paren = self._close_of(j) + 1
+                        name = "(anonymous)"
+                    else:
+                        paren = j + 1
+                        name = key.value if key.kind == NAME else "(anonymous)"
+                    if self._v(paren) == "<":
+                        paren = self._skip_type(paren + 1, {">"}) + 1
+                    if (
+                        self._v(paren) == "("
+                        and self._v(self._function_end(paren)) == "{"
+                    ):
+                        self._add(name, i)
+                i += 1
+                continue
+
+            i += 1
+
+        return self.records
+
+
+def extract_js_symbols(source):
+    """
+    JS/TS 소스에서 함수 목록을 추출합니다.
+    Returns:
+        list[dict]: [{"name", "line", "end_line", "summary"}] (소스 순서)
+    """
+    return _SymbolScanner(tokenize_js(source)).scan()
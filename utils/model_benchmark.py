@@ -0,0 +1,203 @@
+import os
+import json
+import time
+import threading
+
+from utils.ollama_http import get_client
+from utils.ollama_client import FILE_SELECTION_RULES
+
+# 📌 설치된 모델 속도 측정 (모델 선택/드롭다운 표시용)
+#   - 고정된 프로젝트 분석 프롬프트(파일 선택 단계와 같은 형태)를 모델마다 한 번씩 실행
+#   - 측정 전에 모델을 내려서(keep_alive=0) 로드 시간까지 매번 같은 조건으로 측정
+#   - 로드 시간/프롬프트 평가/생성 속도는 Ollama 마지막 스트림 줄의 통계, 첫 토큰 시간은 직접 측정
+#   - 결과는 ~/.gptcache/model_scores.json 에 저장 (모델 digest가 바뀌면 다시 측정 필요)
+
+SCORES_DIR = os.path.join(os.path.expanduser("~"), ".gptcache")
+SCORES_FILE_NAME = "model_scores.json"
+SCORES_VERSION = 1
+
+BENCHMARK_TIMEOUT = 600  # 모델 하나 측정 최대 시간 (CPU에서 큰 모델 로드 고려)
+BENCHMARK_OPTIONS = {"temperature": 0, "seed": 42, "num_predict": 64, "num_ctx": 4096}
+# 추정 응답 시간 = 일반적인 파일 선택 요청 (큰 프롬프트 + 짧은 파일 목록 답변)
+TYPICAL_PROMPT_TOKENS = 2000
+TYPICAL_ANSWER_TOKENS = 60
+
+BENCHMARK_PROMPT = FILE_SELECTION_RULES + (
+    "### 🔧 프로젝트 컨텍스트\n"
+    "- 언어: Python\n- 프레임워크: tkinter, requests\n- 패턴: MVVM\n\n"
+    "### 📁 프로젝트 구조\n"
+    "📁 shop/\n"
+    "    📁 controllers/\n"
+    "        📄 cart_controller.py\n        📄 order_controller.py\n"
+    "        📄 user_controller.py\n"
+    "    📁 models/\n"
+    "        📄 cart.py\n        📄 order.py\n        📄 product.py\n        📄 user.py\n"
+    "    📁 services/\n"
+    "        📄 payment_service.py\n        📄 shipping_service.py\n"
+    "        📄 session_service.py\n        📄 mail_service.py\n"
+    "    📁 utils/\n"
+    "        📄 config_loader.py\n        📄 http_client.py\n        📄 logger.py\n"
+    "    📁 views/\n"
+    "        📄 cart_view.py\n        📄 checkout_view.py\n        📄 login_view.py\n"
+    "    📄 main.py\n    📄 settings.json\n\n"
+    "### 🗣️ 내 요청:\n"
+    "결제가 실패하면 장바구니가 비워지는 버그가 있어. "
+    "결제 실패 시 장바구니를 유지하고 사용자에게 다시 시도하라는 메시지를 보여주고 싶어.\n"
+)
+
+
+class BenchmarkResult:
+    def __init__(self, model, digest="", **values):
+        self.model = model
+        self.digest = digest
+        self.load_seconds = values.get("load_seconds", 0.0)
+        self.first_token_seconds = values.get("first_token_seconds", 0.0)
+        self.prompt_tokens_per_second = values.get("prompt_tokens_per_second", 0.0)
+        self.eval_tokens_per_second = values.get("eval_tokens_per_second", 0.0)
+        self.measured_at = values.get("measured_at", 0.0)
+
+    @classmethod
+    def from_stats(cls, model, digest, stats, first_token_seconds):
+        """Ollama 응답 통계(*_count, *_duration: 나노초) → 결과"""
+
+        def rate(count_key, duration_key):
+            seconds = stats.get(duration_key, 0) / 1e9
+            return stats.get(count_key, 0) / seconds if seconds > 0 else 0.0
+
+        return cls(
+            model,
+            digest,
+            load_seconds=stats.get("load_duration", 0) / 1e9,
+            first_token_seconds=first_token_seconds,
+            prompt_tokens_per_second=rate("prompt_eval_count", "prompt_eval_duration"),
+            eval_tokens_per_second=rate("eval_count", "eval_duration"),
+            measured_at=time.time(),
+        )
+
+    def estimated_seconds(self):
+        """모델이 올라와 있을 때 일반적인 파일 선택 요청 하나에 걸리는 시간 추정"""
+        if self.prompt_tokens_per_second <= 0 or self.eval_tokens_per_second <= 0:
+            return float("inf")
+        return (
+            TYPICAL_PROMPT_TOKENS / self.prompt_tokens_per_second
+            + TYPICAL_ANSWER_TOKENS / self.eval_tokens_per_second
+        )
+
+    @property
+    def speed_score(self):
+        """클수록 빠름 (분당 처리 가능한 요청 수 추정)"""
+        seconds = self.estimated_seconds()
+        return 60.0 / seconds if seconds != float("inf") else 0.0
+
+    def summary_text(self):
+        return (
+            f"⚡ 약 {self.estimated_seconds():.1f}s · 생성 "
+            f"{self.eval_tokens_per_second:.0f} tok/s"
+        )
+
+    def detail_text(self):
+        return (
+            f"{self.model}: 로드 {self.load_seconds:.1f}s, 첫 토큰 "
+            f"{self.first_token_seconds:.1f}s, 프롬프트 "
+            f"{self.prompt_tokens_per_second:.0f} tok/s, 생성 "
+            f"{self.eval_tokens_per_second:.0f} tok/s"
+        )
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        return cls(data.pop("model"), data.pop("digest", ""), **data)
+
+
+def benchmark_model(model, digest="", base_url=None, timeout=BENCHMARK_TIMEOUT):
+    """
+    모델 하나를 내렸다가 고정 프롬프트로 스트리밍 실행해 측정합니다.
+    측정 뒤에는 모델을 내려 둡니다 (여러 모델을 차례로 측정해도 메모리에 쌓이지 않게).
+    Raises:
+        RuntimeError: 시간 초과 또는 Ollama 오류
+    """
+    from utils.ollama_async import start_generate_stream
+
+    get_client(base_url).unload_model(model)
+
+    finished = threading.Event()
+    outcome = {}
+
+    def on_token(token):
+        outcome.setdefault("first_token", time.perf_counter())
+
+    def on_complete(text, cancelled, stats):
+        outcome["stats"] = stats
+        finished.set()
+
+    def on_error(e):
+        outcome["error"] = e
+        finished.set()
+
+    payload = {
+        "model": model,
+        "prompt": BENCHMARK_PROMPT,
+        "options": BENCHMARK_OPTIONS,
+        "keep_alive": 0,
+    }
+    start = time.perf_counter()
+    handle = start_generate_stream(payload, on_token, on_complete, on_error, base_url)
+    if not finished.wait(timeout):
+        handle.cancel()
+        raise RuntimeError(f"{model} 측정 시간 초과 ({timeout}s)")
+    if "error" in outcome:
+        raise RuntimeError(f"{model} 측정 실패: {outcome['error']}")
+
+    first_token = outcome.get("first_token", time.perf_counter()) - start
+    return BenchmarkResult.from_stats(model, digest, outcome["stats"], first_token)
+
+
+class ModelScoreStore:
+    """모델별 마지막 측정 결과 (digest가 다르면 무효)"""
+
+    def __init__(self, cache_dir=SCORES_DIR):
+        self.path = os.path.join(cache_dir, SCORES_FILE_NAME)
+        self.results = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[캐시 경고] {self.path} 읽기 실패, 모델 점수 초기화: {e}")
+            return
+        if data.get("version") != SCORES_VERSION:
+            return
+        self.results = {
+            name: BenchmarkResult.from_dict(entry)
+            for name, entry in data.get("models", {}).items()
+        }
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = {
+            "version": SCORES_VERSION,
+            "models": {name: r.to_dict() for name, r in self.results.items()},
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, model, digest=""):
+        result = self.results.get(model)
+        if result is None or (digest and result.digest and result.digest != digest):
+            return None
+        return result
+
+    def put(self, result):
+        with self._lock:
+            self.results[result.model] = result
+            self._save()
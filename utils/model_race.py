@@ -0,0 +1,190 @@
+import os
+import re
+import time
+import threading
+
+from utils.ollama_client import start_ollama_stream
+
+# 📌 파일 선택 단계 모델 경주 (같은 요청을 여러 모델에 동시에 보냄)
+#   - race: 프로젝트에 있는 파일 이름이 하나라도 들어 있는 답변이 먼저 오면 그 모델이 승리,
+#           나머지 스트림은 바로 취소 (어떤 모델이 빠른지는 지금 올라와 있는 모델에 따라 다름)
+#   - fanout: 모든 모델의 답변을 기다려 파일 목록을 합침 (중복 제거, 누락 줄이기)
+#   - 유효한 답변이 하나도 없으면 먼저 온 답변(모두 오류면 오류 문구)을 그대로 사용
+
+RACE = "race"
+FANOUT = "fanout"
+RACE_MODES = (RACE, FANOUT)
+
+ERROR_PREFIX = "[오류 발생]"
+_FILENAME_RE = re.compile(r"[\w\-./\\]+\.\w+")
+
+
+def extract_filenames(text, known_files):
+    """
+    답변에서 프로젝트에 있는 파일만 나온 순서대로 (중복 제거)
+    상대 경로가 맞으면 그 파일, 아니면 파일 이름이 같은 첫 파일로 봄
+    """
+    by_path = {path.replace("\\", "/"): path for path in known_files}
+    by_name = {}
+    for path in known_files:
+        by_name.setdefault(os.path.basename(path), path)
+
+    found = []
+    for match in _FILENAME_RE.findall(text or ""):
+        candidate = match.replace("\\", "/")
+        while candidate.startswith("./"):
+            candidate = candidate[2:]
+        path = by_path.get(candidate) or by_name.get(os.path.basename(candidate))
+        if path is not None and path not in found:
+            found.append(path)
+    return found
+
+
+class RaceResult:
+    def __init__(self, mode, models):
+        self.mode = mode
+        self.models = models
+        self.winner = None  # race: 이긴 모델 / fanout: 유효한 답을 가장 먼저 준 모델
+        self.text = ""
+        self.files = []
+        self.answers = {}  # 모델 → (답변, 걸린 초) — 끝까지 받은 것만
+        self.errors = {}  # 모델 → 오류 문구
+        self.cancelled = False
+        self.started_at = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def failed(self):
+        return self.text.startswith(ERROR_PREFIX)
+
+    def summary_text(self):
+        if self.cancelled:
+            return f"🛑 모델 경주 중지 ({len(self.models)}개 모델)"
+        if self.mode == FANOUT:
+            return (
+                f"🧩 {len(self.answers)}/{len(self.models)}개 모델 답변 합침: "
+                f"파일 {len(self.files)}개 ({self.elapsed:.1f}s)"
+            )
+        if self.winner is None:
+            return f"🏁 모델 경주: 유효한 답변 없음 ({len(self.models)}개 모델)"
+        return f"🏁 {self.winner} 승리 ({self.elapsed:.1f}s, {len(self.models)}개 모델)"
+
+
+def _ignore_token(token):
+    pass  # 승자가 정해진 뒤 답변 전체를 한 번에 넘김
+
+
+class ModelRace:
+    """start_model_race 가 반환하는 핸들 (StreamHandle 처럼 cancel/done/wait)"""
+
+    def __init__(self, mode, entries, known_files, on_complete):
+        self.result = RaceResult(mode, [model for model, _, _ in entries])
+        self._entries = entries
+        self._known_files = known_files
+        self._on_complete = on_complete
+        self._handles = {}
+        self._pending = set(self.result.models)
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self, keep_alive=None):
+        for model, prompt, options in self._entries:
+            with self._lock:
+                if self._done.is_set():
+                    break  # 먼저 시작한 모델이 벌써 이김 (캐시된 답변 등)
+                self._handles[model] = start_ollama_stream(
+                    model,
+                    prompt,
+                    _ignore_token,
+                    lambda text, model=model: self._on_answer(model, text),
+                    options=options,
+                    keep_alive=keep_alive,
+                )
+        return self
+
+    def _on_answer(self, model, text):
+        seconds = time.perf_counter() - self.result.started_at
+        result = self.result
+        with self._lock:
+            if self._done.is_set():
+                return  # 승자가 정해진 뒤 취소된 스트림
+            self._pending.discard(model)
+            files = []
+            if text.startswith(ERROR_PREFIX):
+                result.errors[model] = text
+            else:
+                result.answers[model] = (text, seconds)
+                files = extract_filenames(text, self._known_files)
+                if files and result.winner is None:
+                    result.winner = model
+
+            if result.mode == RACE and files:
+                result.text, result.files = text, files
+            elif self._pending:
+                return
+            else:
+                self._settle()
+            result.elapsed = seconds
+            self._done.set()
+            losers = [h for name, h in self._handles.items() if name != model]
+        for handle in losers:
+            handle.cancel()
+        if result.winner is not None:
+            print(f"{result.summary_text()} · 응답: {', '.join(result.answers)}")
+        self._on_complete(result)
+
+    def _settle(self):
+        """모든 모델이 끝났을 때 결과 정리 (fanout 합치기 / race 유효 답변 없음)"""
+        result = self.result
+        if result.mode == FANOUT:
+            for model in result.models:
+                answer = result.answers.get(model)
+                for path in extract_filenames(answer and answer[0], self._known_files):
+                    if path not in result.files:
+                        result.files.append(path)
+        if result.files:
+            result.text = "\n".join(f"- {path}" for path in result.files)
+            return
+        # 유효한 답변 없음: 먼저 온 답변, 모두 오류면 첫 오류
+        answers = sorted(result.answers.items(), key=lambda item: item[1][1])
+        if answers:
+            result.text = answers[0][1][0]
+        elif result.errors:
+            result.text = next(iter(result.errors.values()))
+
+    def cancel(self):
+        with self._lock:
+            if self._done.is_set():
+                return
+            self.result.cancelled = True
+            self.result.elapsed = time.perf_counter() - self.result.started_at
+            self._done.set()
+            handles = list(self._handles.values())
+        for handle in handles:
+            handle.cancel()
+        # 완료 콜백은 무거울 수 있음 → 취소한 스레드(UI 등)를 막지 않도록
+        threading.Thread(
+            target=self._on_complete, args=(self.result,), daemon=True
+        ).start()
+
+    @property
+    def cancelled(self):
+        return self.result.cancelled
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+
+def start_model_race(entries, on_complete, known_files, mode=RACE, keep_alive=None):
+    """
+    entries = [(모델, 프롬프트, 옵션), ...] 을 동시에 스트리밍하고 바로 핸들을 반환합니다.
+    - on_complete(RaceResult)는 승자 결정/전체 완료/취소 때 한 번 호출
+    - known_files: 프로젝트 파일 상대 경로 (답변이 유효한지 판단, fanout 합치기)
+    """
+    if mode not in RACE_MODES:
+        raise ValueError(f"알 수 없는 경주 모드: {mode}")
+    print(f"🏁 모델 경주 시작 ({mode}):", ", ".join(m for m, _, _ in entries))
+    return ModelRace(mode, entries, known_files, on_complete).start(keep_alive)
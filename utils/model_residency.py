@@ -0,0 +1,160 @@
+import threading
+
+from utils.ollama_http import get_client
+
+# 📌 모델 상주 관리 (어떤 모델이 Ollama 메모리에 올라와 있는지)
+#   - 적용 = 프롬프트 없는 /api/generate 로 모델만 올림 (생성 없음, keep_alive 지정)
+#   - /api/ps 로 실제로 올라와 있는 모델과 메모리(전체/VRAM)를 확인
+#   - 다른 모델로 바꿀 때 이전 모델을 명시적으로 내림 (메모리 부족으로 서로 밀어내지 않게)
+#   - 상태: loading(올리는 중) → loaded(올라옴) → unloaded(직접 내림) / evicted(keep_alive 만료·밀려남)
+
+DEFAULT_KEEP_ALIVE = "30m"
+PRELOAD_TIMEOUT = 300  # 큰 모델을 CPU로 처음 올릴 때 고려
+POLL_INTERVAL = 5  # UI가 /api/ps 를 다시 확인하는 간격 (초)
+
+LOADING = "loading"
+LOADED = "loaded"
+UNLOADED = "unloaded"
+EVICTED = "evicted"
+FAILED = "failed"
+
+_STATE_TEXT = {
+    LOADING: "⏳ 올리는 중",
+    LOADED: "🟢 로드됨",
+    UNLOADED: "⚪ 내려짐",
+    EVICTED: "🟠 메모리에서 내려감",
+    FAILED: "🔴 로드 실패",
+}
+
+
+def _format_size(size):
+    return (
+        f"{size / 1024 ** 3:.1f} GB"
+        if size >= 1024**3
+        else f"{size / 1024 ** 2:.0f} MB"
+    )
+
+
+class ModelResidency:
+    """
+    states[모델] = 위 상태 중 하나 (한 번도 다루지 않은 모델은 없음)
+    running[모델] = 마지막 /api/ps 항목
+    """
+
+    def __init__(self, base_url=None):
+        self.base_url = base_url
+        self.states = {}
+        self.running = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        """상태가 바뀔 때마다 callback() 호출 (호출 스레드는 임의 → UI는 after로 넘길 것)"""
+        self._listeners.append(callback)
+
+    def _notify(self):
+        for callback in list(self._listeners):
+            try:
+                callback()
+            except Exception as e:
+                print(f"[상주 관리 경고] 상태 알림 실패: {e}")
+
+    def _set_state(self, model, state):
+        with self._lock:
+            changed = self.states.get(model) != state
+            self.states[model] = state
+        if changed:
+            self._notify()
+
+    def refresh(self):
+        """/api/ps 로 상태 갱신. 실패하면(Ollama 꺼짐 등) False"""
+        try:
+            running = get_client(self.base_url).running_models()
+        except Exception:
+            return False
+        running = {m["name"]: m for m in running}
+        with self._lock:
+            before = dict(self.states)
+            self.running = running
+            for name in running:
+                if self.states.get(name) != LOADING:
+                    self.states[name] = LOADED
+            for name, state in before.items():
+                if state == LOADED and name not in running:
+                    self.states[name] = EVICTED
+            changed = before != self.states
+        if changed:
+            self._notify()
+        return True
+
+    def preload(self, model, keep_alive=DEFAULT_KEEP_ALIVE, timeout=PRELOAD_TIMEOUT):
+        """
+        모델만 올리고 /api/ps 로 실제로 올라왔는지 확인합니다.
+        Returns:
+            bool: 올라와 있으면 True
+        """
+        self._set_state(model, LOADING)
+        try:
+            get_client(self.base_url).load_model(model, keep_alive, timeout)
+        except Exception as e:
+            print(f"[Ollama 오류] 모델 로드 실패: {model}: {e}")
+            self._set_state(model, FAILED)
+            return False
+        # ps 확인이 안 되면(구버전 Ollama 등) 로드 응답을 믿음
+        loaded = self.is_loaded(model) if self.refresh() else True
+        self._set_state(model, LOADED if loaded else FAILED)
+        return loaded
+
+    def unload(self, model):
+        try:
+            get_client(self.base_url).unload_model(model)
+        except Exception as e:
+            print(f"[Ollama 오류] 모델 내리기 실패: {model}: {e}")
+            return False
+        with self._lock:
+            self.running.pop(model, None)
+        self._set_state(model, UNLOADED)
+        return True
+
+    def switch(self, model, keep_alive=DEFAULT_KEEP_ALIVE, timeout=PRELOAD_TIMEOUT):
+        """model 외에 올라와 있는 모델을 내리고 model을 올림"""
+        self.refresh()
+        for name in list(self.running):
+            if name != model:
+                self.unload(name)
+        return self.preload(model, keep_alive, timeout)
+
+    def is_loaded(self, model):
+        return model in self.running
+
+    def state_of(self, model):
+        return self.states.get(model)
+
+    def status_text(self, model):
+        """드롭다운 옆 표시용 (예: '🟢 로드됨 · 4.1 GB (GPU 100%)')"""
+        state = self.states.get(model)
+        if state is None:
+            return ""
+        text = _STATE_TEXT[state]
+        info = self.running.get(model)
+        if state == LOADED and info and info.get("size"):
+            size = info["size"]
+            gpu = info.get("size_vram", 0) / size
+            text += f" · {_format_size(size)} (GPU {gpu:.0%})"
+        others = [name for name in self.running if name != model]
+        if others:
+            text += f" | 그 외 로드됨: {', '.join(others)}"
+        return text
+
+
+_residencies = {}
+_residencies_lock = threading.Lock()
+
+
+def get_residency(base_url=None):
+    """서버별 공유 상주 관리자 (None이면 기본 서버)"""
+    with _residencies_lock:
+        residency = _residencies.get(base_url)
+        if residency is None:
+            residency = _residencies[base_url] = ModelResidency(base_url)
+        return residency
@@ -0,0 +1,282 @@
+import json
+import queue
+import asyncio
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import CancelledError
+
+from utils.ollama_http import get_base_url
+
+# 📌 asyncio 기반 Ollama 스트리밍 클라이언트 (즉시 중지 지원)
+#   - 스트림은 전용 이벤트 루프 스레드 하나에서 실행 (UI/작업 스레드는 핸들만 받음)
+#   - cancel() → 진행 중인 읽기를 바로 끊고 연결을 닫음
+#     → Ollama가 클라이언트 연결 종료를 감지해 생성을 중단하고 모델을 다음 요청에 넘김
+#   - 프롬프트 평가 중(아직 토큰이 하나도 안 온 상태)이어도 즉시 중지됨
+#   - 스트림마다 연결 하나 (짧은 호출은 ollama_http 의 공유 세션 사용)
+#   - on_token/on_complete/on_error는 스트림마다 하나인 전달 스레드에서 차례대로 호출
+#     (루프 스레드는 콜백을 기다리지 않음 → 느린 소비자 하나가 다른 스트림/취소를 막지 않음)
+#   - 전달 못 한 토큰이 MAX_PENDING_TOKENS를 넘으면 그 스트림만 읽기를 await로 멈춤
+#     (RESUME_PENDING_TOKENS까지 줄면 다시 읽음 → 소비자가 밀려도 메모리가 불어나지 않음)
+
+CONNECT_TIMEOUT = 30
+READ_TIMEOUT = 300  # 토큰 사이 최대 대기 (CPU 환경의 긴 프롬프트 평가 고려)
+MAX_PENDING_TOKENS = 2048
+RESUME_PENDING_TOKENS = 512
+
+
+class OllamaStreamError(Exception):
+    pass
+
+
+class _LoopThread:
+    def __init__(self):
+        self.loop = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self.loop.run_forever, name="ollama-async", daemon=True
+                ).start()
+        return self.loop
+
+
+_loop_thread = _LoopThread()
+
+
+class StreamHandle:
+    """다른 스레드에서 스트림을 중지/대기하기 위한 핸들"""
+
+    def __init__(self, future):
+        self._future = future
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        self._future.cancel()
+
+    def done(self):
+        return self._future.done()
+
+    def wait(self, timeout=None):
+        """끝날 때까지 대기. 끝났으면 True"""
+        try:
+            self._future.result(timeout)
+        except CancelledError:
+            pass
+        except TimeoutError:
+            return False
+        except Exception:
+            pass
+        return True
+
+
+async def _read_headers(reader):
+    status_line = await reader.readline()
+    parts = status_line.decode("latin-1").split(" ", 2)
+    if len(parts) < 2 or not parts[1].isdigit():
+        raise OllamaStreamError(f"잘못된 HTTP 응답: {status_line!r}")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    return int(parts[1]), headers
+
+
+async def _iter_body(reader, headers):
+    """응답 본문을 도착하는 대로 조각(bytes) 단위로"""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size_line = await reader.readline()
+            if not size_line:
+                return
+            size = int(size_line.split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                return
+            chunk = await reader.readexactly(size + 2)
+            yield chunk[:-2]
+    elif "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining > 0:
+            chunk = await reader.read(min(remaining, 65536))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
+    else:
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                return
+            yield chunk
+
+
+class _Delivery:
+    """루프 스레드 → 전달 스레드 (토큰, 마지막에 완료/오류 콜백 한 번)"""
+
+    _FINISH = object()
+
+    def __init__(self, on_token, loop):
+        self._on_token = on_token
+        self._loop = loop
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._resume = None  # 읽기를 멈춘 동안만 asyncio.Event
+        self._started = False
+
+    def _put(self, item):
+        # 스레드는 처음 넣을 때 시작 (시작 전에 취소된 스트림은 스레드를 남기지 않음)
+        if not self._started:
+            self._started = True
+            threading.Thread(
+                target=self._run, name="ollama-delivery", daemon=True
+            ).start()
+        self._queue.put(item)
+
+    def push(self, token):
+        """루프 스레드에서 호출 (막지 않음)"""
+        with self._lock:
+            self._pending += 1
+        self._put(token)
+
+    async def throttle(self):
+        """루프 스레드에서 호출: 밀린 토큰이 많으면 전달 스레드가 따라올 때까지 await"""
+        with self._lock:
+            if self._pending <= MAX_PENDING_TOKENS:
+                return
+            self._resume = asyncio.Event()
+        await self._resume.wait()
+
+    def finish(self, callback, *args):
+        """남은 토큰을 모두 전달한 뒤 callback(*args) (None이면 스레드만 종료)"""
+        self._put((self._FINISH, callback, args))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if isinstance(item, tuple) and item[0] is self._FINISH:
+                _, callback, args = item
+                if callback is not None:
+                    try:
+                        callback(*args)
+                    except Exception as e:
+                        print(f"[스트림 경고] 완료 처리 실패: {e}")
+                return
+            try:
+                self._on_token(item)
+            except Exception as e:
+                print(f"[스트림 경고] 토큰 처리 실패: {e}")
+            with self._lock:
+                self._pending -= 1
+                resume = None
+                if self._resume is not None and self._pending <= RESUME_PENDING_TOKENS:
+                    resume, self._resume = self._resume, None
+            if resume is not None:
+                self._loop.call_soon_threadsafe(resume.set)
+
+
+async def _stream(url, payload, on_token, stats, throttle=None):
+    parsed = urlparse(url)
+    host = parsed.hostname
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(host, port, ssl=parsed.scheme == "https"),
+        CONNECT_TIMEOUT,
+    )
+    try:
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(
+            (
+                f"POST {parsed.path or '/'} HTTP/1.1\r\n"
+                f"Host: {host}:{port}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+            + body
+        )
+        await writer.drain()
+
+        status, headers = await asyncio.wait_for(_read_headers(reader), READ_TIMEOUT)
+        if status != 200:
+            error = b"".join([c async for c in _iter_body(reader, headers)])
+            raise OllamaStreamError(
+                f"HTTP {status}: {error.decode('utf-8', 'replace')[:200]}"
+            )
+
+        parts = []
+        pending = b""
+        chunks = _iter_body(reader, headers).__aiter__()
+        while True:
+            try:
+                chunk = await asyncio.wait_for(chunks.__anext__(), READ_TIMEOUT)
+            except StopAsyncIteration:
+                break
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                if data.get("error"):
+                    raise OllamaStreamError(data["error"])
+                token = data.get("response", "")
+                if token:
+                    parts.append(token)
+                    on_token(token)
+                if data.get("done"):
+                    # 프롬프트 평가 토큰 수 등 (접두부 캐시 재사용 여부 확인용)
+                    stats.update(
+                        (k, v)
+                        for k, v in data.items()
+                        if k.endswith(("_count", "_duration"))
+                    )
+                    return "".join(parts)
+            if throttle is not None:
+                await throttle()
+        return "".join(parts)
+    finally:
+        # 취소되면 바로 끊음 (정상 종료도 같은 처리: Connection: close)
+        writer.transport.abort()
+
+
+def start_generate_stream(
+    payload, on_token, on_complete=None, on_error=None, base_url=None
+):
+    """
+    /api/generate 스트리밍을 이벤트 루프 스레드에서 시작하고 바로 핸들을 반환합니다.
+    - on_complete(full_text, cancelled, stats): 정상 종료 또는 cancel() 후
+      (중지 전까지 받은 텍스트, 마지막 줄의 prompt_eval_count 등 통계)
+    - on_error(exception): 연결/HTTP/서버 오류
+    """
+    url = f"{base_url or get_base_url()}/api/generate"
+    received = []
+    stats = {}
+    loop = _loop_thread.get()
+    delivery = _Delivery(on_token, loop)
+
+    def push(token):
+        received.append(token)
+        delivery.push(token)
+
+    async def run():
+        try:
+            text = await _stream(
+                url, dict(payload, stream=True), push, stats, delivery.throttle
+            )
+        except asyncio.CancelledError:
+            delivery.finish(on_complete, "".join(received), True, stats)
+            raise
+        except Exception as e:
+            delivery.finish(on_error, e)
+            return None
+        delivery.finish(on_complete, text, False, stats)
+        return text
+
+    return StreamHandle(asyncio.run_coroutine_threadsafe(run(), loop))
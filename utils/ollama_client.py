@@ -1,65 +1,130 @@
-import json
-import ollama
-import requests
+import threading
+
+from utils.ollama_http import get_client
+
+STOP_POLL_INTERVAL = 0.1
 
 
 def ask_ollama(prompt: str, model="mistral") -> str:
     """
     Ollama 모델에게 프롬프트를 보내고 응답을 받아 반환
     """
-    response = ollama.chat(model=model, messages=[{"role": "user", "content": prompt}])
-    return response["message"]["content"]
+    return get_client().chat(model, [{"role": "user", "content": prompt}])
 
 
-def ask_ollama_stream(
+# 파일 선택 단계 규칙 문구 (프롬프트 앞에 붙음, 토큰 예산 계산에도 사용)
+FILE_SELECTION_RULES = (
+    #     """
+    # [답변 시 지켜야 할 규칙]
+    # 프로젝트 파일 중 '내 요청'과 관계된 것만 반드시 파일이름만 목록을 만들어서 대답해줘.
+    # 제발 파일 이름만 불러주고 끝내. 답변이 총 200자를 넘지마.
+    # 내 요청에 직접 대답하는 것이 아니야. 내 요청을 수행하기 위해 관련되어 보이는 파일만 고르면 돼.
+    # 파일이름은 반드시 '프로젝트 구조'로 준 목록에 있는 것들만 제시해.
+    # 파일이름 목록 외에 자세한 설명은 전혀 할 필요 없어.
+    # 이 밑에 나오는 정보는 참고용이야.
+    # """
+    f"""
+    [Rules to Follow When Responding]
+    Only list the filenames that are *directly related* to my request from the project files.  
+    Please, just list the filenames—nothing more. Do **not** exceed 200 characters in total.  
+    Do **not** answer my request directly. Just select the files that *seem relevant* to perform the request.  
+    Only choose filenames from the ones provided in the "Project Structure" list.  
+    Do **not** include any explanations beyond the filename list.
+    The information below is condition of my project.\n
+    """
+)
+
+
+def start_ollama_stream(
     model,
     prompt,
     on_token_callback,
     on_complete_callback,
-    should_stop_callback,
+    options=None,
+    keep_alive=None,
 ):
-    url = "http://localhost:11434/api/generate"
+    """
+    규칙 문구 + prompt 로 스트리밍을 시작하고 바로 StreamHandle을 반환합니다.
+    - handle.cancel() 하면 프롬프트 평가 중이어도 즉시 연결을 끊어 Ollama 생성도 멈춤
+    - on_complete_callback(결과)는 완료/중지/오류 때 한 번 호출 (오류면 "[오류 발생] ...")
+    - keep_alive(예: "30m")를 주면 응답 후에도 모델(과 프롬프트 캐시)을 그만큼 유지
+    """
     payload = {
         "model": model,
-        "prompt":
-        #     """
-        # [답변 시 지켜야 할 규칙]
-        # 프로젝트 파일 중 '내 요청'과 관계된 것만 반드시 파일이름만 목록을 만들어서 대답해줘.
-        # 제발 파일 이름만 불러주고 끝내. 답변이 총 200자를 넘지마.
-        # 내 요청에 직접 대답하는 것이 아니야. 내 요청을 수행하기 위해 관련되어 보이는 파일만 고르면 돼.
-        # 파일이름은 반드시 '프로젝트 구조'로 준 목록에 있는 것들만 제시해.
-        # 파일이름 목록 외에 자세한 설명은 전혀 할 필요 없어.
-        # 이 밑에 나오는 정보는 참고용이야.
-        # """
-        f"""
-        [Rules to Follow When Responding]
-        Only list the filenames that are *directly related* to my request from the project files.  
-        Please, just list the filenames—nothing more. Do **not** exceed 200 characters in total.  
-        Do **not** answer my request directly. Just select the files that *seem relevant* to perform the request.  
-        Only choose filenames from the ones provided in the "Project Structure" list.  
-        Do **not** include any explanations beyond the filename list.
-        The information below is condition of my project.\n
-        """
-        + prompt,
+        "prompt": FILE_SELECTION_RULES + prompt,
         "stream": True,
     }
-    full_response = ""
-
-    try:
-        print("🔁 요청 시작:", prompt[:50])
-        with requests.post(url, json=payload, stream=True, timeout=30) as response:
-            for line in response.iter_lines():
-                if should_stop_callback and should_stop_callback():
-                    print("🛑 사용자 요청으로 중단되었습니다.")
-                    break
-                if line:
-                    data = json.loads(line.decode("utf-8"))
-                    token = data.get("response", "")
-                    full_response += token
-                    on_token_callback(token)
-        print("✅ 스트림 응답 완료")
-
-        # ✅ 모든 응답 완료 후 호출
+    if options:
+        payload["options"] = options  # 예: {"num_ctx": 4096}
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+
+    def on_complete(full_response, cancelled, stats):
+        if cancelled:
+            print("🛑 사용자 요청으로 중단되었습니다.")
+        else:
+            print("✅ 스트림 응답 완료", _eval_text(stats))
         on_complete_callback(full_response.strip())
-    except Exception as e:
+
+    def on_error(e):
         on_complete_callback(f"[오류 발생] {e}")
+
+    from utils.ollama_async import start_generate_stream  # asyncio: 첫 스트림 때 불러옴
+
+    print("🔁 요청 시작:", prompt[:50])
+    return start_generate_stream(payload, on_token_callback, on_complete, on_error)
+
+
+def _eval_text(stats):
+    """Ollama 응답 통계 → '(프롬프트 평가 120토큰 0.84s)' (없으면 "")"""
+    if "prompt_eval_count" not in stats:
+        return ""
+    seconds = stats.get("prompt_eval_duration", 0) / 1e9
+    return f"(프롬프트 평가 {stats['prompt_eval_count']}토큰 {seconds:.2f}s)"
+
+
+def prewarm_prompt(model, prompt, options=None, keep_alive=None, timeout=None):
+    """
+    규칙 문구 + prompt 를 미리 평가시켜 모델을 올리고 Ollama 프롬프트 캐시를 채웁니다.
+    (토큰 하나만 생성) 이후 같은 접두부로 시작하는 요청은 뒤쪽만 새로 평가됩니다.
+    Returns:
+        dict: prompt_eval_count 등 응답 통계
+    """
+    payload = {
+        "model": model,
+        "prompt": FILE_SELECTION_RULES + prompt,
+        "stream": False,
+        "options": dict(options or {}, num_predict=1),
+    }
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    data = get_client().generate(payload, timeout=timeout).json()
+    stats = {k: v for k, v in data.items() if k.endswith(("_count", "_duration"))}
+    print("🔥 프롬프트 접두부 예열 완료", _eval_text(stats))
+    return stats
+
+
+def ask_ollama_stream(
+    model,
+    prompt,
+    on_token_callback,
+    on_complete_callback,
+    should_stop_callback,
+    options=None,
+):
+    """
+    start_ollama_stream 의 블로킹 버전: on_complete_callback까지 끝난 뒤 반환.
+    should_stop_callback은 토큰 도착과 무관하게 STOP_POLL_INTERVAL마다 확인합니다.
+    """
+    finished = threading.Event()
+
+    def on_complete(result):
+        try:
+            on_complete_callback(result)
+        finally:
+            finished.set()
+
+    handle = start_ollama_stream(model, prompt, on_token_callback, on_complete, options)
+    while not finished.wait(STOP_POLL_INTERVAL):
+        if should_stop_callback and should_stop_callback() and not handle.cancelled:
+            handle.cancel()
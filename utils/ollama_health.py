@@ -0,0 +1,122 @@
+import time
+import threading
+
+from utils.ollama_http import STATUS_TIMEOUT, get_client
+
+# 📌 Ollama 상태 감시 (백그라운드 스레드 하나)
+#   - /api/version 으로 실행 여부/응답 시간/버전 확인 → 마지막 결과(스냅샷)를 보관
+#   - UI/다른 코드는 스냅샷만 읽음 (네트워크 대기 없음)
+#   - 켜져 있으면 UP_INTERVAL 마다, 꺼져 있으면 1초부터 두 배씩 늘려 최대 DOWN_MAX_INTERVAL 마다 확인
+#   - 실행 여부/버전이 바뀔 때만 리스너 호출 (check_now() 로 바로 다시 확인 가능)
+
+UP_INTERVAL = 10
+DOWN_MIN_INTERVAL = 1
+DOWN_MAX_INTERVAL = 30
+
+
+class HealthSnapshot:
+    def __init__(self, up=False, latency_ms=None, version="", error="", checked_at=0.0):
+        self.up = up
+        self.latency_ms = latency_ms
+        self.version = version
+        self.error = error
+        self.checked_at = checked_at  # 0이면 아직 확인 전
+
+    @property
+    def checked(self):
+        return self.checked_at > 0
+
+    def status_text(self):
+        if not self.checked:
+            return "🔄 Ollama 상태 확인 중..."
+        if not self.up:
+            return "🔴 Ollama 꺼짐"
+        version = f" v{self.version}" if self.version else ""
+        return f"🟢 Ollama 실행 중{version} ({self.latency_ms:.0f}ms)"
+
+
+class OllamaHealthMonitor:
+    def __init__(self, base_url=None):
+        self.base_url = base_url
+        self.snapshot = HealthSnapshot()
+        self._listeners = []
+        self._wake = threading.Event()
+        self._first_check = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        """callback(snapshot): 실행 여부/버전이 바뀔 때 (감시 스레드에서 호출 → UI는 after로 넘길 것)"""
+        self._listeners.append(callback)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="ollama-health", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def check_now(self):
+        """다음 확인을 기다리지 않고 바로 확인 (Ollama를 켜고/끈 직후 등)"""
+        self._wake.set()
+
+    def wait_first_check(self, timeout=None):
+        """첫 확인이 끝날 때까지 대기 → 스냅샷"""
+        self._first_check.wait(timeout)
+        return self.snapshot
+
+    def _check(self):
+        start = time.perf_counter()
+        try:
+            version = get_client(self.base_url).version(timeout=STATUS_TIMEOUT)
+        except Exception as e:
+            return HealthSnapshot(False, error=str(e), checked_at=time.time())
+        latency = (time.perf_counter() - start) * 1000
+        return HealthSnapshot(True, latency, version, checked_at=time.time())
+
+    def _run(self):
+        backoff = DOWN_MIN_INTERVAL
+        while True:
+            previous = self.snapshot
+            current = self._check()
+            self.snapshot = current
+            self._first_check.set()
+            if (
+                not previous.checked
+                or previous.up != current.up
+                or previous.version != current.version
+            ):
+                self._notify(current)
+
+            if current.up:
+                backoff = DOWN_MIN_INTERVAL
+                interval = UP_INTERVAL
+            else:
+                interval = backoff
+                backoff = min(backoff * 2, DOWN_MAX_INTERVAL)
+            self._wake.wait(interval)
+            if self._wake.is_set():
+                self._wake.clear()
+                backoff = DOWN_MIN_INTERVAL
+
+    def _notify(self, snapshot):
+        for callback in list(self._listeners):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"[상태 감시 경고] 상태 알림 실패: {e}")
+
+
+_monitors = {}
+_monitors_lock = threading.Lock()
+
+
+def get_health_monitor(base_url=None):
+    """서버별 공유 상태 감시 (처음 호출할 때 감시 시작)"""
+    with _monitors_lock:
+        monitor = _monitors.get(base_url)
+        if monitor is None:
+            monitor = _monitors[base_url] = OllamaHealthMonitor(base_url).start()
+        return monitor
@@ -0,0 +1,165 @@
+import threading
+from urllib.parse import urlparse
+
+# 📌 Ollama HTTP 클라이언트 (모든 Ollama API 호출이 공유)
+#   - keep-alive 세션 하나를 재사용 → 호출마다 TCP 연결을 새로 맺지 않음
+#   - 연결 풀 크기 = 동시에 유지할 연결 수 (스트리밍 + 상태 확인 + 임베딩 동시 사용 대비)
+#   - 로컬 서버면 프록시 환경변수 조회를 건너뜀 (요청마다 하는 조회 비용 + 잘못된 프록시 경유 방지)
+#   - requests는 첫 클라이언트를 만들 때 불러옴 (앱 시작 시 import 비용 제외)
+
+DEFAULT_BASE_URL = "http://localhost:11434"
+DEFAULT_POOL_SIZE = 4
+DEFAULT_TIMEOUT = 30
+STATUS_TIMEOUT = 3  # 실행 여부/모델 목록 같은 가벼운 확인용
+
+_LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+
+class OllamaHTTPClient:
+    def __init__(
+        self,
+        base_url=DEFAULT_BASE_URL,
+        pool_size=DEFAULT_POOL_SIZE,
+        timeout=DEFAULT_TIMEOUT,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.timeout = timeout
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.trust_env = urlparse(self.base_url).hostname not in _LOCAL_HOSTS
+
+    def url(self, path):
+        return f"{self.base_url}{path}"
+
+    def get(self, path, timeout=None, **kwargs):
+        return self.session.get(
+            self.url(path), timeout=timeout or self.timeout, **kwargs
+        )
+
+    def post(self, path, json=None, timeout=None, **kwargs):
+        return self.session.post(
+            self.url(path), json=json, timeout=timeout or self.timeout, **kwargs
+        )
+
+    # ── API ──────────────────────────────────────────────────
+    def is_running(self, timeout=STATUS_TIMEOUT):
+        from requests.exceptions import RequestException
+
+        try:
+            return self.get("/", timeout=timeout).status_code == 200
+        except RequestException:
+            return False
+
+    def version(self, timeout=STATUS_TIMEOUT):
+        """/api/version 의 서버 버전 문자열 (실패 시 예외)"""
+        response = self.get("/api/version", timeout=timeout)
+        response.raise_for_status()
+        return response.json().get("version", "")
+
+    def list_models(self, timeout=STATUS_TIMEOUT):
+        """/api/tags 의 모델 정보 목록 (실패 시 예외)"""
+        response = self.get("/api/tags", timeout=timeout)
+        response.raise_for_status()
+        return response.json().get("models", [])
+
+    def generate(self, payload, timeout=None, stream=False):
+        """/api/generate 응답 객체 (stream=True면 with 문으로 iter_lines 사용)"""
+        from requests.exceptions import HTTPError
+
+        response = self.post(
+            "/api/generate", json=payload, timeout=timeout, stream=stream
+        )
+        try:
+            response.raise_for_status()
+        except HTTPError:
+            response.close()  # 스트리밍 응답은 닫아야 연결이 풀로 돌아감
+            raise
+        return response
+
+    def running_models(self, timeout=STATUS_TIMEOUT):
+        """/api/ps: 메모리에 올라와 있는 모델 목록 (name, size, size_vram, expires_at 등)"""
+        response = self.get("/api/ps", timeout=timeout)
+        response.raise_for_status()
+        return response.json().get("models", [])
+
+    def load_model(self, model, keep_alive=None, timeout=None):
+        """프롬프트 없이 모델만 올림 (생성 없음). keep_alive 동안 유지"""
+        payload = {"model": model, "stream": False}
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        return self.generate(payload, timeout=timeout).json()
+
+    def unload_model(self, model, timeout=None):
+        """모델을 바로 내림 (keep_alive=0)"""
+        return self.generate(
+            {"model": model, "keep_alive": 0, "stream": False}, timeout=timeout
+        ).json()
+
+    def chat(self, model, messages, timeout=None):
+        response = self.post(
+            "/api/chat",
+            json={"model": model, "messages": messages, "stream": False},
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        return response.json()["message"]["content"]
+
+    def embeddings(self, model, prompt, timeout=None):
+        response = self.post(
+            "/api/embeddings",
+            json={"model": model, "prompt": prompt},
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        return response.json().get("embedding")
+
+    def close(self):
+        self.session.close()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+_default_base_url = DEFAULT_BASE_URL
+
+
+def get_base_url():
+    return _default_base_url
+
+
+def get_client(base_url=None):
+    """base_url별 공유 클라이언트 (None이면 기본 서버)"""
+    key = (base_url or _default_base_url).rstrip("/")
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = OllamaHTTPClient(key)
+    return client
+
+
+def configure_client(base_url=None, pool_size=None, timeout=None):
+    """
+    기본 클라이언트 설정 변경 (서버 주소, 풀 크기, 기본 타임아웃).
+    기존 클라이언트는 닫고 다음 호출부터 새 설정을 사용합니다.
+    """
+    global _default_base_url
+    with _clients_lock:
+        if base_url:
+            _default_base_url = base_url.rstrip("/")
+        old = _clients.pop(_default_base_url, None)
+        _clients[_default_base_url] = OllamaHTTPClient(
+            _default_base_url,
+            pool_size=pool_size or (old.pool_size if old else DEFAULT_POOL_SIZE),
+            timeout=timeout or (old.timeout if old else DEFAULT_TIMEOUT),
+        )
+    if old is not None:
+        old.close()
+    return _clients[_default_base_url]
@@ -1,45 +1,44 @@
 import json
 import subprocess
 import shutil
-import psutil
-import requests
 
+from utils.ollama_http import get_client
+from utils.model_residency import DEFAULT_KEEP_ALIVE, get_residency
 
-def list_ollama_models(base_url="http://localhost:11434"):
-    """
-    현재 Ollama 서버에서 사용 가능한 모델 목록을 반환합니다.
 
-    Returns:
-        list[str]: 설치된 모델 이름 리스트
+def list_ollama_model_info(base_url=None):
+    """
+    /api/tags 의 모델 정보 목록 (name, digest, size 등). 실패하면 빈 리스트
     """
     try:
-        response = requests.get(f"{base_url}/api/tags")
-        response.raise_for_status()
-        data = response.json()
-
-        # 모델 이름만 추출
-        return [model["name"] for model in data.get("models", [])]
+        return get_client(base_url).list_models()
     except Exception as e:
         print(f"[Ollama 오류] 모델 목록 가져오기 실패: {e}")
         return []
 
 
+def list_ollama_models(base_url=None):
+    """
+    현재 Ollama 서버에서 사용 가능한 모델 목록을 반환합니다.
+
+    Returns:
+        list[str]: 설치된 모델 이름 리스트
+    """
+    # 모델 이름만 추출
+    return [model["name"] for model in list_ollama_model_info(base_url)]
+
+
 def is_ollama_installed():
     return shutil.which("ollama") is not None
 
 
 def is_ollama_running():
-    try:
-        response = requests.get("http://localhost:11434", timeout=3)
-        return response.status_code == 200
-    except requests.exceptions.RequestException:
-        return False
+    return get_client().is_running()
 
 
 def is_model_ready(model="mistral"):
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=3)
-        tags = response.json().get("models", [])
+        tags = get_client().list_models()
         return any(m["name"] == model for m in tags)
     except:
         return False
@@ -56,6 +55,8 @@ def pull_model_if_needed(model="mistral"):
 
 # 현재 실행 중인 ollama 프로세스 종료
 def stop_ollama_process():
+    import psutil  # 종료할 때만 필요 (시작 시 import 비용 제외)
+
     try:
         for proc in psutil.process_iter(["pid", "name", "cmdline"]):
             name = proc.info.get("name")
@@ -86,25 +87,21 @@ def start_ollama_model_background(model_name: str):
         raise e
 
 
-def apply_ollama_model(model_name: str, base_url="http://localhost:11434") -> bool:
+def apply_ollama_model(
+    model_name: str, base_url=None, switch=False, keep_alive=DEFAULT_KEEP_ALIVE
+) -> bool:
     """
     주어진 모델을 Ollama 서버에서 적용(로드)합니다.
+    생성 없이 모델만 올리고 /api/ps 로 실제로 올라왔는지 확인합니다.
+    switch=True면 올라와 있는 다른 모델을 먼저 내립니다.
 
     Returns:
-        bool: 성공 여부
+        bool: 모델이 메모리에 올라와 있으면 True
     """
-
-    try:
-        response = requests.post(
-            f"{base_url}/api/generate",
-            json={"model": model_name, "prompt": "Hello", "stream": False},
-            timeout=5,
-        )
-        response.raise_for_status()
-        return True
-    except Exception as e:
-        print(f"[Ollama 오류] 모델 적용 실패: {e}")
-        return False
+    residency = get_residency(base_url)
+    if switch:
+        return residency.switch(model_name, keep_alive)
+    return residency.preload(model_name, keep_alive)
 
 
 def get_installed_models():
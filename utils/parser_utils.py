@@ -1,7 +1,10 @@
 import os, ast, json
-import sys
-import subprocess
-import platform
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.file_cache import hash_bytes
+from utils.project_scanner import scan_project
+from utils.path_trie import PathTrie
+from utils.js_extractor import ExtractionError, extract_js_functions_batch
 
 
 def summarize_functions(file_path):
@@ -21,128 +24,169 @@ def summarize_functions(file_path):
     return "\n".join(lines) or "요약할 함수가 없습니다."
 
 
-def get_project_tree(base_path):
+TREE_EXTENSIONS = {".py", ".js", ".ts", ".jsx", ".tsx"}
+
+
+def build_project_trie(base_path, manifest=None):
+    """
+    프로젝트 폴더 구조를 경로 트라이(PathTrie)로 만듭니다.
+    - 특정 폴더 및 확장자 제외
+    - manifest가 주어지면 디스크 대신 manifest에서 구조를 읽음
+    """
+    if manifest is None:
+        manifest = scan_project(base_path)
+    return PathTrie.from_manifest(manifest, base_path, TREE_EXTENSIONS)
+
+
+def get_project_tree(base_path, manifest=None):
     """
     전체 프로젝트 폴더 구조를 반환합니다.
     - 특정 폴더 및 확장자 제외
+    - manifest가 주어지면 디스크 대신 manifest에서 구조를 읽음
     """
-    tree_lines = []
-    ALLOWED_EXTENSIONS = {".py", ".js", ".ts", ".jsx", ".tsx"}
-    EXCLUDED_DIRS = {
-        "node_modules",
-        ".git",
-        "dist",
-        "build",
-        ".venv",
-        "venv",
-        "__pycache__",
-        ".gptcache",
-        ".idea",
-        ".next",
-        ".out",
-        ".cache",
-    }
-
-    for root, dirs, files in os.walk(base_path):
-        # ✅ 디렉토리 제외
-        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
-
-        indent = "    " * (root[len(base_path) :].count(os.sep))
-        tree_lines.append(f"{indent}📁 {os.path.basename(root)}/")
-
-        for file in sorted(files):
-            ext = os.path.splitext(file)[1]
-            if ext in ALLOWED_EXTENSIONS:
-                tree_lines.append(f"{indent}    📄 {file}")
-
-    return "\n".join(tree_lines)
+    return build_project_trie(base_path, manifest).render()
 
 
 def extract_js_functions_esprima(filepath):
-    try:
-        # 👉 PyInstaller 빌드 경로 고려
-        base_dir = getattr(sys, "_MEIPASS", os.path.abspath("."))  # 배포 환경 대응
-        node_path = os.path.join(base_dir, "node.exe")  # ✅ 내장된 node 실행파일
-        js_script = os.path.join(base_dir, "extract_js_functions.js")
-
-        # ✅ 콘솔창 없이 실행 옵션 추가 (Windows 한정)
-        startup_flags = 0
-        if platform.system() == "Windows":
-            startup_flags = subprocess.CREATE_NO_WINDOW
-
-        print(f"🧪 JS 분석 대상 파일: {filepath}")
-        output = subprocess.check_output(
-            # ["node", "extract_js_functions.js", filepath],
-            [node_path, js_script, filepath],
-            stderr=subprocess.STDOUT,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            creationflags=startup_flags,  # 🔥 핵심: 콘솔창 숨김
-        )
-        print("✅ Node 결과:\n", output)
-        return output.strip().splitlines()
-    except subprocess.CalledProcessError as e:
-        print("❌ Node 실행 오류:\n", e.output)
-        return [f"[⚠️ JS 파싱 오류: {e.output.strip()}]"]
-    except FileNotFoundError:
-        print("❌ Node.js 실행파일(node)을 찾을 수 없습니다.")
-        return ["[⚠️ Node.js not found]"]
-
-
-def extract_functions(root_dir):
+    """
+    JS/TS 파일 하나의 함수 목록을 상주 Node 추출 프로세스에서 가져옵니다.
+    (파일마다 node를 새로 띄우지 않음, Node가 없으면 Python 토크나이저)
+    """
+    return extract_js_functions_batch([filepath])[filepath]
+
+
+FUNCTION_EXTENSIONS = {".py", ".js", ".jsx", ".ts", ".tsx"}
+
+
+def summarize_file_functions(path, rel_path, js_funcs=None):
+    """
+    파일 하나의 함수 요약 블록을 functions.txt 형식으로 반환합니다.
+    - js_funcs: 배치로 미리 추출한 JS 함수 목록 (없으면 개별 추출)
+    Returns:
+        (블록, 실패 여부, 내용 해시) — 실패한 블록은 오류 문구가 들어 있으므로 캐시하지 않음
+        (해시는 직접 읽은 Python 파일만, 나머지는 None)
+    """
     result = ""
-    allowed_extensions = {".py", ".js", ".jsx", ".ts", ".tsx"}
-    ignored_dirs = {
-        ".git",
-        ".idea",
-        "__pycache__",
-        ".venv",
-        "venv",
-        "node_modules",
-        "dist",
-        "build",
-        ".next",
-    }
-
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        # ✅ 여기에 node_modules 포함
-        dirnames[:] = [d for d in dirnames if d not in ignored_dirs]
-
-        for fname in filenames:
-            ext = os.path.splitext(fname)[1].lower()
-            if ext not in allowed_extensions:
-                continue
-
-            path = os.path.join(dirpath, fname)
-            rel_path = os.path.relpath(path, root_dir)
-
-            try:
-                if ext == ".py":
-                    with open(path, "r", encoding="utf-8") as f:
-                        tree = ast.parse(f.read())
-                    funcs = [
-                        n for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)
-                    ]
-                    if funcs:
-                        result += f"\n📄 {rel_path}\n"
-                        for func in funcs:
-                            doc = ast.get_docstring(func)
-                            result += f"  - def {func.name}()\n"
-                            if doc:
-                                for line in doc.strip().splitlines():
-                                    result += f"      {line.strip()}\n"
-
-                elif ext in allowed_extensions:
-                    funcs = extract_js_functions_esprima(path)
-                    if funcs:
-                        result += f"\n📄 {rel_path}\n"
-                        for name in funcs:
-                            result += f"  - function {name}()\n"
-
-            except Exception as e:
-                result += f"\n[⚠️ Error parsing {rel_path}: {e}]\n"
+    failed = False
+    digest = None
+    ext = os.path.splitext(path)[1].lower()
 
+    try:
+        if ext == ".py":
+            with open(path, "rb") as f:
+                data = f.read()
+            digest = hash_bytes(data)  # 캐시에 저장할 때 같은 내용을 다시 읽지 않게
+            tree = ast.parse(data)
+            funcs = [n for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)]
+            if funcs:
+                result += f"\n📄 {rel_path}\n"
+                for func in funcs:
+                    doc = ast.get_docstring(func)
+                    result += f"  - def {func.name}()\n"
+                    if doc:
+                        for line in doc.strip().splitlines():
+                            result += f"      {line.strip()}\n"
+
+        elif ext in FUNCTION_EXTENSIONS:
+            funcs = (
+                js_funcs if js_funcs is not None else extract_js_functions_esprima(path)
+            )
+            failed = isinstance(funcs, ExtractionError)
+            if funcs:
+                result += f"\n📄 {rel_path}\n"
+                for name in funcs:
+                    result += f"  - function {name}()\n"
+
+    except Exception as e:
+        result += f"\n[⚠️ Error parsing {rel_path}: {e}]\n"
+        failed = True
+
+    return result, failed, digest
+
+
+# Python 파일 병렬 추출 설정
+PY_EXTRACT_WORKERS = None  # None이면 CPU 코어 수
+PY_PARALLEL_MIN_FILES = 64  # 이보다 적으면 프로세스 풀 기동 비용이 더 커서 직렬 처리
+
+
+def _summarize_py_files(jobs, workers=None):
+    """
+    (path, rel_path) 목록을 (요약 블록, 실패 여부, 내용 해시) 목록으로 변환합니다. (입력 순서 유지)
+    - 파일 수가 충분히 많으면 ProcessPoolExecutor로 청크 단위 병렬 처리
+    """
+    workers = workers or PY_EXTRACT_WORKERS or os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+
+    if workers > 1 and len(jobs) >= PY_PARALLEL_MIN_FILES:
+        paths = [path for path, _ in jobs]
+        rel_paths = [rel_path for _, rel_path in jobs]
+        chunksize = max(1, len(jobs) // (workers * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                return list(
+                    ex.map(
+                        summarize_file_functions, paths, rel_paths, chunksize=chunksize
+                    )
+                )
+        except Exception as e:
+            print(f"[병렬 추출 실패] 직렬 처리로 전환: {e}")
+
+    return [summarize_file_functions(path, rel_path) for path, rel_path in jobs]
+
+
+def extract_functions(root_dir, manifest=None, file_cache=None, workers=None):
+    """
+    root_dir 하위 소스 파일의 함수 요약을 만듭니다.
+    - file_cache(FileRecordCache)가 주어지면 변경되지 않은 파일은 캐시된 블록을 재사용
+    - workers: Python 파일 병렬 추출 프로세스 수 (None이면 PY_EXTRACT_WORKERS)
+    """
+    if manifest is None:
+        manifest = scan_project(root_dir)
+
+    entries = list(manifest.iter_files(root_dir, FUNCTION_EXTENSIONS))
+    blocks = [None] * len(entries)
+    failed = [False] * len(entries)
+    digests = [None] * len(entries)
+    pending = []
+
+    for i, entry in enumerate(entries):
+        if file_cache is not None:
+            blocks[i] = file_cache.lookup(entry)
+        if blocks[i] is None:
+            pending.append(i)
+
+    # ✅ JS/TS 파일은 한 번에 모아서 상주 Node 프로세스 풀로 추출
+    js_paths = [entries[i].path for i in pending if entries[i].ext != ".py"]
+    js_results = extract_js_functions_batch(js_paths)
+
+    # ✅ Python 파일은 (많으면) 프로세스 풀로 병렬 추출, 결과는 경로 순서대로 병합
+    py_pending = [i for i in pending if entries[i].ext == ".py"]
+    py_blocks = _summarize_py_files(
+        [
+            (entries[i].path, os.path.relpath(entries[i].path, root_dir))
+            for i in py_pending
+        ],
+        workers,
+    )
+    for i, (block, error, digest) in zip(py_pending, py_blocks):
+        blocks[i], failed[i], digests[i] = block, error, digest
+
+    for i in pending:
+        entry = entries[i]
+        if blocks[i] is None:
+            blocks[i], failed[i], digests[i] = summarize_file_functions(
+                entry.path,
+                os.path.relpath(entry.path, root_dir),
+                js_results.get(entry.path),
+            )
+        # 실패(Node 없음, 파싱 오류)는 저장하지 않음 → 다음 로드 때 다시 추출
+        if file_cache is not None and not failed[i]:
+            file_cache.store(entry, blocks[i], digests[i])
+
+    if file_cache is not None:
+        file_cache.prune(entry.rel_path for entry in entries)
+
+    result = "".join(blocks)
     return result or "⚠️ 함수 요약 결과가 없습니다."
 
 
@@ -0,0 +1,243 @@
+import os
+from array import array
+
+# 📌 프로젝트 트리를 문자열 대신 압축된 경로 트라이로 보관
+#   - 노드 정보는 배열(array)에 저장: 이름(세그먼트 ID), 부모, 종류(폴더/파일)
+#   - 같은 이름(index.js, __init__.py 등)은 세그먼트 테이블에 한 번만 저장
+#   - 자식 목록은 CSR 형태(child_start + child_index)로 고정 → 노드당 파이썬 객체 없음
+#   - 노드 ID는 전위 순회(표시) 순서와 같아서, 잘라낸 트리도 ID 정렬만으로 순서 유지
+#   - 출력 형식은 get_project_tree (📁 폴더/, 📄 파일, 4칸 들여쓰기) 와 동일
+
+INDENT = "    "
+DIR_ICON = "📁 "
+FILE_ICON = "📄 "
+
+
+class PathTrie:
+    ROOT = 0
+
+    def __init__(self, root_name):
+        self._segments = []  # 세그먼트 ID → 이름
+        self._segment_ids = {}  # 이름 → 세그먼트 ID
+        self.names = array("i")
+        self.parents = array("i")
+        self.is_dir = bytearray()
+        self.child_start = None
+        self.child_index = None
+        self._children = [[]]  # 만드는 동안만 쓰는 자식 목록
+        self._new_node(root_name, -1, True)
+        self._children = [[]]
+
+    def __len__(self):
+        return len(self.names)
+
+    # ── 생성 ────────────────────────────────────────────────
+    def _intern(self, name):
+        seg = self._segment_ids.get(name)
+        if seg is None:
+            seg = self._segment_ids[name] = len(self._segments)
+            self._segments.append(name)
+        return seg
+
+    def _new_node(self, name, parent, is_dir):
+        node = len(self.names)
+        self.names.append(self._intern(name))
+        self.parents.append(parent)
+        self.is_dir.append(1 if is_dir else 0)
+        if parent >= 0:
+            self._children[parent].append(node)
+            self._children.append([])
+        return node
+
+    def add_dir(self, parent, name):
+        return self._new_node(name, parent, True)
+
+    def add_file(self, parent, name):
+        return self._new_node(name, parent, False)
+
+    def freeze(self):
+        """자식 목록을 배열 두 개(CSR)로 압축. 이후 노드 추가 불가"""
+        start = array("i", [0]) * (len(self.names) + 1)
+        index = array("i")
+        for node, children in enumerate(self._children):
+            start[node] = len(index)
+            index.extend(children)
+        start[len(self.names)] = len(index)
+        self.child_start = start
+        self.child_index = index
+        self._children = None
+        return self
+
+    @classmethod
+    def from_manifest(cls, manifest, base_path, extensions=None):
+        """
+        manifest에서 base_path 하위 트리를 만듭니다.
+        - 폴더는 모두 포함, 파일은 extensions(소문자)에 해당하는 것만
+        - 폴더 안에서는 파일 먼저, 그다음 하위 폴더 (get_project_tree 와 같은 순서)
+        """
+        trie = cls(os.path.basename(os.path.normpath(base_path)))
+        base = manifest.rel_dir(base_path)
+        if base is None:
+            return trie.freeze()
+
+        dir_nodes = {base: cls.ROOT}
+        for rel_dir in manifest.iter_dirs(base_path):
+            node = dir_nodes.get(rel_dir)
+            if node is None:
+                parent = dir_nodes.get(os.path.dirname(rel_dir))
+                if parent is None:
+                    continue
+                node = dir_nodes[rel_dir] = trie.add_dir(
+                    parent, os.path.basename(rel_dir)
+                )
+            for name in manifest.dir_files.get(rel_dir, []):
+                if extensions is None or os.path.splitext(name)[1] in extensions:
+                    trie.add_file(node, name)
+        return trie.freeze()
+
+    @classmethod
+    def from_text(cls, text):
+        """structure.txt (get_project_tree 출력) 를 다시 트라이로 읽음"""
+        lines = text.splitlines()
+        if not lines or not lines[0].lstrip().startswith(DIR_ICON):
+            return cls("").freeze()
+
+        trie = cls(lines[0].strip()[len(DIR_ICON) :].rstrip("/"))
+        stack = [cls.ROOT]  # 깊이별 폴더 노드
+        for line in lines[1:]:
+            content = line.lstrip(" ")
+            depth = (len(line) - len(content)) // len(INDENT)
+            if depth < 1:
+                continue
+            del stack[depth:]
+            if len(stack) < depth:
+                continue  # 들여쓰기가 어긋난 줄은 무시
+            if content.startswith(DIR_ICON):
+                stack.append(
+                    trie.add_dir(stack[-1], content[len(DIR_ICON) :].rstrip("/"))
+                )
+            elif content.startswith(FILE_ICON):
+                trie.add_file(stack[-1], content[len(FILE_ICON) :])
+        return trie.freeze()
+
+    # ── 조회 ────────────────────────────────────────────────
+    def name_of(self, node):
+        return self._segments[self.names[node]]
+
+    def children(self, node):
+        return self.child_index[self.child_start[node] : self.child_start[node + 1]]
+
+    def path_of(self, node):
+        """루트 기준 상대 경로 (루트 자신은 "")"""
+        parts = []
+        while node > self.ROOT:
+            parts.append(self.name_of(node))
+            node = self.parents[node]
+        return os.path.join(*reversed(parts)) if parts else ""
+
+    def find(self, rel_path):
+        """루트 기준 상대 경로의 노드 ID (없으면 None)"""
+        node = self.ROOT
+        for part in rel_path.replace("\\", "/").split("/"):
+            if not part or part == ".":
+                continue
+            seg = self._segment_ids.get(part)
+            if seg is None:
+                return None
+            for child in self.children(node):
+                if self.names[child] == seg:
+                    node = child
+                    break
+            else:
+                return None
+        return node
+
+    def iter_files(self, node=ROOT):
+        """node 하위 파일의 상대 경로 (표시 순서)"""
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            if not self.is_dir[n]:
+                yield self.path_of(n)
+                continue
+            stack.extend(reversed(self.children(n)))
+
+    # ── 출력 ────────────────────────────────────────────────
+    def _line(self, node, depth):
+        if self.is_dir[node]:
+            return f"{INDENT * depth}{DIR_ICON}{self.name_of(node)}/"
+        return f"{INDENT * depth}{FILE_ICON}{self.name_of(node)}"
+
+    def render(self, node=ROOT):
+        """node(기본: 전체) 하위 트리를 텍스트로 — 출력 줄 수에 비례"""
+        if node is None:
+            return ""
+        lines = []
+        stack = [(node, 0)]
+        while stack:
+            n, depth = stack.pop()
+            lines.append(self._line(n, depth))
+            if self.is_dir[n]:
+                stack.extend((c, depth + 1) for c in reversed(self.children(n)))
+        return "\n".join(lines)
+
+    def max_dir_depth(self):
+        """루트 아래 폴더 깊이의 최댓값 (폴더가 없으면 0)"""
+        depth = [0] * len(self.names)
+        deepest = 0
+        for n in range(1, len(self.names)):  # 노드 ID는 부모보다 큼
+            depth[n] = depth[self.parents[n]] + 1
+            if self.is_dir[n]:
+                deepest = max(deepest, depth[n])
+        return deepest
+
+    def render_dirs(self, max_depth=None):
+        """
+        폴더만 남긴 트리 (전체 트리가 너무 클 때의 요약)
+        - 폴더마다 바로 아래 파일 수, max_depth 깊이의 폴더는 하위 전체 파일 수만 표시
+        """
+        total = [0] * len(self.names)
+        for n in range(len(self.names) - 1, 0, -1):  # 자식 → 부모 순으로 합산
+            total[self.parents[n]] += total[n] if self.is_dir[n] else 1
+
+        lines = []
+        stack = [(self.ROOT, 0)]
+        while stack:
+            n, depth = stack.pop()
+            children = self.children(n)
+            if max_depth is not None and depth >= max_depth:
+                count = f" (하위 파일 {total[n]}개)" if total[n] else ""
+                lines.append(f"{self._line(n, depth)}{count}")
+                continue
+            files = sum(1 for c in children if not self.is_dir[c])
+            count = f" (파일 {files}개)" if files else ""
+            lines.append(f"{self._line(n, depth)}{count}")
+            stack.extend((c, depth + 1) for c in reversed(children) if self.is_dir[c])
+        return "\n".join(lines)
+
+    def render_paths(self, rel_paths):
+        """
+        주어진 파일(또는 폴더)들과 그 상위 폴더만 남긴 트리를 텍스트로.
+        비용은 (경로 수 × 깊이) 에 비례하고 전체 트리 크기와 무관.
+        """
+        keep = {self.ROOT}
+        kept_children = {}
+        for rel_path in rel_paths:
+            node = self.find(rel_path)
+            while node is not None and node not in keep:
+                keep.add(node)
+                parent = self.parents[node]
+                kept_children.setdefault(parent, []).append(node)
+                node = parent
+        if len(keep) == 1:
+            return ""
+
+        lines = []
+        stack = [(self.ROOT, 0)]
+        while stack:
+            n, depth = stack.pop()
+            lines.append(self._line(n, depth))
+            # 노드 ID 순서 = 표시 순서
+            for c in sorted(kept_children.get(n, ()), reverse=True):
+                stack.append((c, depth + 1))
+        return "\n".join(lines)
@@ -0,0 +1,203 @@
+import os
+
+# ✅ 모든 소비자(트리, 함수 추출, 언어 추론, 관련 파일 검색)가 공유하는 제외 목록
+EXCLUDED_DIRS = {
+    "node_modules",
+    ".git",
+    "dist",
+    "build",
+    ".venv",
+    "venv",
+    "__pycache__",
+    ".gptcache",
+    ".idea",
+    ".next",
+    ".out",
+    ".cache",
+}
+
+LANGUAGE_BY_EXT = {
+    ".py": "Python",
+    ".ipynb": "Notebook",
+    ".js": "JavaScript",
+    ".jsx": "JavaScript",
+    ".ts": "TypeScript",
+    ".tsx": "TypeScript",
+    ".html": "HTML",
+    ".css": "CSS",
+}
+
+
+class FileEntry:
+    __slots__ = ("path", "rel_path", "name", "ext", "size", "mtime", "language")
+
+    def __init__(self, path, rel_path, size, mtime):
+        self.path = path
+        self.rel_path = rel_path
+        self.name = os.path.basename(rel_path)
+        self.ext = os.path.splitext(self.name)[1].lower()
+        self.size = size
+        self.mtime = mtime
+        self.language = LANGUAGE_BY_EXT.get(self.ext)
+
+    def __repr__(self):
+        return f"<FileEntry {self.rel_path} size={self.size}>"
+
+
+class ProjectManifest:
+    """
+    프로젝트 폴더를 한 번만 순회해서 만든 파일 목록(경로, 확장자, 크기, mtime, 언어).
+    - dirs: 상대 경로 디렉토리 목록 (전위 순회 순서, 루트는 "")
+    - dir_files: 디렉토리별 파일 이름 목록 (정렬됨)
+    - files: 상대 경로 → FileEntry
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.dirs = []
+        self.dir_files = {}
+        self.files = {}
+
+    def __len__(self):
+        return len(self.files)
+
+    def rel_dir(self, base_dir):
+        """base_dir을 manifest 기준 상대 경로로 변환 (루트 바깥이면 None)"""
+        if not base_dir:
+            return ""
+        rel = os.path.relpath(os.path.abspath(base_dir), self.root)
+        if rel == os.curdir:
+            return ""
+        if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+            return None
+        return rel
+
+    def iter_dirs(self, base_dir=None):
+        base = self.rel_dir(base_dir)
+        if base is None:
+            return
+        prefix = base + os.sep if base else ""
+        for d in self.dirs:
+            if d == base or d.startswith(prefix):
+                yield d
+
+    def iter_files(self, base_dir=None, extensions=None):
+        """
+        base_dir 하위의 파일을 디렉토리 순회 순서대로 반환합니다.
+        extensions가 주어지면 해당 확장자(소문자)만 반환합니다.
+        """
+        for d in self.iter_dirs(base_dir):
+            for name in self.dir_files.get(d, []):
+                entry = self.files[os.path.join(d, name) if d else name]
+                if extensions is None or entry.ext in extensions:
+                    yield entry
+
+    def _drop_dir(self, rel_dir):
+        """rel_dir과 그 하위 디렉토리/파일을 manifest에서 제거"""
+        prefix = rel_dir + os.sep if rel_dir else ""
+        gone = {d for d in self.dirs if d == rel_dir or d.startswith(prefix)}
+        for d in gone:
+            for name in self.dir_files.pop(d, []):
+                self.files.pop(os.path.join(d, name) if d else name, None)
+        self.dirs = [d for d in self.dirs if d not in gone]
+
+    def rescan_dirs(self, rel_dirs):
+        """
+        바뀐 디렉토리만 다시 읽어 manifest를 갱신합니다. (파일 감시용)
+        - 디렉토리 자체의 파일 목록만 다시 읽고, 새로 생긴 하위 디렉토리는 통째로 스캔
+        - 사라진 디렉토리는 하위 항목과 함께 제거
+        """
+        known = set(self.dirs)
+        # 상위 디렉토리부터 처리해야 새 하위 트리를 중복 스캔하지 않음
+        for rel_dir in sorted(set(rel_dirs), key=lambda d: d.count(os.sep)):
+            if rel_dir not in known:
+                parent = os.path.dirname(rel_dir)
+                if rel_dir and parent not in known:
+                    continue  # 제외된/아직 모르는 상위 디렉토리 아래
+                if any(p in EXCLUDED_DIRS for p in rel_dir.split(os.sep)):
+                    continue
+
+            prefix = rel_dir + os.sep if rel_dir else ""
+            for name in self.dir_files.get(rel_dir, []):
+                self.files.pop(prefix + name, None)
+            subdirs = _scan_dir(self, rel_dir)
+            if subdirs is None:
+                self._drop_dir(rel_dir)
+                known = set(self.dirs)
+                continue
+            if rel_dir not in known:
+                self.dirs.append(rel_dir)
+
+            children = {prefix + name for name in subdirs}
+            old_children = {
+                d for d in known if d != rel_dir and os.path.dirname(d) == rel_dir
+            }
+            for child in old_children - children:
+                self._drop_dir(child)
+            for child in sorted(children - old_children):
+                _scan_tree(self, child)
+            known = set(self.dirs)
+
+        # 전위 순회 + 이름순 = 경로 구성 요소 단위 정렬
+        self.dirs.sort(key=lambda d: d.split(os.sep))
+
+
+def _scan_dir(manifest, rel_dir):
+    """
+    디렉토리 하나의 파일 목록을 manifest에 기록하고 하위 디렉토리 이름을 반환합니다.
+    디렉토리를 읽을 수 없으면 None.
+    """
+    abs_dir = os.path.join(manifest.root, rel_dir) if rel_dir else manifest.root
+    try:
+        with os.scandir(abs_dir) as it:
+            entries = list(it)
+    except OSError:
+        return None
+
+    subdirs = []
+    names = []
+
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in EXCLUDED_DIRS:
+                    subdirs.append(entry.name)
+                continue
+            if not entry.is_file():
+                continue
+            st = entry.stat()
+        except OSError:
+            continue
+
+        rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+        manifest.files[rel_path] = FileEntry(
+            entry.path, rel_path, st.st_size, st.st_mtime
+        )
+        names.append(entry.name)
+
+    manifest.dir_files[rel_dir] = sorted(names)
+    return sorted(subdirs)
+
+
+def _scan_tree(manifest, rel_dir):
+    """rel_dir 이하를 전위 순회하며 manifest에 추가"""
+    stack = [rel_dir]
+    while stack:
+        rel_dir = stack.pop()
+        subdirs = _scan_dir(manifest, rel_dir)
+        if subdirs is None:
+            continue
+        manifest.dirs.append(rel_dir)
+        # 전위 순회 + 이름순 정렬을 위해 역순으로 push
+        for name in reversed(subdirs):
+            stack.append(os.path.join(rel_dir, name) if rel_dir else name)
+
+
+def scan_project(root):
+    """
+    프로젝트 폴더를 한 번만 순회해서 ProjectManifest를 만듭니다.
+    - os.scandir의 DirEntry stat을 사용해 파일당 stat 호출을 최소화
+    """
+    manifest = ProjectManifest(root)
+    _scan_tree(manifest, "")
+    return manifest
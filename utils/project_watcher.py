@@ -0,0 +1,307 @@
+import os
+import sys
+import time
+import errno
+import queue
+import select
+import struct
+import threading
+
+from utils.project_scanner import EXCLUDED_DIRS, scan_project
+
+# 📌 프로젝트 폴더 감시 (선택 기능)
+#   - Linux: inotify (ctypes, 추가 의존성 없음) / 그 외 또는 실패 시: 주기적 스캔 비교
+#   - 변경 이벤트는 "바뀐 디렉토리(상대 경로)" 단위로 모아서 debounce 후 한 번에 전달
+#   - 전달 값이 None이면 이벤트 유실(큐 넘침 등) → 전체 다시 스캔 필요
+
+DEFAULT_DEBOUNCE = 0.5  # 마지막 이벤트 이후 이만큼 조용하면 반영
+MAX_DEBOUNCE_WAIT = 5.0  # 이벤트가 계속 와도 이 시간이 지나면 한 번 반영
+POLL_INTERVAL = 2.0
+
+RESCAN_ALL = None
+
+# inotify 상수 (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyBackend:
+    """
+    디렉토리마다 inotify watch를 걸고, 이벤트가 생긴 디렉토리의 상대 경로를 보고합니다.
+    새 디렉토리가 생기면 그 아래까지 watch를 추가합니다.
+    """
+
+    def __init__(self, root):
+        import ctypes
+        import ctypes.util
+
+        self.root = os.path.abspath(root)
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self._ctypes = ctypes
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        self._wd_to_dir = {}
+        self._add_tree("")
+
+    def _add_watch(self, rel_dir):
+        path = os.path.join(self.root, rel_dir) if rel_dir else self.root
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = self._ctypes.get_errno()
+            if err == errno.ENOSPC:
+                # fs.inotify.max_user_watches 초과 → 폴링으로 전환
+                raise OSError(err, "inotify watch 개수 한도 초과")
+            return  # 그 사이 지워진 디렉토리 등은 무시
+        self._wd_to_dir[wd] = rel_dir
+
+    def _add_tree(self, rel_dir):
+        stack = [rel_dir]
+        while stack:
+            rel_dir = stack.pop()
+            self._add_watch(rel_dir)
+            abs_dir = os.path.join(self.root, rel_dir) if rel_dir else self.root
+            try:
+                with os.scandir(abs_dir) as it:
+                    for entry in it:
+                        if entry.name in EXCLUDED_DIRS:
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(
+                                os.path.join(rel_dir, entry.name)
+                                if rel_dir
+                                else entry.name
+                            )
+            except OSError:
+                continue
+
+    def read(self, timeout):
+        """
+        timeout초 동안 이벤트를 기다립니다.
+        Returns:
+            set[str] | None: 바뀐 디렉토리 목록 (None이면 전체 다시 스캔)
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        pos = 0
+        while pos + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_len = _EVENT_HEADER.unpack_from(data, pos)
+            pos += _EVENT_HEADER.size
+            name = os.fsdecode(data[pos : pos + name_len].rstrip(b"\0"))
+            pos += name_len
+
+            if mask & IN_Q_OVERFLOW:
+                return RESCAN_ALL
+            rel_dir = self._wd_to_dir.get(wd)
+            if rel_dir is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._wd_to_dir[wd]
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                # 디렉토리 자체가 사라짐 → 상위 디렉토리 기준으로 다시 읽기
+                changed.add(os.path.dirname(rel_dir))
+                continue
+            if name in EXCLUDED_DIRS:
+                continue
+
+            changed.add(rel_dir)
+            if mask & IN_ISDIR:
+                child = os.path.join(rel_dir, name) if rel_dir else name
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(child)
+                changed.add(child)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingBackend:
+    """
+    inotify를 쓸 수 없는 환경용: 주기적으로 폴더를 스캔해 이전 결과와 비교합니다.
+    디렉토리별 (파일 이름, 크기, mtime) 목록이 달라진 디렉토리를 보고합니다.
+    """
+
+    def __init__(self, root, interval=POLL_INTERVAL):
+        self.root = os.path.abspath(root)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self):
+        manifest = scan_project(self.root)
+        snapshot = {}
+        for rel_dir in manifest.dirs:
+            prefix = rel_dir + os.sep if rel_dir else ""
+            snapshot[rel_dir] = tuple(
+                (
+                    name,
+                    manifest.files[prefix + name].size,
+                    manifest.files[prefix + name].mtime,
+                )
+                for name in manifest.dir_files[rel_dir]
+            )
+        return snapshot
+
+    def read(self, timeout):
+        if self._stop.wait(max(timeout, self.interval)):
+            return set()
+        snapshot = self._take_snapshot()
+        old = self._snapshot
+        self._snapshot = snapshot
+
+        changed = set()
+        for rel_dir in old.keys() | snapshot.keys():
+            if old.get(rel_dir) != snapshot.get(rel_dir):
+                changed.add(rel_dir)
+                if rel_dir not in old or rel_dir not in snapshot:
+                    changed.add(os.path.dirname(rel_dir))
+        return changed
+
+    def close(self):
+        self._stop.set()
+
+
+def create_backend(root, poll_interval=POLL_INTERVAL):
+    """Linux면 inotify, 실패하거나 다른 OS면 폴링 백엔드"""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyBackend(root)
+        except (OSError, AttributeError) as e:
+            print(f"[감시 경고] inotify 사용 불가, 폴링으로 전환: {e}")
+    return PollingBackend(root, poll_interval)
+
+
+class ProjectWatcher:
+    """
+    백그라운드 스레드에서 프로젝트 폴더 변경을 감시합니다.
+    - 짧은 시간에 몰리는 변경(git checkout, 일괄 저장 등)은 debounce 해서 한 번에 전달
+    - on_change(changed_dirs)는 감시 스레드에서 호출됨 (UI 갱신은 호출 측에서 after로)
+    """
+
+    def __init__(
+        self,
+        root,
+        on_change,
+        debounce=DEFAULT_DEBOUNCE,
+        max_wait=MAX_DEBOUNCE_WAIT,
+        poll_interval=POLL_INTERVAL,
+    ):
+        self.root = os.path.abspath(root)
+        self.on_change = on_change
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self.poll_interval = poll_interval
+        self.backend = None
+        self._stop = threading.Event()
+        self._threads = []
+        self._events = queue.Queue()
+
+    @property
+    def mode(self):
+        if isinstance(self.backend, InotifyBackend):
+            return "inotify"
+        return "polling" if self.backend else None
+
+    def start(self):
+        if self._threads:
+            return
+        self.backend = create_backend(self.root, self.poll_interval)
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._read_loop, daemon=True),
+            threading.Thread(target=self._dispatch_loop, daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self):
+        self._stop.set()
+        backend, self.backend = self.backend, None
+        if isinstance(backend, PollingBackend):
+            backend.close()  # 대기 중인 폴링을 바로 깨움
+        for t in self._threads:
+            if t is not threading.current_thread():
+                t.join(timeout=2)
+        self._threads = []
+        if backend:
+            backend.close()
+
+    def _read_loop(self):
+        backend = self.backend
+        while not self._stop.is_set():
+            try:
+                changed = backend.read(0.5)
+            except Exception as e:
+                print(f"[감시 오류] {e}")
+                changed = RESCAN_ALL
+                self._stop.wait(self.poll_interval)
+            if changed is RESCAN_ALL or changed:
+                self._events.put(changed)
+
+    def _dispatch_loop(self):
+        while not self._stop.is_set():
+            try:
+                first = self._events.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            pending = first
+            started = time.monotonic()
+            while not self._stop.is_set():
+                remaining = self.max_wait - (time.monotonic() - started)
+                if remaining <= 0:
+                    break
+                try:
+                    more = self._events.get(timeout=min(self.debounce, remaining))
+                except queue.Empty:
+                    break
+                if pending is RESCAN_ALL or more is RESCAN_ALL:
+                    pending = RESCAN_ALL
+                else:
+                    pending |= more
+
+            if self._stop.is_set():
+                break
+            try:
+                self.on_change(pending)
+            except Exception as e:
+                print(f"[감시 오류] 변경 반영 실패: {e}")
@@ -0,0 +1,274 @@
+import os
+import time
+import threading
+from collections import deque
+
+# 📌 분석 요청 스케줄러
+#   - 요청마다 번호(#1, #2, ...)와 상태/시간 기록, 요청별 취소
+#   - 동시 실행 수 제한 (Ollama 병렬 슬롯 수에 맞춤), 넘치면 대기열에서 순서대로 시작
+#   - 같은 키(모델 + 요청 문장 + 프로젝트 상태)의 요청이 대기/실행 중이면 새로 만들지 않고 합침
+#     → '요청 보내기'를 두 번 눌러도 생성은 한 번
+#     합쳐진 요청은 구독자 수를 셈: unsubscribe 는 자기 구독만 떼고, 마지막 구독자일 때만 취소
+#   - runner(request, finish)는 작업 스레드에서 호출: 끝나면 finish(result, error=None)를 한 번 호출
+#     (스트림처럼 다른 스레드에서 끝나도 됨, 취소는 request.set_cancel_hook 으로 연결)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+FINISHED_STATES = (DONE, CANCELLED, FAILED)
+
+HISTORY_SIZE = 50  # 상태 조회용으로 보관할 끝난 요청 수
+
+_STATE_TEXT = {
+    QUEUED: "대기 중",
+    RUNNING: "실행 중",
+    DONE: "완료",
+    CANCELLED: "중지됨",
+    FAILED: "실패",
+}
+
+
+def default_concurrency():
+    """Ollama 서버의 병렬 슬롯 수 (OLLAMA_NUM_PARALLEL, 없으면 1)"""
+    try:
+        return max(1, int(os.environ.get("OLLAMA_NUM_PARALLEL", "1")))
+    except ValueError:
+        return 1
+
+
+class AnalysisRequest:
+    def __init__(self, request_id, key, label=""):
+        self.id = request_id
+        self.key = key
+        self.label = label
+        self.model = None  # 답변한 모델 (경주 모드면 이긴 모델)
+        self.state = QUEUED
+        self.result = None
+        self.error = None
+        self.duplicates = 0  # 합쳐진 중복 요청 수
+        self.subscribers = 1  # 결과를 기다리는 쪽 수 (처음 요청 + 합쳐진 중복)
+        self.submitted_at = time.perf_counter()
+        self.started_at = None
+        self.first_token_at = None
+        self.finished_at = None
+        self.cancel_requested = False
+        self._cancel_hook = None
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self):
+        return self.state in FINISHED_STATES
+
+    def should_stop(self):
+        return self.cancel_requested
+
+    def set_cancel_hook(self, hook):
+        """취소할 때 호출할 함수 (예: StreamHandle.cancel). 이미 취소됐으면 바로 호출"""
+        with self._lock:
+            self._cancel_hook = hook
+            cancelled = self.cancel_requested
+        if cancelled and hook is not None:
+            hook()
+
+    def mark_first_token(self):
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+
+    def timings(self):
+        """(대기, 첫 토큰, 전체 실행) 초. 해당 시점 전이면 None"""
+        wait = run = ttft = None
+        if self.started_at is not None:
+            wait = self.started_at - self.submitted_at
+            end = self.finished_at or time.perf_counter()
+            run = end - self.started_at
+            if self.first_token_at is not None:
+                ttft = self.first_token_at - self.started_at
+        return wait, ttft, run
+
+    def summary_text(self):
+        wait, ttft, run = self.timings()
+        parts = [f"#{self.id} {_STATE_TEXT[self.state]}"]
+        if self.model:
+            parts.append(self.model)
+        if wait is not None:
+            parts.append(f"대기 {wait:.1f}s")
+        if ttft is not None:
+            parts.append(f"첫 토큰 {ttft:.1f}s")
+        if run is not None:
+            parts.append(f"실행 {run:.1f}s")
+        if self.duplicates:
+            parts.append(f"중복 {self.duplicates}건 합침")
+        return " · ".join(parts)
+
+
+class RequestScheduler:
+    def __init__(self, max_concurrent=None):
+        self.max_concurrent = max_concurrent or default_concurrency()
+        self._queue = deque()  # (request, runner)
+        self._running = {}
+        self._by_key = {}  # 대기/실행 중인 요청만
+        self._history = {}  # id → request (최근 HISTORY_SIZE개 + 진행 중)
+        self._next_id = 1
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        """callback(request): 요청 상태가 바뀔 때 (임의 스레드 → UI는 after로 넘길 것)"""
+        self._listeners.append(callback)
+
+    def _notify(self, request):
+        for callback in list(self._listeners):
+            try:
+                callback(request)
+            except Exception as e:
+                print(f"[스케줄러 경고] 상태 알림 실패: {e}")
+
+    def set_concurrency(self, max_concurrent):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self._pump()
+
+    def submit(self, key, runner, on_done=None, label=""):
+        """
+        :return: (request, is_new) — 같은 키가 진행 중이면 (기존 요청, False)
+        on_done(request)은 요청이 끝나면(완료/중지/실패) 한 번 호출됩니다.
+        """
+        with self._lock:
+            existing = self._by_key.get(key)
+            if existing is not None:
+                existing.duplicates += 1
+                existing.subscribers += 1
+                if on_done is not None:
+                    existing._callbacks.append(on_done)
+                return existing, False
+
+            request = AnalysisRequest(self._next_id, key, label)
+            self._next_id += 1
+            if on_done is not None:
+                request._callbacks.append(on_done)
+            self._by_key[key] = request
+            self._history[request.id] = request
+            self._queue.append((request, runner))
+            self._trim_history()
+        self._notify(request)
+        self._pump()
+        return request, True
+
+    def _trim_history(self):
+        finished = [r for r in self._history.values() if r.finished]
+        for request in finished[: max(0, len(finished) - HISTORY_SIZE)]:
+            del self._history[request.id]
+
+    def _pump(self):
+        started = []
+        with self._lock:
+            while self._queue and len(self._running) < self.max_concurrent:
+                request, runner = self._queue.popleft()
+                request.state = RUNNING
+                request.started_at = time.perf_counter()
+                self._running[request.id] = request
+                started.append((request, runner))
+        for request, runner in started:
+            self._notify(request)
+            threading.Thread(
+                target=self._start,
+                args=(request, runner),
+                name=f"analysis-{request.id}",
+                daemon=True,
+            ).start()
+
+    def _start(self, request, runner):
+        def finish(result=None, error=None):
+            self._finish(request, result, error)
+
+        try:
+            runner(request, finish)
+        except Exception as e:
+            print(f"[스케줄러 오류] 요청 #{request.id} 실행 실패: {e}")
+            finish(error=e)
+
+    def _finish(self, request, result, error):
+        with self._lock:
+            if request.finished:
+                return  # 취소 후 늦게 도착한 완료 등
+            if request.cancel_requested:
+                request.state = CANCELLED
+            elif error is not None:
+                request.state = FAILED
+            else:
+                request.state = DONE
+            request.result = result
+            request.error = error
+            request.finished_at = time.perf_counter()
+            self._running.pop(request.id, None)
+            if self._by_key.get(request.key) is request:
+                del self._by_key[request.key]
+            callbacks, request._callbacks = request._callbacks, []
+
+        self._notify(request)
+        self._pump()  # 슬롯이 비었으니 다음 요청 시작
+        for callback in callbacks:
+            try:
+                callback(request)
+            except Exception as e:
+                print(f"[스케줄러 경고] 요청 #{request.id} 완료 콜백 실패: {e}")
+
+    def cancel(self, request_id):
+        """요청 하나만 취소 (대기 중이면 바로 끝냄). 취소했으면 True"""
+        with self._lock:
+            request = self._history.get(request_id)
+            if request is None or request.finished:
+                return False
+            request.cancel_requested = True
+            queued = next((item for item in self._queue if item[0] is request), None)
+            if queued is not None:
+                self._queue.remove(queued)
+            with request._lock:
+                hook = request._cancel_hook
+        if queued is not None:
+            self._finish(request, None, None)
+        elif hook is not None:
+            hook()
+        return True
+
+    def unsubscribe(self, request, on_done=None):
+        """
+        구독 하나만 떼어냄 (합쳐진 요청을 기다리던 한쪽이 더 받지 않을 때)
+        on_done은 그 구독이 submit 때 넘긴 콜백 (더 호출하지 않음)
+        남은 구독자가 없을 때만 요청을 취소합니다. 취소했으면 True
+        """
+        with self._lock:
+            if request.finished:
+                return False
+            if on_done is not None and on_done in request._callbacks:
+                request._callbacks.remove(on_done)
+            request.subscribers = max(0, request.subscribers - 1)
+            last = request.subscribers == 0
+        return self.cancel(request.id) if last else False
+
+    def cancel_all(self):
+        for request in self.active():
+            self.cancel(request.id)
+
+    def get(self, request_id):
+        return self._history.get(request_id)
+
+    def active(self):
+        """실행 중 + 대기 중 요청 (시작 순서대로)"""
+        with self._lock:
+            return list(self._running.values()) + [r for r, _ in self._queue]
+
+    def queue_position(self, request):
+        """대기열에서 앞에 있는 요청 수 (대기 중이 아니면 None)"""
+        with self._lock:
+            for position, (queued, _) in enumerate(self._queue):
+                if queued is request:
+                    return position
+        return None
+
+    def status_text(self):
+        with self._lock:
+            running, queued = len(self._running), len(self._queue)
+        return f"실행 {running} · 대기 {queued} (동시 {self.max_concurrent})"
@@ -0,0 +1,195 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import unicodedata
+
+# 📌 Ollama 분석 응답 캐시 (.gptcache/responses.json)
+#   - 키 = 모델 이름 + 정규화한 프롬프트 해시 + 생성 옵션 + 프로젝트 색인 버전
+#   - 같은 요청을 다시 보내면 모델 호출 없이 저장된 응답을 토큰 콜백으로 재생
+#   - 오래된 항목(MAX_AGE)부터 지우고, 개수/크기 한도를 넘으면 가장 오래 안 쓴 항목부터 제거(LRU)
+#   - 완료된 응답만 저장 (중지/오류 응답은 저장하지 않음)
+#   - 조회(get)는 파일을 쓰지 않음: 적중/실패 수와 최근 사용 순서는 메모리에서만 바꾸고
+#     put() 때 함께 저장, 조회만 이어지면 SAVE_DELAY초 뒤 타이머 스레드가 한 번 저장
+
+RESPONSE_CACHE_FILE_NAME = "responses.json"
+RESPONSE_CACHE_VERSION = 1
+MAX_ENTRIES = 200
+MAX_BYTES = 2 * 1024 * 1024  # 저장된 응답 텍스트 합계 (UTF-8)
+MAX_AGE = 7 * 24 * 3600  # 초
+SAVE_DELAY = 5.0  # 조회로 바뀐 통계/사용 순서를 모아서 저장할 때까지 (초)
+
+_SPACE_RE = re.compile(r"\s+")
+# 재생 단위: 앞 공백 + 단어 (모델 토큰과 비슷하게)
+_REPLAY_RE = re.compile(r"\s*\S+|\s+")
+
+
+def normalize_prompt(prompt):
+    """공백/줄바꿈 차이, 유니코드 조합 차이는 같은 프롬프트로 취급"""
+    return _SPACE_RE.sub(" ", unicodedata.normalize("NFC", prompt)).strip()
+
+
+def make_cache_key(model, prompt, options=None, index_version=""):
+    prompt_hash = hashlib.blake2b(
+        normalize_prompt(prompt).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    raw = json.dumps(
+        [model, prompt_hash, options or {}, index_version],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def split_for_replay(text):
+    return _REPLAY_RE.findall(text)
+
+
+class ResponseCache:
+    """
+    entries[key] = {"model", "response", "size", "created", "used"}
+    dict 순서 = 사용 순서 (마지막이 가장 최근)
+    """
+
+    def __init__(
+        self, cache_dir, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES, max_age=MAX_AGE
+    ):
+        self.path = os.path.join(cache_dir, RESPONSE_CACHE_FILE_NAME)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.entries = {}
+        self.total_bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._save_timer = None
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[캐시 경고] {self.path} 읽기 실패, 응답 캐시 초기화: {e}")
+            return
+        if data.get("version") != RESPONSE_CACHE_VERSION:
+            return
+        entries = data.get("entries", {})
+        self.entries = dict(sorted(entries.items(), key=lambda kv: kv[1]["used"]))
+        self.total_bytes = sum(e["size"] for e in self.entries.values())
+        self.stats.update(data.get("stats", {}))
+        self._evict()
+
+    def _save(self):
+        """self._lock 안에서 호출"""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+        self._dirty = False
+        data = {
+            "version": RESPONSE_CACHE_VERSION,
+            "entries": self.entries,
+            "stats": self.stats,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _mark_dirty(self):
+        """self._lock 안에서 호출: 바로 쓰지 않고 SAVE_DELAY 뒤 한 번 저장 예약"""
+        self._dirty = True
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """조회로 바뀐 내용이 있으면 지금 저장 (프로젝트를 바꾸기 전 등)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self._save()
+            except OSError as e:
+                print(f"[캐시 경고] {self.path} 저장 실패: {e}")
+
+    def _evict(self, now=None):
+        now = now or time.time()
+        expired = [
+            k for k, e in self.entries.items() if now - e["created"] > self.max_age
+        ]
+        for key in expired:
+            self._remove(key)
+        while self.entries and (
+            len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self.entries)))
+
+    def _remove(self, key):
+        entry = self.entries.pop(key)
+        self.total_bytes -= entry["size"]
+        self.stats["evicted"] += 1
+
+    def get(self, key):
+        """저장된 응답 (없거나 만료됐으면 None). 적중하면 최근 사용으로 이동"""
+        with self._lock:
+            entry = self.entries.get(key)
+            now = time.time()
+            if entry is not None and now - entry["created"] > self.max_age:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                self._mark_dirty()
+                return None
+            del self.entries[key]
+            entry["used"] = now
+            self.entries[key] = entry
+            self.stats["hits"] += 1
+            self._mark_dirty()
+            return entry["response"]
+
+    def put(self, key, model, response):
+        if not response:
+            return
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self.entries:
+                self._remove(key)
+                self.stats["evicted"] -= 1  # 덮어쓰기는 제거로 세지 않음
+            now = time.time()
+            self.entries[key] = {
+                "model": model,
+                "response": response,
+                "size": size,
+                "created": now,
+                "used": now,
+            }
+            self.total_bytes += size
+            self._evict(now)
+            try:
+                self._save()
+            except OSError as e:
+                # 파일이 잠겼거나 디스크가 가득 참 → 메모리에는 남기고 나중에 다시 저장
+                print(f"[캐시 경고] {self.path} 저장 실패: {e}")
+                self._mark_dirty()
+
+    def hit_rate(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def summary_text(self):
+        s = self.stats
+        return (
+            f"적중 {s['hits']}/{s['hits'] + s['misses']} ({self.hit_rate():.0%}), "
+            f"항목 {len(self.entries)}개 ({self.total_bytes / 1024:.1f} KB), "
+            f"제거 {s['evicted']}개"
+        )
@@ -0,0 +1,303 @@
+import os
+import json
+import threading
+import importlib.util
+
+from utils.symbol_index import SYMBOL_EXTENSIONS
+from utils.ollama_http import get_client
+
+# 📌 임베딩 기반 의미 검색 (선택 기능)
+#   - 파일 앞부분과 심볼(함수/클래스/메서드) 본문 앞부분을 로컬 Ollama 임베딩 모델로 벡터화
+#   - 벡터는 정규화한 float32 행렬로 .gptcache/embeddings.f32 에 저장하고 memmap 으로 조회
+#   - 행 메타데이터(파일, 심볼, 줄 범위)는 .gptcache/embeddings.json
+#   - 바뀐/삭제된 파일의 행은 tombstone 처리 후 새 행 추가, 일정 비율이 넘으면 압축
+#   - 한국어 요청 ↔ 영어 코드처럼 키워드가 겹치지 않는 경우를 보완
+
+SEMANTIC_SEARCH_ENABLED = False
+EMBEDDING_MODEL = "nomic-embed-text"
+EMBED_TIMEOUT = 30
+QUERY_TIMEOUT = 5  # 프롬프트 생성 중 요청 임베딩은 짧게 기다림
+
+VECTOR_FILE_NAME = "embeddings.f32"
+META_FILE_NAME = "embeddings.json"
+SEMANTIC_VERSION = 1
+FILE_HEAD_CHARS = 1500  # 파일 임베딩에 쓰는 앞부분 길이
+SYMBOL_HEAD_CHARS = 1000  # 심볼 임베딩에 쓰는 본문 앞부분 길이
+COMPACT_DEAD_RATIO = 0.25
+
+
+# 선택 기능: NumPy가 없으면 의미 검색만 비활성화
+# (있어도 색인을 처음 만들 때 불러옴 → 앱 시작 시 import 비용 제외)
+np = None
+
+
+def is_semantic_available():
+    return np is not None or importlib.util.find_spec("numpy") is not None
+
+
+def _load_numpy():
+    global np
+    if np is None:
+        import numpy
+
+        np = numpy
+    return np
+
+
+def embed_text(text, model=None, base_url=None, timeout=EMBED_TIMEOUT):
+    """Ollama /api/embeddings 로 텍스트 하나를 벡터로 변환 (base_url None이면 기본 서버)"""
+    vector = get_client(base_url).embeddings(model or EMBEDDING_MODEL, text, timeout)
+    if not vector:
+        raise ValueError(f"임베딩 응답이 비어 있습니다: {model or EMBEDDING_MODEL}")
+    return vector
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+class SemanticIndex:
+    """
+    rows[i] = [rel_path, label, start, end] (label: 파일이면 "", 심볼이면 정규 이름)
+    파일 단위로 size/mtime을 기록해 바뀐 파일만 다시 임베딩합니다.
+    """
+
+    def __init__(self, cache_dir, root, model=None, base_url=None):
+        if not is_semantic_available():
+            raise RuntimeError("의미 검색에는 NumPy가 필요합니다. (pip install numpy)")
+        _load_numpy()
+        self.cache_dir = cache_dir
+        self.root = os.path.abspath(root)
+        self.model = model or EMBEDDING_MODEL
+        self.base_url = base_url
+        self.vector_path = os.path.join(cache_dir, VECTOR_FILE_NAME)
+        self.meta_path = os.path.join(cache_dir, META_FILE_NAME)
+        self.dim = None
+        self.rows = []
+        self.files = {}  # rel_path → [size, mtime, [row, ...]]
+        self.dead = 0
+        self._matrix = None  # 읽기 전용 memmap (조회 시 지연 생성)
+        self._alive = None
+        self._lock = threading.Lock()
+        self._load()
+
+    # ── 저장/로드 ────────────────────────────────────────────
+    def _load(self):
+        if not (os.path.exists(self.meta_path) and os.path.exists(self.vector_path)):
+            return
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if (
+                meta.get("version") != SEMANTIC_VERSION
+                or meta.get("root") != self.root
+                or meta.get("model") != self.model
+            ):
+                return
+            expected = len(meta["rows"]) * meta["dim"] * 4
+            size = os.path.getsize(self.vector_path)
+            if size < expected:
+                raise ValueError("벡터 파일 크기가 메타데이터와 다릅니다.")
+            if size > expected:
+                # 메타데이터 저장 전에 중단된 추가분은 버림
+                with open(self.vector_path, "r+b") as f:
+                    f.truncate(expected)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"[색인 경고] {self.meta_path} 읽기 실패, 다시 생성: {e}")
+            return
+
+        self.dim = meta["dim"]
+        self.rows = meta["rows"]
+        self.files = meta["files"]
+        self.dead = meta["dead"]
+
+    def _save_meta(self):
+        meta = {
+            "version": SEMANTIC_VERSION,
+            "root": self.root,
+            "model": self.model,
+            "dim": self.dim,
+            "rows": self.rows,
+            "files": self.files,
+            "dead": self.dead,
+        }
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, self.meta_path)
+
+    def _reset(self):
+        self.dim = None
+        self.rows = []
+        self.files = {}
+        self.dead = 0
+        if os.path.exists(self.vector_path):
+            os.remove(self.vector_path)
+
+    # ── 색인 갱신 ─────────────────────────────────────────────
+    def _items_for_file(self, entry, symbols):
+        """파일 하나에서 임베딩할 (row 메타, 텍스트) 목록"""
+        try:
+            with open(entry.path, "r", encoding="utf-8") as f:
+                source = f.read()
+        except Exception:
+            return []
+        lines = source.splitlines()
+        items = [
+            (
+                [entry.rel_path, "", 1, 0],
+                f"{entry.rel_path}\n{source[:FILE_HEAD_CHARS]}",
+            )
+        ]
+        for sym in symbols:
+            body = "\n".join(lines[sym.start - 1 : sym.end])
+            items.append(
+                (
+                    [entry.rel_path, sym.qualname, sym.start, sym.end],
+                    f"{entry.rel_path} {sym.kind} {sym.qualname}\n"
+                    f"{body[:SYMBOL_HEAD_CHARS]}",
+                )
+            )
+        return items
+
+    def _kill_file(self, rel_path):
+        rec = self.files.pop(rel_path, None)
+        if rec is None:
+            return
+        for row in rec[2]:
+            self.rows[row] = None
+            self.dead += 1
+
+    def update(self, entries, symbols_by_path=None, should_stop=None):
+        """
+        파일 목록(FileEntry)과 비교해 추가/변경/삭제된 파일만 다시 임베딩합니다.
+        - symbols_by_path(rel_path → [Symbol])가 주어지면 파일마다 심볼 단위 행도 추가
+        - 임베딩 서버 오류는 그대로 올림 (지금까지 끝낸 파일은 저장됨)
+        Returns:
+            int: 다시 임베딩한 파일 수
+        """
+        live = {e.rel_path: e for e in entries if e.ext in SYMBOL_EXTENSIONS}
+        changed = 0
+        try:
+            with self._lock:
+                for rel_path in [p for p in self.files if p not in live]:
+                    self._kill_file(rel_path)
+
+            for rel_path, entry in live.items():
+                if should_stop and should_stop():
+                    break
+                rec = self.files.get(rel_path)
+                if rec is not None and rec[0] == entry.size and rec[1] == entry.mtime:
+                    continue
+
+                symbols = (symbols_by_path or {}).get(rel_path, [])
+                items = self._items_for_file(entry, symbols)
+                vectors = [
+                    embed_text(text, self.model, self.base_url) for _, text in items
+                ]
+                with self._lock:
+                    self._kill_file(rel_path)
+                    self._append(entry, [meta for meta, _ in items], vectors)
+                changed += 1
+        finally:
+            with self._lock:
+                if self.rows and self.dead > len(self.rows) * COMPACT_DEAD_RATIO:
+                    self._compact()
+                if self.dim is not None:
+                    self._save_meta()
+        return changed
+
+    def _append(self, entry, metas, vectors):
+        if vectors:
+            matrix = np.asarray(vectors, dtype=np.float32)
+            if self.dim is None:
+                self._reset()
+                self.dim = matrix.shape[1]
+            elif matrix.shape[1] != self.dim:
+                raise ValueError(
+                    f"임베딩 차원이 다릅니다: {matrix.shape[1]} != {self.dim}"
+                )
+            with open(self.vector_path, "ab") as f:
+                f.write(_normalize(matrix).tobytes())
+
+        first = len(self.rows)
+        self.rows.extend(metas[: len(vectors)])
+        self.files[entry.rel_path] = [
+            entry.size,
+            entry.mtime,
+            list(range(first, len(self.rows))),
+        ]
+        self._matrix = None
+
+    def _compact(self):
+        """tombstone 된 행을 빼고 벡터 파일을 다시 씀"""
+        self._matrix = None  # 열린 memmap이 있으면 파일 교체가 실패하는 OS 대비
+        live_rows = [i for i, row in enumerate(self.rows) if row is not None]
+        remap = {old: new for new, old in enumerate(live_rows)}
+        if self.dim is not None and self.rows:
+            matrix = np.memmap(
+                self.vector_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(len(self.rows), self.dim),
+            )
+            tmp_path = self.vector_path + ".tmp"
+            np.asarray(matrix[live_rows]).tofile(tmp_path)
+            del matrix
+            os.replace(tmp_path, self.vector_path)
+
+        self.rows = [self.rows[i] for i in live_rows]
+        for rec in self.files.values():
+            rec[2] = [remap[i] for i in rec[2]]
+        self.dead = 0
+        self._matrix = None
+
+    # ── 검색 ─────────────────────────────────────────────────
+    def is_ready(self):
+        return self.dim is not None and len(self.rows) > self.dead
+
+    def _ensure_matrix(self):
+        if self._matrix is None and self.dim is not None and self.rows:
+            self._matrix = np.memmap(
+                self.vector_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(len(self.rows), self.dim),
+            )
+            self._alive = np.array([row is not None for row in self.rows])
+        return self._matrix
+
+    def search(self, text, limit=10, min_score=0.0):
+        """
+        text와 코사인 유사도가 높은 행을 반환합니다.
+        Returns:
+            list[tuple]: (score, rel_path, label, start, end) — label ""은 파일 단위
+        """
+        if not text or self.dim is None:
+            return []
+        query = np.asarray(
+            embed_text(text, self.model, self.base_url, timeout=QUERY_TIMEOUT),
+            dtype=np.float32,
+        )
+        if query.shape[0] != self.dim:
+            return []
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+
+        with self._lock:
+            matrix = self._ensure_matrix()
+            if matrix is None:
+                return []
+            scores = matrix @ (query / norm)
+            scores[~self._alive] = -np.inf
+            k = min(limit, int(self._alive.sum()))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                (float(scores[i]), *self.rows[i]) for i in top if scores[i] > min_score
+            ]
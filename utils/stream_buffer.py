@@ -0,0 +1,89 @@
+import time
+import threading
+
+# 📌 스트리밍 토큰 버퍼 (스트림 스레드 → UI 스레드)
+#   - 스트림 스레드는 push()로 쌓기만 하고, UI는 프레임마다 drain()으로 한 번에 가져감
+#   - 쌓인 글자 수가 HIGH_WATER를 넘으면 push()가 LOW_WATER까지 비워질 때까지 잠시 대기
+#     (UI가 밀리면 스트림 읽기도 늦춰서 메모리/이벤트 큐가 불어나지 않게 함)
+#   - 대기는 최대 MAX_PUSH_WAIT초: UI가 멈춰도 스트림 스레드가 영원히 묶이지 않음
+#   - push()는 스트림마다 하나인 전달 스레드(ollama_async)에서 호출됨 — asyncio 루프 스레드가
+#     아니므로 여기서 기다려도 다른 스트림/취소는 막히지 않고, 밀린 만큼 그 스트림 읽기만 멈춤
+
+HIGH_WATER = 64 * 1024  # 글자 수
+LOW_WATER = 16 * 1024
+MAX_PUSH_WAIT = 1.0
+
+
+class TokenBuffer:
+    def __init__(self, high_water=HIGH_WATER, low_water=LOW_WATER):
+        self.high_water = high_water
+        self.low_water = low_water
+        self._parts = []
+        self._pending = 0  # 아직 UI로 넘기지 않은 글자 수
+        self._closed = False
+        self._cond = threading.Condition()
+        self.stats = {
+            "tokens": 0,
+            "chars": 0,
+            "flushes": 0,
+            "max_backlog": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+        }
+        self.started = None
+        self.finished = None
+
+    def push(self, token):
+        """스트림 스레드에서 호출. 적체가 심하면 UI가 따라올 때까지 잠시 대기"""
+        if not token:
+            return
+        with self._cond:
+            if self.started is None:
+                self.started = time.perf_counter()
+            if self._pending >= self.high_water and not self._closed:
+                self.stats["waits"] += 1
+                start = time.perf_counter()
+                self._cond.wait_for(
+                    lambda: self._pending <= self.low_water or self._closed,
+                    timeout=MAX_PUSH_WAIT,
+                )
+                self.stats["wait_time"] += time.perf_counter() - start
+            self._parts.append(token)
+            self._pending += len(token)
+            self.stats["tokens"] += 1
+            self.stats["chars"] += len(token)
+            if self._pending > self.stats["max_backlog"]:
+                self.stats["max_backlog"] = self._pending
+
+    def drain(self):
+        """UI 스레드에서 호출. 쌓인 토큰을 한 문자열로 가져감 (없으면 "")"""
+        with self._cond:
+            if not self._parts:
+                return ""
+            text = "".join(self._parts)
+            self._parts = []
+            self._pending = 0
+            self.stats["flushes"] += 1
+            self._cond.notify_all()
+        return text
+
+    def close(self):
+        """스트림 종료 (대기 중인 push도 깨움)"""
+        with self._cond:
+            self._closed = True
+            self.finished = time.perf_counter()
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def summary_text(self):
+        s = self.stats
+        elapsed = (self.finished or time.perf_counter()) - (self.started or 0)
+        rate = s["tokens"] / elapsed if self.started and elapsed > 0 else 0
+        return (
+            f"토큰 {s['tokens']:,}개 ({rate:,.0f} tok/s), "
+            f"갱신 {s['flushes']:,}회, 최대 적체 {s['max_backlog']:,}자, "
+            f"대기 {s['waits']}회 ({s['wait_time']:.2f}s)"
+        )
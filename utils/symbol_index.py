@@ -0,0 +1,369 @@
+import os
+import re
+import ast
+import json
+import math
+
+from utils.js_tokenizer import extract_js_symbols
+
+# 📌 심볼(함수/클래스/메서드) 색인 (.gptcache/symbols.json)
+#   - 파일별로 (이름, 정규 이름, 종류, 시작/끝 줄, 시그니처)를 저장
+#   - 이름 → 심볼 목록 dict 로 정확한 식별자 조회는 파일을 읽지 않고 O(1)
+#   - 이름 조각(snake_case / camelCase 분해) → 심볼 목록으로 키워드 부분 일치 점수 계산
+#   - 본문은 프롬프트를 만들 때 상위 k개만 줄 범위로 잘라 읽음
+
+SYMBOL_FILE_NAME = "symbols.json"
+SYMBOL_VERSION = 1
+SYMBOL_EXTENSIONS = {".py", ".js", ".jsx", ".ts", ".tsx"}
+
+SYMBOL_CONTEXT_BUDGET = 6000  # 프롬프트에 넣을 심볼 본문 전체 글자 수 상한
+MAX_SYMBOL_LINES = 80  # 심볼 하나당 본문 줄 수 상한
+MAX_SIGNATURE_LENGTH = 160
+
+# ASCII만 (\w는 한글도 포함 → "update_tree_structure를"이 한 단어가 되지 않도록)
+_IDENT_RE = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*(?:\.[A-Za-z_$][A-Za-z0-9_$]*)*")
+_PART_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+# 일반 단어(scan, update)가 아니라 코드 식별자처럼 보이는지: snake_case, camelCase, a.b
+_CODE_LIKE_RE = re.compile(r"[_.$]|[a-z][A-Z]|[A-Za-z]\d")
+
+
+def split_identifier(name):
+    """update_tree_structure / updateTreeStructure → ['update', 'tree', 'structure']"""
+    return [p.lower() for p in _PART_RE.findall(name) if len(p) >= 2]
+
+
+class Symbol:
+    __slots__ = ("name", "qualname", "kind", "rel_path", "start", "end", "signature")
+
+    def __init__(self, name, qualname, kind, rel_path, start, end, signature):
+        self.name = name
+        self.qualname = qualname
+        self.kind = kind  # function / class / method
+        self.rel_path = rel_path
+        self.start = start
+        self.end = end
+        self.signature = signature
+
+    def to_list(self):
+        return [
+            self.name,
+            self.qualname,
+            self.kind,
+            self.start,
+            self.end,
+            self.signature,
+        ]
+
+    def __repr__(self):
+        return f"<Symbol {self.qualname} {self.rel_path}:{self.start}-{self.end}>"
+
+
+def _signature(lines, start, body_line):
+    """start ~ body_line 직전까지의 헤더 줄을 한 줄로 합침"""
+    header = lines[start - 1 : max(start, body_line - 1)]
+    text = " ".join(line.strip() for line in header)
+    return text[:MAX_SIGNATURE_LENGTH]
+
+
+def extract_python_symbols(source, rel_path=""):
+    """Python 소스에서 함수/클래스/메서드 심볼 목록 (소스 순서)"""
+    tree = ast.parse(source)
+    lines = source.splitlines()
+    symbols = []
+
+    def visit(node, prefix, in_class):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kind = "method" if in_class else "function"
+            elif isinstance(child, ast.ClassDef):
+                kind = "class"
+            else:
+                continue
+            qualname = f"{prefix}{child.name}"
+            start = min([child.lineno] + [d.lineno for d in child.decorator_list])
+            end = getattr(child, "end_lineno", None) or child.lineno
+            body_line = child.body[0].lineno if child.body else child.lineno
+            if body_line <= child.lineno:
+                signature = lines[child.lineno - 1].strip()[:MAX_SIGNATURE_LENGTH]
+            else:
+                signature = _signature(lines, child.lineno, body_line)
+            symbols.append(
+                Symbol(child.name, qualname, kind, rel_path, start, end, signature)
+            )
+            visit(child, qualname + ".", kind == "class")
+
+    visit(tree, "", False)
+    return symbols
+
+
+def extract_js_file_symbols(source, rel_path=""):
+    """JS/TS 소스에서 함수 심볼 목록 (Python 토크나이저 사용, Node 불필요)"""
+    lines = source.splitlines()
+    symbols = []
+    for rec in extract_js_symbols(source):
+        start = rec["line"]
+        signature = lines[start - 1].strip() if 0 < start <= len(lines) else ""
+        symbols.append(
+            Symbol(
+                rec["name"],
+                rec["name"],
+                "function",
+                rel_path,
+                start,
+                rec.get("end_line") or start,
+                signature[:MAX_SIGNATURE_LENGTH],
+            )
+        )
+    return symbols
+
+
+def extract_file_symbols(path, rel_path=""):
+    """확장자에 맞는 추출기로 파일 하나의 심볼 목록을 반환 (읽기/파싱 실패 시 빈 목록)"""
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+        if ext == ".py":
+            return extract_python_symbols(source, rel_path)
+        if ext in SYMBOL_EXTENSIONS:
+            return extract_js_file_symbols(source, rel_path)
+    except Exception:
+        pass
+    return []
+
+
+def read_symbol_body(path, start, end, max_lines=None):
+    """파일에서 start~end 줄(1부터 시작, 끝 포함)을 잘라 반환"""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    body = lines[start - 1 : end]
+    if max_lines is not None and len(body) > max_lines:
+        omitted = len(body) - max_lines
+        body = body[:max_lines] + [f"... ({omitted}줄 생략)"]
+    return "\n".join(body)
+
+
+class SymbolIndex:
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.files = {}  # rel_path → [size, mtime, [Symbol, ...]]
+        self.by_name = {}  # 이름/정규 이름 → [Symbol]
+        self.by_lower = {}  # 소문자 이름 → [Symbol]
+        self.by_part = {}  # 이름 조각 → [Symbol]
+        self.dirty = False
+
+    def __len__(self):
+        return sum(len(rec[2]) for rec in self.files.values())
+
+    # ── 색인 갱신 ─────────────────────────────────────────────
+    def _link(self, symbols):
+        for sym in symbols:
+            for name in {sym.name, sym.qualname}:
+                self.by_name.setdefault(name, []).append(sym)
+            self.by_lower.setdefault(sym.name.lower(), []).append(sym)
+            for part in set(split_identifier(sym.name)):
+                self.by_part.setdefault(part, []).append(sym)
+
+    def _unlink(self, symbols):
+        def drop(table, key, sym):
+            bucket = table.get(key)
+            if bucket is None:
+                return
+            bucket[:] = [s for s in bucket if s is not sym]
+            if not bucket:
+                del table[key]
+
+        for sym in symbols:
+            for name in {sym.name, sym.qualname}:
+                drop(self.by_name, name, sym)
+            drop(self.by_lower, sym.name.lower(), sym)
+            for part in set(split_identifier(sym.name)):
+                drop(self.by_part, part, sym)
+
+    def _set_file(self, rel_path, size, mtime, symbols):
+        old = self.files.get(rel_path)
+        if old is not None:
+            self._unlink(old[2])
+        self.files[rel_path] = [size, mtime, symbols]
+        self._link(symbols)
+        self.dirty = True
+
+    def _remove_file(self, rel_path):
+        old = self.files.pop(rel_path, None)
+        if old is not None:
+            self._unlink(old[2])
+            self.dirty = True
+
+    def update(self, manifest):
+        """
+        manifest와 비교해 추가/변경/삭제된 파일만 다시 추출합니다.
+        Returns:
+            int: 다시 추출한 파일 수
+        """
+        live = {e.rel_path: e for e in manifest.iter_files(None, SYMBOL_EXTENSIONS)}
+        for rel_path in [p for p in self.files if p not in live]:
+            self._remove_file(rel_path)
+
+        changed = 0
+        for rel_path, entry in live.items():
+            rec = self.files.get(rel_path)
+            if rec is not None and rec[0] == entry.size and rec[1] == entry.mtime:
+                continue
+            symbols = extract_file_symbols(entry.path, rel_path)
+            self._set_file(rel_path, entry.size, entry.mtime, symbols)
+            changed += 1
+        return changed
+
+    def _refresh_file(self, rel_path):
+        """본문을 읽기 직전, 파일이 색인 이후 바뀌었으면 그 파일만 다시 추출"""
+        path = os.path.join(self.root, rel_path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._remove_file(rel_path)
+            return False
+        rec = self.files.get(rel_path)
+        if rec is None or rec[0] != st.st_size or rec[1] != st.st_mtime:
+            symbols = extract_file_symbols(path, rel_path)
+            self._set_file(rel_path, st.st_size, st.st_mtime, symbols)
+        return True
+
+    def _current_symbol(self, sym):
+        """
+        파일을 다시 추출했을 수 있으므로 (파일, 정규 이름)으로 새 심볼을 다시 찾음
+        (줄 범위가 바뀌었으면 새 범위, 사라졌으면 None)
+        """
+        if not self._refresh_file(sym.rel_path):
+            return None
+        rec = self.files.get(sym.rel_path)
+        matches = [s for s in (rec[2] if rec else []) if s.qualname == sym.qualname]
+        if not matches:
+            return None
+        # 같은 이름이 여럿이면(조건부 정의 등) 원래 위치에 가장 가까운 것
+        return min(matches, key=lambda s: abs(s.start - sym.start))
+
+    # ── 조회 ─────────────────────────────────────────────────
+    def lookup(self, identifier):
+        """정확한 식별자(이름 또는 Class.method) 조회 — 파일을 읽지 않음"""
+        return list(self.by_name.get(identifier, []))
+
+    def search(self, text, keywords=(), related_files=(), limit=5):
+        """
+        요청 문장과 관련된 심볼을 점수 순으로 반환합니다.
+        - 문장에 그대로 적힌 코드 식별자(update_tree_structure, Class.method)가 최우선
+        - 소문자 키워드가 심볼 이름과 같으면 그다음
+        - 키워드가 이름 조각과 겹치면 희귀한 조각일수록 높은 점수
+        - 관련 파일 추천에 든 파일의 심볼은 가산점
+        """
+        scores = {}
+
+        def bump(sym, score):
+            scores[id(sym)] = (scores.get(id(sym), (0.0, sym))[0] + score, sym)
+
+        for ident in set(_IDENT_RE.findall(text or "")):
+            if not _CODE_LIKE_RE.search(ident):
+                continue  # 일반 단어는 아래 키워드 점수로만 반영
+            for sym in self.by_name.get(ident, []):
+                bump(sym, 100.0)
+
+        total = max(1, len(self))
+        for kw in set(keywords):
+            for sym in self.by_lower.get(kw, []):
+                bump(sym, 20.0)
+            bucket = self.by_part.get(kw, [])
+            if bucket:
+                idf = math.log(1 + total / len(bucket))
+                for sym in bucket:
+                    bump(sym, idf / max(1, len(split_identifier(sym.name))) ** 0.5)
+
+        if not scores:
+            return []
+
+        related = {os.path.normpath(p) for p in related_files}
+        ranked = []
+        for score, sym in scores.values():
+            if related and any(
+                sym.rel_path == p or sym.rel_path.endswith(os.sep + p) for p in related
+            ):
+                score += 0.5
+            ranked.append((-score, sym.rel_path, sym.start, sym))
+        ranked.sort(key=lambda r: r[:3])
+        return [r[3] for r in ranked[:limit]]
+
+    def render_context(self, symbols, budget=SYMBOL_CONTEXT_BUDGET):
+        """
+        심볼 본문을 프롬프트용 텍스트로 만듭니다.
+        - 전체 글자 수가 budget을 넘는 심볼은 건너뜀
+        - 바깥 심볼을 이미 넣었으면 그 안의 메서드는 중복으로 넣지 않음
+        """
+        blocks = []
+        used = 0
+        taken = []
+        for sym in symbols:
+            sym = self._current_symbol(sym)
+            if sym is None:
+                continue
+            if any(
+                t.rel_path == sym.rel_path and t.start <= sym.start and sym.end <= t.end
+                for t in taken
+            ):
+                continue
+            try:
+                body = read_symbol_body(
+                    os.path.join(self.root, sym.rel_path),
+                    sym.start,
+                    sym.end,
+                    MAX_SYMBOL_LINES,
+                )
+            except OSError:
+                continue
+            block = (
+                f"# {sym.rel_path}:{sym.start}-{sym.end} ({sym.kind} {sym.qualname})\n"
+                f"{body}"
+            )
+            if used + len(block) > budget:
+                continue
+            blocks.append(block)
+            taken.append(sym)
+            used += len(block)
+        return "\n\n".join(blocks)
+
+    # ── 저장/로드 ────────────────────────────────────────────
+    def save(self, cache_dir):
+        if not self.dirty:
+            return
+        path = os.path.join(cache_dir, SYMBOL_FILE_NAME)
+        data = {
+            "version": SYMBOL_VERSION,
+            "root": self.root,
+            "files": {
+                rel_path: [size, mtime, [s.to_list() for s in symbols]]
+                for rel_path, (size, mtime, symbols) in self.files.items()
+            },
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, cache_dir, root):
+        """저장된 색인을 읽습니다. 없거나 버전/루트가 다르면 빈 색인."""
+        index = cls(root)
+        path = os.path.join(cache_dir, SYMBOL_FILE_NAME)
+        if not os.path.exists(path):
+            return index
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != SYMBOL_VERSION or data.get("root") != index.root:
+                return index
+            for rel_path, (size, mtime, rows) in data["files"].items():
+                symbols = [Symbol(r[0], r[1], r[2], rel_path, *r[3:]) for r in rows]
+                index.files[rel_path] = [size, mtime, symbols]
+                index._link(symbols)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"[색인 경고] {path} 읽기 실패, 다시 생성: {e}")
+            return cls(root)
+        return index
@@ -0,0 +1,222 @@
+import re
+import math
+from functools import lru_cache
+
+# 📌 프롬프트 토큰 계산 / 모델별 예산 적용
+#   - 실제 토크나이저 없이 모델 계열별 특성(영어 글자/토큰, 한글 음절당 토큰 등)으로 근사
+#   - 같은 문자열(트리 구조, 함수 요약 등)은 매 요청마다 다시 세지 않도록 LRU 캐시
+#   - 예산을 넘으면 우선순위가 낮은 섹션부터 줄 단위로 잘라내고, 그래도 넘으면 생략
+
+DEFAULT_NUM_CTX = 4096
+RESPONSE_RESERVE_TOKENS = 512  # 모델 답변용으로 남겨 둘 토큰
+FINAL_PROMPT_TOKEN_BUDGET = 16000  # 최종 프롬프트(외부 GPT에 붙여넣기용) 예산
+
+# 모델 이름 접두어 → Ollama num_ctx (요청 시 같은 값을 options.num_ctx 로 보냄)
+MODEL_NUM_CTX = {
+    "phi3": 4096,
+    "mistral": 8192,
+    "llama3": 8192,
+    "qwen2": 8192,
+    "gemma": 8192,
+}
+
+
+class TokenizerProfile:
+    """모델 계열별 토크나이저 근사치"""
+
+    def __init__(
+        self, name, chars_per_token, hangul_per_char, digits_per_token, other_per_char
+    ):
+        self.name = name
+        self.chars_per_token = chars_per_token  # 영문 단어: 토큰당 글자 수
+        self.hangul_per_char = hangul_per_char  # 한글 음절당 토큰 수
+        self.digits_per_token = digits_per_token  # 숫자: 토큰당 자릿수
+        # 이모지 등 비 ASCII 기호 한 글자당 토큰 수
+        self.other_per_char = other_per_char
+
+
+# 128k 어휘 BPE (llama3, qwen 등) / 32k SentencePiece (llama2, mistral, phi3) / 256k (gemma)
+TOKENIZER_PROFILES = {
+    "bpe128k": TokenizerProfile("bpe128k", 4.0, 1.0, 3, 2.0),
+    "sp32k": TokenizerProfile("sp32k", 3.2, 2.2, 1, 3.0),
+    "sp256k": TokenizerProfile("sp256k", 4.0, 0.8, 1, 2.0),
+}
+MODEL_TOKENIZERS = {
+    "llama3": "bpe128k",
+    "qwen": "bpe128k",
+    "deepseek": "bpe128k",
+    "llama2": "sp32k",
+    "codellama": "sp32k",
+    "mistral": "sp32k",
+    "phi3": "sp32k",
+    "gemma": "sp256k",
+}
+DEFAULT_TOKENIZER = "sp32k"  # 모르는 모델은 보수적으로(토큰을 많게) 계산
+
+_PIECE_RE = re.compile(r"[가-힣]+|[A-Za-z]+|\d+|[ \t]+|\n+|.", re.S)
+
+
+def _lookup_prefix(table, model, default):
+    name = (model or "").lower()
+    best = None
+    for prefix in table:
+        if name.startswith(prefix) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return table[best] if best else default
+
+
+def get_tokenizer_profile(model):
+    return TOKENIZER_PROFILES[
+        _lookup_prefix(MODEL_TOKENIZERS, model, DEFAULT_TOKENIZER)
+    ]
+
+
+def get_num_ctx(model):
+    return _lookup_prefix(MODEL_NUM_CTX, model, DEFAULT_NUM_CTX)
+
+
+def _estimate(profile, text):
+    tokens = 0.0
+    for piece in _PIECE_RE.findall(text):
+        c = piece[0]
+        if "가" <= c <= "힣":
+            tokens += len(piece) * profile.hangul_per_char
+        elif c.isascii() and c.isalpha():
+            tokens += math.ceil(len(piece) / profile.chars_per_token)
+        elif c.isdigit():
+            tokens += math.ceil(len(piece) / profile.digits_per_token)
+        elif c == "\n":
+            tokens += len(piece)
+        elif c in " \t":
+            # 단어 앞 공백 하나는 단어 토큰에 붙음, 들여쓰기는 대략 4칸당 1토큰
+            tokens += 0 if len(piece) == 1 else math.ceil(len(piece) / 4)
+        elif c.isascii():
+            tokens += 1
+        else:
+            tokens += profile.other_per_char
+    return int(math.ceil(tokens))
+
+
+@lru_cache(maxsize=1024)
+def _count_cached(profile_name, text):
+    return _estimate(TOKENIZER_PROFILES[profile_name], text)
+
+
+def count_tokens(text, model=None):
+    """model 계열에 맞춘 토큰 수 근사치 (같은 문자열은 캐시)"""
+    if not text:
+        return 0
+    return _count_cached(get_tokenizer_profile(model).name, text)
+
+
+class PromptSection:
+    """
+    프롬프트의 한 섹션.
+    - priority가 높을수록 예산이 부족할 때 나중에 잘림
+    - required=True 섹션(사용자 요청 등)은 자르지 않음
+    - fallback(문자열 또는 함수)이 있으면 넘칠 때 앞에서 자르기 전에 그 본문으로 대체
+      (예: 전체 트리 대신 관련 파일 주변만 남긴 트리) — 함수는 필요할 때만 호출
+    """
+
+    def __init__(self, key, title, body, priority, required=False, fallback=None):
+        self.key = key
+        self.title = title
+        self.body = body or "(없음)"
+        self.priority = priority
+        self.required = required
+        self.fallback = fallback
+        self.tokens = 0
+        self.original_tokens = 0
+        self.truncated = False
+        self.dropped = False
+
+    def render(self):
+        return f"{self.title}\n{self.body}"
+
+
+class BudgetReport:
+    def __init__(self, model, budget, sections, total):
+        self.model = model
+        self.budget = budget
+        self.sections = sections
+        self.total = total  # 섹션 구분자 포함
+
+    @property
+    def over_budget(self):
+        return self.total > self.budget
+
+    def summary(self):
+        """상태 표시줄용: '🧮 2,310/3,584 토큰 | 구조 1,200✂️ · 요청 20'"""
+        parts = []
+        for s in sorted(self.sections, key=lambda s: -s.tokens):
+            mark = "🚫" if s.dropped else ("✂️" if s.truncated else "")
+            parts.append(f"{s.key} {s.tokens:,}{mark}")
+        head = f"🧮 {self.total:,}/{self.budget:,} 토큰"
+        return f"{head} | " + " · ".join(parts) if parts else head
+
+
+def _truncate_lines(title, body, max_tokens, model):
+    """body를 앞에서부터 max_tokens 안에 들어가는 줄까지만 남긴 문자열 (불가능하면 None)"""
+    profile = get_tokenizer_profile(model)
+    lines = body.splitlines()
+    note = f"... ({len(lines)}줄 생략: 토큰 예산 초과)"
+    used = count_tokens(title + "\n", model) + _estimate(profile, note)
+    kept = 0
+    for line in lines:
+        # 줄 단위 계산은 캐시를 오염시키지 않도록 직접 계산
+        cost = _estimate(profile, line + "\n")
+        if used + cost > max_tokens:
+            break
+        used += cost
+        kept += 1
+    if kept == 0:
+        return None
+    omitted = len(lines) - kept
+    return "\n".join(lines[:kept]) + f"\n... ({omitted}줄 생략: 토큰 예산 초과)"
+
+
+def fit_sections(sections, budget, model=None, separator="\n\n"):
+    """
+    섹션들을 budget 토큰 안에 맞춥니다.
+    - 넘치면 priority가 낮은 섹션부터 (fallback이 있으면 먼저 대체하고) 줄 단위로 자르고,
+      한 줄도 못 넣으면 생략
+    Returns:
+        (str, BudgetReport): 완성된 프롬프트와 섹션별 토큰 내역
+    """
+    sep_tokens = count_tokens(separator, model)
+    for s in sections:
+        s.tokens = s.original_tokens = count_tokens(s.render(), model)
+
+    def total():
+        live = [s for s in sections if not s.dropped]
+        return sum(s.tokens for s in live) + sep_tokens * max(0, len(live) - 1)
+
+    for s in sorted((s for s in sections if not s.required), key=lambda s: s.priority):
+        over = total() - budget
+        if over <= 0:
+            break
+        target = limit = s.tokens - over
+        original = s.body
+        fallback = s.fallback() if callable(s.fallback) else s.fallback
+        if fallback:
+            original = s.body = fallback
+            s.tokens = count_tokens(s.render(), model)
+            s.truncated = True
+            if s.tokens <= target:
+                continue
+        while True:
+            body = _truncate_lines(s.title, original, limit, model)
+            if body is None:
+                s.dropped = True
+                s.tokens = 0
+                break
+            s.body = body
+            s.tokens = count_tokens(s.render(), model)
+            s.truncated = True
+            if s.tokens <= target:
+                break
+            # 줄별 합과 전체 계산이 조금 다를 수 있으므로 넘친 만큼 더 줄여 다시
+            limit -= s.tokens - target
+
+    text = separator.join(s.render() for s in sections if not s.dropped)
+    return text, BudgetReport(model, budget, sections, total())
@@ -0,0 +1,320 @@
+import os
+import json
+import math
+import struct
+
+# 📌 관련 파일 검색용 trigram 색인 (.gptcache/trigram_index.bin)
+#   - 파일 내용의 모든 3글자 조각(한글 포함, 대소문자 구분) → 파일 ID 목록
+#   - 파일 끝 2글자는 2글자 키로 따로 색인 (2글자 키워드의 부분 문자열 검색용)
+#   - 게시 목록(posting)은 ID 차이값 varint 로 압축해 메모리에 보관
+#   - 바뀐/삭제된 파일은 tombstone 처리 후 새 ID로 다시 색인, 일정 비율이 넘으면 압축
+
+INDEX_FILE_NAME = "trigram_index.bin"
+INDEX_MAGIC = b"GPTTRI1\n"
+MAX_INDEXED_SIZE = 1 << 20  # 이보다 큰 파일(번들/압축본)은 색인하지 않고 직접 검사
+COMPACT_DEAD_RATIO = 0.25
+
+LIVE, LARGE, BAD, DEAD = "ok", "large", "bad", "dead"
+
+
+def _append_varint(buf, n):
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _decode_postings(buf):
+    ids = []
+    cur = -1
+    acc = 0
+    shift = 0
+    for b in buf:
+        acc |= (b & 0x7F) << shift
+        if b & 0x80:
+            shift += 7
+        else:
+            cur += acc
+            ids.append(cur)
+            acc = 0
+            shift = 0
+    return ids
+
+
+class TrigramIndex:
+    def __init__(self, root, extensions):
+        self.root = os.path.abspath(root)
+        self.extensions = set(extensions)
+        self.files = []  # id → [rel_path, size, mtime, state]
+        self.by_path = {}  # rel_path → 살아 있는 id
+        self.postings = {}  # key → bytearray (varint delta)
+        self.last_id = {}  # key → 마지막으로 추가한 id
+        self.dead = 0
+        self.dirty = False
+        self._prefix = None  # 2글자 → 그 글자로 시작하는 key 목록 (지연 생성)
+
+    # ── 색인 갱신 ─────────────────────────────────────────────
+    def _add_key(self, key, file_id):
+        buf = self.postings.get(key)
+        if buf is None:
+            buf = self.postings[key] = bytearray()
+            self._prefix = None
+        _append_varint(buf, file_id - self.last_id.get(key, -1))
+        self.last_id[key] = file_id
+
+    def _add_file(self, entry):
+        file_id = len(self.files)
+        record = [entry.rel_path, entry.size, entry.mtime, LIVE]
+        self.files.append(record)
+        self.by_path[entry.rel_path] = file_id
+        self.dirty = True
+
+        if entry.size > MAX_INDEXED_SIZE:
+            record[3] = LARGE
+            return
+        try:
+            with open(entry.path, "r", encoding="utf-8") as f:
+                content = f.read()
+        except Exception:
+            record[3] = BAD  # 기존 find_related_files 처럼 읽을 수 없는 파일은 제외
+            return
+
+        for key in {content[i : i + 3] for i in range(len(content) - 2)}:
+            self._add_key(key, file_id)
+        if len(content) >= 2:
+            self._add_key(content[-2:], file_id)
+
+    def _kill(self, file_id):
+        self.files[file_id][3] = DEAD
+        self.dead += 1
+        self.dirty = True
+
+    def update(self, manifest):
+        """
+        manifest와 비교해 추가/변경/삭제된 파일만 다시 색인합니다.
+        Returns:
+            int: 다시 색인한 파일 수
+        """
+        live = {e.rel_path: e for e in manifest.iter_files(None, self.extensions)}
+        changed = 0
+
+        for rel_path, file_id in list(self.by_path.items()):
+            entry = live.get(rel_path)
+            _, size, mtime, _ = self.files[file_id]
+            if entry is None or entry.size != size or entry.mtime != mtime:
+                del self.by_path[rel_path]
+                self._kill(file_id)
+
+        for rel_path, entry in live.items():
+            if rel_path not in self.by_path:
+                self._add_file(entry)
+                changed += 1
+
+        if self.files and self.dead > len(self.files) * COMPACT_DEAD_RATIO:
+            self.compact()
+        return changed
+
+    def compact(self):
+        """tombstone 된 ID를 제거하고 ID를 다시 매깁니다."""
+        remap = {}
+        files = []
+        for old_id, record in enumerate(self.files):
+            if record[3] != DEAD:
+                remap[old_id] = len(files)
+                files.append(record)
+
+        postings = {}
+        last_id = {}
+        for key, buf in self.postings.items():
+            new_buf = bytearray()
+            prev = -1
+            for old_id in _decode_postings(buf):
+                new_id = remap.get(old_id)
+                if new_id is not None:
+                    _append_varint(new_buf, new_id - prev)
+                    prev = new_id
+            if new_buf:
+                postings[key] = new_buf
+                last_id[key] = prev
+
+        self.files = files
+        self.by_path = {rec[0]: i for i, rec in enumerate(files)}
+        self.postings = postings
+        self.last_id = last_id
+        self.dead = 0
+        self._prefix = None
+        self.dirty = True
+
+    # ── 검색 ─────────────────────────────────────────────────
+    def _ids_for_key(self, key):
+        buf = self.postings.get(key)
+        return set(_decode_postings(buf)) if buf else set()
+
+    def _candidates(self, keyword):
+        """keyword를 부분 문자열로 가질 수 있는 파일 ID 집합 (상위 집합)"""
+        if len(keyword) >= 3:
+            grams = {keyword[i : i + 3] for i in range(len(keyword) - 2)}
+            # 짧은 게시 목록부터 교집합
+            result = None
+            for key in sorted(grams, key=lambda k: len(self.postings.get(k, b""))):
+                ids = self._ids_for_key(key)
+                result = ids if result is None else result & ids
+                if not result:
+                    return set()
+            return result
+
+        if len(keyword) == 2:
+            if self._prefix is None:
+                prefix = {}
+                for key in self.postings:
+                    prefix.setdefault(key[:2], []).append(key)
+                self._prefix = prefix
+            result = set()
+            for key in self._prefix.get(keyword, []):
+                result |= self._ids_for_key(key)
+            return result
+
+        return {i for i, rec in enumerate(self.files) if rec[3] == LIVE}
+
+    def search(self, keywords, base_dir=None, limit=None):
+        """
+        keywords 중 하나라도 (부분 문자열로) 포함하는 파일을 관련도 순으로 반환합니다.
+        - 후보: 키워드별 trigram 게시 목록 교집합 → 키워드 간 합집합
+        - 점수: 희귀한 키워드(idf)일수록, 등장 횟수가 많을수록 높음
+        - 반환 파일은 실제 내용으로 부분 문자열 포함 여부를 확인 (기존 동작과 동일)
+        - limit이 있으면 상위 max(limit * 4, 20)개 후보를 확인하고, 통과한 파일이 limit개보다
+          적으면 다음 후보를 계속 확인 (trigram 거짓 양성 때문에 결과가 모자라지 않게)
+        Returns:
+            list[str]: base_dir 기준 상대 경로
+        """
+        keywords = sorted({k for k in keywords if k})
+        if not keywords:
+            return []
+
+        base_rel = ""
+        if base_dir:
+            base_rel = os.path.relpath(os.path.abspath(base_dir), self.root)
+            base_rel = "" if base_rel == os.curdir else base_rel + os.sep
+
+        live_count = max(1, len(self.files) - self.dead)
+        large_ids = [i for i, rec in enumerate(self.files) if rec[3] == LARGE]
+
+        coarse = {}
+        idf = {}
+        for kw in keywords:
+            ids = self._candidates(kw)
+            idf[kw] = math.log(1 + live_count / (1 + len(ids)))
+            for i in ids:
+                coarse[i] = coarse.get(i, 0.0) + idf[kw]
+        for i in large_ids:
+            coarse.setdefault(i, 0.0)
+
+        ordered = sorted(
+            (
+                i
+                for i in coarse
+                if self.files[i][3] in (LIVE, LARGE)
+                and self.files[i][0].startswith(base_rel)
+            ),
+            key=lambda i: (-coarse[i], self.files[i][0]),
+        )
+        window = max(limit * 4, 20) if limit is not None else len(ordered)
+
+        scored = []
+        for checked, i in enumerate(ordered):
+            if checked >= window and len(scored) >= limit:
+                break
+            rel_path = self.files[i][0]
+            try:
+                with open(
+                    os.path.join(self.root, rel_path), "r", encoding="utf-8"
+                ) as f:
+                    content = f.read()
+            except Exception:
+                continue
+            score = 0.0
+            for kw in keywords:
+                count = content.count(kw)
+                if count:
+                    score += idf[kw] * (1 + math.log(count))
+            if score > 0:
+                scored.append((-score, rel_path))
+
+        scored.sort()
+        if limit is not None:
+            scored = scored[:limit]
+        return [rel_path[len(base_rel) :] for _, rel_path in scored]
+
+    # ── 저장/로드 ────────────────────────────────────────────
+    def save(self, cache_dir):
+        if not self.dirty:
+            return
+        path = os.path.join(cache_dir, INDEX_FILE_NAME)
+        header = json.dumps(
+            {
+                "root": self.root,
+                "extensions": sorted(self.extensions),
+                "files": self.files,
+                "dead": self.dead,
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(INDEX_MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            for key, buf in self.postings.items():
+                k = key.encode("utf-8", "surrogatepass")
+                f.write(struct.pack("<BIi", len(k), len(buf), self.last_id[key]))
+                f.write(k)
+                f.write(buf)
+        os.replace(tmp_path, path)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, cache_dir, root, extensions):
+        """저장된 색인을 읽습니다. 없거나 형식/루트/확장자가 다르면 빈 색인."""
+        index = cls(root, extensions)
+        path = os.path.join(cache_dir, INDEX_FILE_NAME)
+        if not os.path.exists(path):
+            return index
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            if not data.startswith(INDEX_MAGIC):
+                return index
+            pos = len(INDEX_MAGIC)
+            (header_len,) = struct.unpack_from("<I", data, pos)
+            pos += 4
+            header = json.loads(data[pos : pos + header_len].decode("utf-8"))
+            pos += header_len
+            if header["root"] != index.root or set(header["extensions"]) != set(
+                extensions
+            ):
+                return index
+
+            postings = {}
+            last_id = {}
+            while pos < len(data):
+                klen, plen, last = struct.unpack_from("<BIi", data, pos)
+                pos += 9
+                key = data[pos : pos + klen].decode("utf-8", "surrogatepass")
+                pos += klen
+                postings[key] = bytearray(data[pos : pos + plen])
+                last_id[key] = last
+                pos += plen
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            print(f"[색인 경고] {path} 읽기 실패, 다시 생성: {e}")
+            return cls(root, extensions)
+
+        index.files = header["files"]
+        index.dead = header["dead"]
+        index.by_path = {
+            rec[0]: i for i, rec in enumerate(index.files) if rec[3] != DEAD
+        }
+        index.postings = postings
+        index.last_id = last_id
+        return index
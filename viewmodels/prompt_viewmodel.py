@@ -1,35 +1,123 @@
 import os
 import json
+import hashlib
+import threading
 from utils.keyword_utils import extract_keywords
-from utils.file_matcher import find_related_files
+from utils.file_matcher import find_related_files, SUPPORTED_EXTS
 from utils.context_builder import infer_project_context
 from models.project_model import ProjectContext
-from utils.ollama_manager import apply_ollama_model, get_installed_models
-from utils.parser_utils import get_project_tree, extract_functions
-
-
-def initialize_model_on_start(viewmodel):
-    installed_models = get_installed_models()
-    if "phi3:mini" in installed_models:
-        apply_ollama_model("phi3:mini")
-        viewmodel.set_current_model("phi3:mini")
-        print("기본 모델 'phi3:mini' 자동 적용됨.")
-    else:
-        print("'phi3:mini'가 설치되어 있지 않음.")
+from utils.ollama_manager import apply_ollama_model, list_ollama_models
+from utils.model_residency import DEFAULT_KEEP_ALIVE
+from utils.parser_utils import build_project_trie, extract_functions
+from utils.path_trie import PathTrie
+from utils.project_scanner import scan_project
+from utils.file_cache import FileRecordCache
+from utils.trigram_index import TrigramIndex
+from utils.symbol_index import SymbolIndex
+from utils.ollama_client import FILE_SELECTION_RULES, prewarm_prompt
+from utils.token_budget import (
+    FINAL_PROMPT_TOKEN_BUDGET,
+    RESPONSE_RESERVE_TOKENS,
+    PromptSection,
+    count_tokens,
+    fit_sections,
+    get_num_ctx,
+)
+from utils.semantic_index import (
+    SEMANTIC_SEARCH_ENABLED,
+    SemanticIndex,
+    is_semantic_available,
+)
+from utils.project_watcher import ProjectWatcher
+from utils.response_cache import ResponseCache, make_cache_key
+from utils.request_scheduler import RequestScheduler
+from utils.model_race import RACE_MODES
+
+STREAM_OUTLINE_FILES = 30  # 구조가 넘칠 때 파일 선택 프롬프트에 남길 후보 파일 수
+
+# ✅ 세션 모드: 파일 선택 프롬프트의 앞부분(규칙 + 컨텍스트 + 구조)을 요청과 무관하게 고정
+#    → Ollama가 이전 요청의 프롬프트 캐시(KV)를 재사용해 뒤쪽 '내 요청'만 새로 평가
+PROMPT_SESSION_ENABLED = True
+SESSION_KEEP_ALIVE = DEFAULT_KEEP_ALIVE  # 요청 사이 모델(과 프롬프트 캐시) 유지 시간
+SESSION_REQUEST_RESERVE = 256  # 고정 접두부를 만들 때 '내 요청' 몫으로 남길 토큰
+PREWARM_TIMEOUT = 300
+REQUEST_TITLE = "### 🗣️ 내 요청:"
+# 동시 분석 요청 수 (None이면 OLLAMA_NUM_PARALLEL, 없으면 1)
+ANALYSIS_CONCURRENCY = None
+
+# ✅ 파일 선택 단계 모델 경주: 현재 모델 + 아래 모델들에 같은 요청을 동시에 보냄
+#    race = 먼저 온 유효한 답변 사용, fanout = 모든 답변의 파일 목록을 합침
+#    예) GPT_ASSISTANT_RACE_MODE=race GPT_ASSISTANT_RACE_MODELS=phi3:mini,qwen2.5:1.5b
+RACE_MODE = os.environ.get("GPT_ASSISTANT_RACE_MODE") or None
+RACE_MODELS = [
+    name.strip()
+    for name in os.environ.get("GPT_ASSISTANT_RACE_MODELS", "").split(",")
+    if name.strip()
+]
+
+
+DEFAULT_MODEL = "phi3:mini"
+
+
+def initialize_model_on_start(viewmodel, installed_models=None):
+    """
+    기본 모델이 설치돼 있으면 올리고(예열) 현재 모델로 지정합니다.
+    모델 로드까지 기다리므로 작업 스레드에서 호출 (창이 뜬 뒤 MainView가 실행)
+    Returns:
+        str | None: 적용한 모델 이름 (그 사이 사용자가 모델을 골랐거나 미설치면 None)
+    """
+    if installed_models is None:
+        installed_models = list_ollama_models()
+    if DEFAULT_MODEL not in installed_models:
+        print(f"'{DEFAULT_MODEL}'가 설치되어 있지 않음.")
+        return None
+    apply_ollama_model(DEFAULT_MODEL)
+    if viewmodel.get_current_model():
+        return None  # 예열하는 동안 사용자가 다른 모델을 적용함
+    viewmodel.set_current_model(DEFAULT_MODEL)
+    print(f"기본 모델 '{DEFAULT_MODEL}' 자동 적용됨.")
+    return DEFAULT_MODEL
 
 
 class PromptViewModel:
     def __init__(self):
         self.context = ProjectContext()
         self.cache_dir = None
+        self.manifest = None
+        self.related_index = None
+        self.symbol_index = None
+        self.file_cache = None
+        self.watcher = None
+        self._on_watch_update = None
+        # 감시 스레드와 UI 스레드가 같은 manifest/색인 사용
+        self._lock = threading.RLock()
+        self.semantic_enabled = SEMANTIC_SEARCH_ENABLED
+        self.semantic_index = None
+        self._semantic_thread = None
+        self._semantic_pending = False
         self.used_cache = False
         self.current_model = None
         self.last_ollama_result = None
+        self.last_token_report = None
         self.stop_flag = False
-        initialize_model_on_start(self)
-
-    def stop_streaming(self):
+        # 분석 요청마다 번호/대기열/취소 (동시 실행 수 = Ollama 병렬 슬롯 수)
+        self.scheduler = RequestScheduler(ANALYSIS_CONCURRENCY)
+        self.response_cache = None
+        self.index_version = ""  # 구조/함수/설정 요약이 바뀌면 달라짐 (응답 캐시 키)
+        self.session_mode = PROMPT_SESSION_ENABLED
+        self._stream_prefix = None  # ((모델, index_version), 고정 섹션들)
+        self.race_mode = RACE_MODE if RACE_MODE in RACE_MODES else None
+        self.race_models = list(RACE_MODELS)
+        self.race_wins = {}  # 모델 → 경주에서 이긴 횟수
+        self.last_race = None
+
+    def stop_streaming(self, request_id=None):
+        """요청 하나(request_id) 또는 진행 중인 모든 분석 요청을 중지"""
+        if request_id is not None:
+            return self.scheduler.cancel(request_id)
         self.stop_flag = True
+        self.scheduler.cancel_all()
+        return True
 
     def reset_stop_flag(self):
         self.stop_flag = False
@@ -38,11 +126,66 @@ class PromptViewModel:
         return self.stop_flag
 
     def set_current_model(self, model_name):
+        changed = model_name != self.current_model
         self.current_model = model_name
+        if changed and self.context.project_path:
+            self.prewarm_stream_prefix()
 
     def get_current_model(self):
         return self.current_model
 
+    def set_race_mode(self, mode, models=None):
+        """mode: None(끄기) | "race" | "fanout", models: 현재 모델과 함께 보낼 모델들"""
+        if mode is not None and mode not in RACE_MODES:
+            raise ValueError(f"알 수 없는 경주 모드: {mode}")
+        self.race_mode = mode
+        if models is not None:
+            self.race_models = list(models)
+
+    def race_models_for(self, model):
+        """이번 요청을 보낼 모델들 (현재 모델이 먼저, 경주 모드가 아니면 현재 모델만)"""
+        if self.race_mode is None:
+            return [model]
+        return [model] + [m for m in self.race_models if m != model]
+
+    def record_race(self, result):
+        self.last_race = result
+        if result.winner is not None and not result.cancelled:
+            self.race_wins[result.winner] = self.race_wins.get(result.winner, 0) + 1
+
+    def project_files(self):
+        """code_root 기준 프로젝트 파일 상대 경로 (경주 답변 검사용)"""
+        tree = self.context.project_tree
+        return list(tree.iter_files()) if tree else []
+
+    def _get_manifest(self):
+        # ✅ 캐시로 로드한 경우에도 첫 요청 시 한 번만 스캔
+        if self.manifest is None and self.context.project_path:
+            self.manifest = scan_project(self.context.project_path)
+        return self.manifest
+
+    def _get_related_index(self):
+        # ✅ 관련 파일 검색용 trigram 색인: .gptcache에서 읽고 바뀐 파일만 다시 색인
+        if self.related_index is None and self.context.project_path:
+            manifest = self._get_manifest()
+            index = TrigramIndex.load(self.cache_dir, manifest.root, SUPPORTED_EXTS)
+            reindexed = index.update(manifest)
+            index.save(self.cache_dir)
+            print(f"🔎 관련 파일 색인: {len(index.by_path)}개 (재색인 {reindexed}개)")
+            self.related_index = index
+        return self.related_index
+
+    def _get_symbol_index(self):
+        # ✅ 함수/클래스/메서드 심볼 색인: 이름 → 파일/줄 범위/시그니처
+        if self.symbol_index is None and self.context.project_path:
+            manifest = self._get_manifest()
+            index = SymbolIndex.load(self.cache_dir, manifest.root)
+            reindexed = index.update(manifest)
+            index.save(self.cache_dir)
+            print(f"🧩 심볼 색인: {len(index)}개 (재추출 {reindexed}개 파일)")
+            self.symbol_index = index
+        return self.symbol_index
+
     def _ensure_cache_dir(self, folder_path):
         cache_path = os.path.join(folder_path, ".gptcache")
         os.makedirs(cache_path, exist_ok=True)
@@ -66,13 +209,84 @@ class PromptViewModel:
         )
         return subdirs_with_py_count[0] if subdirs_with_py_count else folder_path
 
+    def _rebuild_from_manifest(self):
+        """현재 manifest 기준으로 트리/함수 요약/관련 파일 색인을 갱신하고 캐시 파일에 기록"""
+        code_root = self.context.code_root
+        self.context.set_project_tree(build_project_trie(code_root, self.manifest))
+
+        # ✅ 파일별 캐시 기록으로 추가/변경된 파일만 다시 분석
+        if self.file_cache is None:
+            self.file_cache = FileRecordCache(self.cache_dir, code_root)
+        else:
+            self.file_cache.reset_stats()
+        self.context.function_summary = extract_functions(
+            code_root, self.manifest, self.file_cache
+        )
+        self.file_cache.save()
+        print("♻️ 증분 분석:", self.file_cache.summary_text())
+
+        if self.related_index is None:
+            self._get_related_index()
+        else:
+            self.related_index.update(self.manifest)
+            self.related_index.save(self.cache_dir)
+        if self.symbol_index is None:
+            self._get_symbol_index()
+        else:
+            self.symbol_index.update(self.manifest)
+            self.symbol_index.save(self.cache_dir)
+
+        self._schedule_semantic_update()
+
+        with open(
+            os.path.join(self.cache_dir, "structure.txt"), "w", encoding="utf-8"
+        ) as f:
+            f.write(self.context.tree_structure)
+        with open(
+            os.path.join(self.cache_dir, "functions.txt"), "w", encoding="utf-8"
+        ) as f:
+            f.write(self.context.function_summary)
+        self._update_index_version()
+
+    def _update_index_version(self):
+        digest = hashlib.blake2b(digest_size=8)
+        for text in (
+            self.context.tree_structure,
+            self.context.function_summary,
+            self.context.config_summary,
+        ):
+            digest.update(text.encode("utf-8"))
+            digest.update(b"\0")
+        self.index_version = digest.hexdigest()
+
     def load_project(self, folder_path, force_reload=False):
+        # 다른 폴더(또는 새로고침)로 다시 로드할 때는 감시를 잠시 멈췄다가 다시 시작
+        on_watch_update = self._on_watch_update
+        self.stop_watching()
+
+        with self._lock:
+            result = self._load_project(folder_path, force_reload)
+
+        if on_watch_update:
+            self.start_watching(on_watch_update)
+        self.prewarm_stream_prefix()
+        return result
+
+    def _load_project(self, folder_path, force_reload):
         src_path = os.path.join(folder_path, "src")
         target_path = src_path if os.path.exists(src_path) else folder_path
 
         self.context.project_path = folder_path
         self.context.code_root = target_path
         cache_path = self._ensure_cache_dir(folder_path)
+        self.manifest = None
+        self.related_index = None
+        self.symbol_index = None
+        self.semantic_index = None
+        self.file_cache = None
+        if self.response_cache is not None:
+            self.response_cache.flush()  # 이전 프로젝트의 예약된 저장을 먼저 끝냄
+        self.response_cache = ResponseCache(cache_path)
 
         tree_path = os.path.join(cache_path, "structure.txt")
         func_path = os.path.join(cache_path, "functions.txt")
@@ -83,38 +297,147 @@ class PromptViewModel:
         ):
             self.used_cache = True
             with open(tree_path, encoding="utf-8") as f:
-                self.context.tree_structure = f.read()
+                tree_text = f.read()
+            self.context.set_project_tree(PathTrie.from_text(tree_text))
+            self.context.tree_structure = tree_text
             with open(func_path, encoding="utf-8") as f:
                 self.context.function_summary = f.read()
             with open(config_path, encoding="utf-8") as f:
                 self.context.config_summary = f.read()
         else:
-            self.used_cache = False
-            self.context.tree_structure = get_project_tree(target_path)
-            self.context.function_summary = extract_functions(target_path)
+            # ✅ 폴더 순회는 한 번만: 트리/함수/설정 추론이 같은 manifest를 사용
+            self.manifest = scan_project(folder_path)
+            self._rebuild_from_manifest()
+            self.used_cache = self.file_cache.stats["reused"] > 0
 
             if os.path.exists(config_path):
                 with open(config_path, encoding="utf-8") as f:
                     self.context.config_summary = f.read()
             else:
-                inferred_config = infer_project_context(folder_path)
+                inferred_config = infer_project_context(folder_path, self.manifest)
                 self.context.config_summary = "\n".join(
                     f"- {k}: {v}" for k, v in inferred_config.items()
                 )
                 with open(config_path, "w", encoding="utf-8") as f:
                     f.write(self.context.config_summary)
 
-            with open(tree_path, "w", encoding="utf-8") as f:
-                f.write(self.context.tree_structure)
-            with open(func_path, "w", encoding="utf-8") as f:
-                f.write(self.context.function_summary)
-
+        self._update_index_version()
         print("📂 구조 요약:", self.context.tree_structure[:100])
         print("🧠 함수 요약:", self.context.function_summary[:100])
         print("⚙️ 설정 요약:", self.context.config_summary[:100])
 
         return True, "프로젝트 로드 성공", self.used_cache
 
+    # ✅ 파일 감시 (선택 기능): 바뀐 디렉토리만 다시 읽어 컨텍스트를 최신으로 유지
+    def apply_fs_changes(self, changed_dirs):
+        """
+        감시 스레드에서 호출됩니다.
+        :param changed_dirs: 바뀐 디렉토리(프로젝트 기준 상대 경로) 집합, None이면 전체 스캔
+        """
+        with self._lock:
+            if not self.context.project_path:
+                return False
+            if changed_dirs is None or self.manifest is None:
+                self.manifest = scan_project(self.context.project_path)
+            else:
+                self.manifest.rescan_dirs(changed_dirs)
+            previous_version = self.index_version
+            self._rebuild_from_manifest()
+        if self.index_version != previous_version:
+            self.prewarm_stream_prefix()
+        return True
+
+    def start_watching(self, on_update=None):
+        """
+        프로젝트 폴더 감시 시작.
+        :param on_update: 변경 반영이 끝난 뒤 감시 스레드에서 호출할 콜백
+        """
+        if not self.context.project_path:
+            return False
+        self.stop_watching()
+
+        def on_change(changed_dirs):
+            if self.apply_fs_changes(changed_dirs) and on_update:
+                on_update()
+
+        self.watcher = ProjectWatcher(self.context.project_path, on_change)
+        self.watcher.start()
+        self._on_watch_update = on_update or (lambda: None)
+        print(f"👁️ 파일 감시 시작 ({self.watcher.mode}): {self.context.project_path}")
+        return True
+
+    def stop_watching(self):
+        watcher, self.watcher = self.watcher, None
+        self._on_watch_update = None
+        if watcher:
+            watcher.stop()
+            print("👁️ 파일 감시 중지")
+
+    def is_watching(self):
+        return self.watcher is not None
+
+    # ✅ 임베딩 기반 의미 검색 (선택 기능): 색인은 백그라운드에서 바뀐 파일만 임베딩
+    def set_semantic_search(self, enabled):
+        if enabled and not is_semantic_available():
+            print("❌ 의미 검색에는 NumPy가 필요합니다. (pip install numpy)")
+            return False
+        self.semantic_enabled = enabled
+        if enabled:
+            self._schedule_semantic_update()
+        return True
+
+    def _schedule_semantic_update(self):
+        if not (self.semantic_enabled and self.context.project_path):
+            return
+        if self._semantic_thread is not None and self._semantic_thread.is_alive():
+            self._semantic_pending = True  # 진행 중인 갱신이 끝나면 한 번 더
+            return
+        self._semantic_thread = threading.Thread(
+            target=self._run_semantic_update, daemon=True
+        )
+        self._semantic_thread.start()
+
+    def _run_semantic_update(self):
+        while True:
+            self._semantic_pending = False
+            project_path = self.context.project_path
+            with self._lock:
+                manifest = self._get_manifest()
+                symbol_index = self._get_symbol_index()
+                entries = list(manifest.iter_files())
+                symbols_by_path = {p: rec[2] for p, rec in symbol_index.files.items()}
+                index = self.semantic_index
+                if index is None or index.root != manifest.root:
+                    index = SemanticIndex(self.cache_dir, manifest.root)
+
+            try:
+                embedded = index.update(
+                    entries,
+                    symbols_by_path,
+                    should_stop=lambda: self.context.project_path != project_path,
+                )
+                print(
+                    f"🧠 의미 검색 색인: {len(index.rows)}행 (임베딩 {embedded}개 파일)"
+                )
+            except Exception as e:
+                print(f"[의미 검색 경고] 임베딩 실패: {e}")
+
+            with self._lock:
+                if self.context.project_path == project_path:
+                    self.semantic_index = index
+            if not self._semantic_pending:
+                return
+
+    def _semantic_hits(self, user_input, limit=10):
+        index = self.semantic_index
+        if not (self.semantic_enabled and index and index.is_ready()):
+            return []
+        try:
+            return index.search(user_input, limit=limit)
+        except Exception as e:
+            print(f"[의미 검색 경고] 조회 실패: {e}")
+            return []
+
     # ✅ 스트리밍 중 받은 결과 최종 저장
     def set_last_ollama_result(self, result: str):
         self.last_ollama_result = result.strip()
@@ -123,53 +446,299 @@ class PromptViewModel:
         return self.last_ollama_result or "(없음)"
 
     # 🔽 PromptViewModel 내부에 추가
-    def build_stream_prompt(self, user_input: str) -> str:
+    def build_stream_prompt(self, user_input: str, model=None) -> str:
         if not user_input:
             return "요청 내용을 입력하세요."
 
-        context_info = self.context.config_summary or (
+        model = model or self.get_current_model()
+        request = PromptSection("요청", REQUEST_TITLE, user_input, 100, required=True)
+        if self.session_mode:
+            # 고정 접두부 + 요청 (요청이 예약분보다 길면 구조가 더 잘릴 수 있음)
+            sections = self._stream_prefix_sections(model) + [request]
+        else:
+            # 구조가 넘치면 키워드에 걸린 파일 주변만 남긴 트리로 대체
+            sections = [
+                PromptSection(
+                    "컨텍스트", "### 🔧 프로젝트 컨텍스트", self._context_info(), 90
+                ),
+                PromptSection(
+                    "구조",
+                    "### 📁 프로젝트 구조",
+                    self.context.tree_structure,
+                    30,
+                    fallback=lambda: self._keyword_tree_outline(user_input),
+                ),
+                request,
+            ]
+        return self._fit_prompt(sections, self._stream_budget(model), model)
+
+    def _context_info(self):
+        return self.context.config_summary or (
             "\n".join(
                 f"- {k}: {v}"
                 for k, v in infer_project_context(
-                    self.context.project_path or "."
+                    self.context.project_path or ".", self._get_manifest()
                 ).items()
             )
         )
 
-        prompt_parts = [
-            f"### 🔧 프로젝트 컨텍스트\n{context_info or '(없음)'}",
-            f"### 📁 프로젝트 구조\n{self.context.tree_structure or '(없음)'}",
-            f"### 🗣️ 내 요청:\n{user_input}",
-        ]
+    def _stream_budget(self, model):
+        # ✅ Ollama 파일 선택 단계: 모델 num_ctx - 답변 몫 - 규칙 문구 안에 맞춤
+        return (
+            get_num_ctx(model)
+            - RESPONSE_RESERVE_TOKENS
+            - count_tokens(FILE_SELECTION_RULES, model)
+        )
 
-        return "\n\n".join(prompt_parts)
+    def _stream_prefix_sections(self, model):
+        """세션 모드의 고정 섹션 (같은 모델/프로젝트 상태면 바이트 단위로 동일)"""
+        key = (model, self.index_version)
+        cached = self._stream_prefix
+        if cached is None or cached[0] != key:
+            context = PromptSection(
+                "컨텍스트", "### 🔧 프로젝트 컨텍스트", self._context_info(), 90
+            )
+            budget = self._stream_budget(model) - SESSION_REQUEST_RESERVE
+            structure_budget = budget - count_tokens(context.render() + "\n\n", model)
+            sections = [
+                context,
+                # 요청마다 다른 키워드 트리 대신 폴더 요약으로 대체 (접두부가 바뀌지 않게)
+                PromptSection(
+                    "구조",
+                    "### 📁 프로젝트 구조",
+                    self.context.tree_structure,
+                    30,
+                    fallback=lambda: self._directory_outline(structure_budget, model),
+                ),
+            ]
+            fit_sections(sections, budget, model)
+            fixed = [
+                (s.key, s.title, s.body, s.priority) for s in sections if not s.dropped
+            ]
+            cached = self._stream_prefix = (key, fixed)
+        return [PromptSection(*args) for args in cached[1]]
+
+    def stream_prompt_prefix(self, model):
+        """세션 모드에서 모든 요청이 공유하는 프롬프트 앞부분 ('내 요청:' 제목까지)"""
+        sections = self._stream_prefix_sections(model)
+        return "\n\n".join(s.render() for s in sections) + f"\n\n{REQUEST_TITLE}\n"
+
+    def stream_keep_alive(self):
+        return SESSION_KEEP_ALIVE if self.session_mode else None
+
+    def prewarm_stream_prefix(self):
+        """
+        세션 모드: 고정 접두부를 백그라운드에서 미리 평가시켜 둠
+        (프로젝트 로드 직후, 모델 변경, 구조 변경 시) → 첫 질문부터 요청 부분만 평가
+        """
+        model = self.get_current_model()
+        if not (self.session_mode and model and self.context.project_path):
+            return False
+
+        def run():
+            try:
+                prewarm_prompt(
+                    model,
+                    self.stream_prompt_prefix(model),
+                    {"num_ctx": get_num_ctx(model)},
+                    keep_alive=SESSION_KEEP_ALIVE,
+                    timeout=PREWARM_TIMEOUT,
+                )
+            except Exception as e:
+                print(f"[예열 경고] 프롬프트 접두부 예열 실패: {e}")
+
+        threading.Thread(target=run, daemon=True).start()
+        return True
+
+    def _tree_outline(self, rel_paths):
+        """code_root 기준 파일들과 상위 폴더만 남긴 구조 텍스트 (없으면 "")"""
+        tree = self.context.project_tree
+        outline = tree.render_paths(rel_paths) if tree else ""
+        return f"(관련 파일 주변만 표시)\n{outline}" if outline else ""
+
+    def _directory_outline(self, max_tokens, model):
+        """
+        폴더만 남긴 구조 텍스트 (요청과 무관, 없으면 "")
+        max_tokens 안에 들어가는 가장 깊은 단계까지 (더 깊은 폴더는 파일 수로 요약)
+        """
+        tree = self.context.project_tree
+        if not tree:
+            return ""
+        title = "### 📁 프로젝트 구조\n(폴더만 표시: 전체 구조가 너무 큼)\n"
+        for depth in range(tree.max_dir_depth(), -1, -1):
+            outline = tree.render_dirs(depth)
+            if count_tokens(title + outline, model) <= max_tokens:
+                break
+        return f"(폴더만 표시: 전체 구조가 너무 큼)\n{outline}"
+
+    def _keyword_tree_outline(self, user_input, limit=STREAM_OUTLINE_FILES):
+        keywords = extract_keywords(user_input)
+        with self._lock:
+            files = find_related_files(
+                self.context.code_root,
+                keywords,
+                self._get_manifest(),
+                index=self._get_related_index(),
+                limit=limit,
+            )
+        return self._tree_outline(files)
+
+    def _fit_prompt(self, sections, budget, model):
+        prompt, report = fit_sections(sections, budget, model)
+        self.last_token_report = report
+        print(report.summary())
+        return prompt
+
+    def response_cache_key(self, model, prompt, options=None):
+        """응답 캐시 키 (프로젝트가 로드되지 않았으면 None)"""
+        if self.response_cache is None:
+            return None
+        return make_cache_key(model, prompt, options, self.index_version)
+
+    def token_summary_text(self):
+        """상태 표시줄용 마지막 프롬프트 토큰 내역"""
+        if self.last_token_report is None:
+            return ""
+        return self.last_token_report.summary()
+
+    def _merge_semantic_files(self, related_files, semantic_hits, limit=5):
+        """키워드 검색 결과 뒤에 의미 검색 결과를 붙임 (의미 검색 몫으로 최소 2자리)"""
+        if not semantic_hits:
+            return related_files
+        code_rel = self.manifest.rel_dir(self.context.code_root) or ""
+        prefix = code_rel + os.sep if code_rel else ""
+        semantic_files = []
+        for _, rel_path, _, _, _ in semantic_hits:
+            if not rel_path.startswith(prefix):
+                continue
+            rel_path = rel_path[len(prefix) :]
+            if rel_path not in related_files and rel_path not in semantic_files:
+                semantic_files.append(rel_path)
+
+        keep = limit - min(2, len(semantic_files))
+        merged = related_files[:keep]
+        return (merged + semantic_files)[:limit]
+
+    def _semantic_symbols(self, symbol_index, semantic_hits, taken, limit=3):
+        """의미 검색 결과 중 심볼 행을 SymbolIndex의 Symbol로 변환"""
+        result = []
+        for _, rel_path, label, start, _ in semantic_hits:
+            if not label:
+                continue
+            for sym in symbol_index.lookup(label):
+                if sym.rel_path == rel_path and sym.start == start:
+                    if sym not in taken and sym not in result:
+                        result.append(sym)
+            if len(result) >= limit:
+                break
+        return result
+
+    def warm_indexes(self):
+        """관련 파일/심볼 색인을 지금 읽어 둠 (첫 조회가 색인 로드를 기다리지 않게)"""
+        with self._lock:
+            self._get_related_index()
+            self._get_symbol_index()
+
+    def search_related_files(self, user_input, limit=5):
+        """요청과 관련된 파일 (룰 기반, code_root 기준 상대 경로)"""
+        keywords = extract_keywords(user_input)
+        with self._lock:
+            return find_related_files(
+                self.context.code_root,
+                keywords,
+                self._get_manifest(),
+                index=self._get_related_index(),
+                limit=limit,
+            )
 
-    def generate_prompt(self, user_input):
+    def search_symbols(self, query, limit=5):
+        """정확한 식별자(이름, Class.method)면 그 심볼, 아니면 요청 문장으로 검색"""
+        with self._lock:
+            symbol_index = self._get_symbol_index()
+            if symbol_index is None:
+                return []
+            symbols = symbol_index.lookup(query.strip()) or symbol_index.search(
+                query, extract_keywords(query), limit=limit
+            )
+            return symbols[:limit]
+
+    def render_symbols(self, symbols):
+        """심볼 본문 텍스트 (최종 프롬프트의 '관련 함수/클래스 코드'와 같은 형식)"""
+        with self._lock:
+            symbol_index = self._get_symbol_index()
+            return symbol_index.render_context(symbols) if symbol_index else ""
+
+    def generate_prompt(self, user_input, ollama_result=None):
+        """
+        최종 프롬프트. ollama_result를 주면 마지막 분석 결과 대신 사용
+        (여러 요청이 동시에 끝나도 각자 자기 분석 결과로 만들도록)
+        """
         if not user_input:
             return "요청 내용을 입력하세요."
 
         keywords = extract_keywords(user_input)
-        related_files = find_related_files(self.context.code_root, keywords)
-        related_files_text = "\n".join(f"- {f}" for f in related_files[:5]) or "(없음)"
-
-        context_info = self.context.config_summary or (
-            "\n".join(
-                f"- {k}: {v}"
-                for k, v in infer_project_context(
-                    self.context.project_path or "."
-                ).items()
+        semantic_hits = self._semantic_hits(user_input)
+        with self._lock:
+            related_files = find_related_files(
+                self.context.code_root,
+                keywords,
+                self._get_manifest(),
+                index=self._get_related_index(),
+                limit=5,
             )
-        )
-
-        prompt_parts = [
-            f"### 🔧 프로젝트 컨텍스트\n{context_info or '(없음)'}",
-            f"### 📁 프로젝트 구조\n{self.context.tree_structure or '(없음)'}",
-            f"### 🤖 Ollama 분석 결과\n{self.get_last_ollama_result()}",
-            f"### 📂 관련 파일 추천 (룰 기반)\n{related_files_text}",
-            f"### 🗣️ 내 요청:\n{user_input}",
+            related_files = self._merge_semantic_files(related_files, semantic_hits)
+            symbol_text = ""
+            outline_paths = list(related_files)
+            symbol_index = self._get_symbol_index()
+            if symbol_index is not None:
+                symbols = symbol_index.search(
+                    user_input, keywords, related_files, limit=5
+                )
+                symbols += self._semantic_symbols(symbol_index, semantic_hits, symbols)
+                symbol_text = symbol_index.render_context(symbols)
+                code_rel = self.manifest.rel_dir(self.context.code_root) or ""
+                outline_paths += [
+                    os.path.relpath(sym.rel_path, code_rel or os.curdir)
+                    for sym in symbols
+                ]
+        related_files_text = "\n".join(f"- {f}" for f in related_files[:5]) or "(없음)"
+        related_source = "룰 기반 + 의미 검색" if semantic_hits else "룰 기반"
+
+        # ✅ 최종 프롬프트: 예산이 부족하면 구조 → 함수 코드 → 분석 결과 순으로 줄임
+        #    (구조는 먼저 관련 파일/함수가 있는 폴더만 남긴 트리로 대체)
+        sections = [
+            PromptSection(
+                "컨텍스트", "### 🔧 프로젝트 컨텍스트", self._context_info(), 90
+            ),
+            PromptSection(
+                "구조",
+                "### 📁 프로젝트 구조",
+                self.context.tree_structure,
+                30,
+                fallback=self._tree_outline(outline_paths),
+            ),
+            PromptSection(
+                "분석",
+                "### 🤖 Ollama 분석 결과",
+                (
+                    ollama_result.strip()
+                    if ollama_result is not None
+                    else self.get_last_ollama_result()
+                ),
+                60,
+            ),
+            PromptSection(
+                "관련 파일",
+                f"### 📂 관련 파일 추천 ({related_source})",
+                related_files_text,
+                80,
+            ),
+            PromptSection("함수 코드", "### 🧩 관련 함수/클래스 코드", symbol_text, 50),
+            PromptSection("요청", REQUEST_TITLE, user_input, 100, required=True),
         ]
-
-        return "\n\n".join(prompt_parts)
+        return self._fit_prompt(
+            sections, FINAL_PROMPT_TOKEN_BUDGET, self.get_current_model()
+        )
 
     def is_cache_used(self):
         return self.used_cache
@@ -10,12 +10,17 @@ from ttkbootstrap import Style
 from controllers.model_controller import ModelController
 from controllers.project_controller import ProjectController
 from viewmodels.prompt_viewmodel import viewmodel  # 전역 ViewModel
+from utils.ollama_health import get_health_monitor
 
 from views.layout_builder import (
     build_main_layout,
     build_top_frame,
 )
-from views.ollama_section import setup_ollama_controls, update_ollama_button
+from views.ollama_section import (
+    setup_ollama_controls,
+    refresh_model_dropdown,
+    load_models_async,
+)
 from controllers.popup_handlers import show_model_apply_result_popup
 from views.sidebar_section import setup_sidebar
 from views.status_section import build_status_section
@@ -45,6 +50,8 @@ class MainView(tk.Tk):
 
         self._setup_ui()
         self.update_current_model_label()
+        # ✅ 모델 목록/기본 모델 예열은 창을 그린 뒤 백그라운드에서
+        self.after_idle(lambda: load_models_async(self))
 
     def _resource_path(self, relative_path):
         """PyInstaller 환경에서도 리소스 경로를 올바르게 가져오기 위한 함수"""
@@ -74,11 +81,17 @@ class MainView(tk.Tk):
             self.status_frame,
             on_open_project=self.on_open_project,
             on_refresh=self.on_refresh,
+            on_toggle_watch=self.on_toggle_watch,
+            on_toggle_semantic=self.on_toggle_semantic,
         )
         self.select_button = status_widgets["select_button"]
         self.refresh_button = status_widgets["refresh_button"]
+        self.watch_var = status_widgets["watch_var"]
+        self.semantic_var = status_widgets["semantic_var"]
+        self.semantic_var.set(self.viewmodel.semantic_enabled)
         self.cache_label = status_widgets["cache_label"]
         self.status_label = status_widgets["status_label"]
+        self.token_label = status_widgets["token_label"]
 
         # ✅ 입력/출력 프롬프트 영역 구성 (prompt_section.py에서 분리 관리)
         setup_prompt_controls(self.right_frame, self)
@@ -90,17 +103,13 @@ class MainView(tk.Tk):
 
     def on_refresh(self):
         self.project_controller.reload_project()
-        update_ollama_button(self)
-
-    def start_ollama_status_thread(self):
-        def check_loop():
-            import time
+        get_health_monitor().check_now()
 
-            while True:
-                self.after(0, lambda: update_ollama_button(self))
-                time.sleep(10)
+    def on_toggle_watch(self, enabled):
+        self.project_controller.set_watch(enabled)
 
-        threading.Thread(target=check_loop, daemon=True).start()
+    def on_toggle_semantic(self, enabled):
+        self.project_controller.set_semantic_search(enabled)
 
     def update_current_model_label(self):
         current = self.viewmodel.get_current_model()
@@ -110,21 +119,69 @@ class MainView(tk.Tk):
             self.status_label.config(text="GPT 상태: ❌")
 
     def on_apply_model(self):
-        selected = self.model_var.get()
-        if not selected:
+        model = self.model_controller.find_model(self.model_var.get())
+        if model is None:
             messagebox.showwarning("모델 선택", "먼저 사용할 모델을 선택하세요.")
             return
 
-        self.model_controller.selected_model = next(
-            (m for m in self.model_controller.models if m.name == selected), None
-        )
+        selected = model.name
+        self.model_controller.selected_model = model
 
-        success = self.model_controller.apply_selected_model(selected)
-        if success:
-            self.update_current_model_label()
-        else:
-            self.status_label.config(text="❌ 모델 적용 실패")
-        show_model_apply_result_popup(selected, success)
+        # 큰 모델은 올리는 데 오래 걸릴 수 있으므로 작업 스레드에서 (상태는 드롭다운 옆에 표시)
+        self.apply_model_btn.config(state="disabled")
+        self.status_label.config(text=f"⏳ {selected} 올리는 중...")
+
+        def run():
+            success = self.model_controller.apply_selected_model(selected)
+            self.after(0, lambda: finish(success))
+
+        def finish(success):
+            self.apply_model_btn.config(state="normal")
+            if success:
+                self.update_current_model_label()
+            else:
+                self.status_label.config(text="❌ 모델 적용 실패")
+            show_model_apply_result_popup(selected, success)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def on_benchmark_models(self):
+        """설치된 모델을 모두 측정 (작업 스레드) → 드롭다운에 점수 표시, 가장 빠른 모델 선택"""
+        if not self.model_controller.models:
+            messagebox.showwarning("속도 측정", "측정할 모델이 없습니다.")
+            return
+        if not messagebox.askyesno(
+            "속도 측정",
+            "설치된 모델을 하나씩 올려 같은 분석 프롬프트로 측정합니다.\n"
+            "모델 수와 크기에 따라 몇 분 걸릴 수 있습니다. 진행할까요?",
+        ):
+            return
+        self.benchmark_button.config(state="disabled")
+
+        def on_progress(done, total, model, message):
+            self.after(
+                0,
+                lambda: self.status_label.config(
+                    text=f"⏱️ 모델 측정 {done}/{total}: {model.name}"
+                ),
+            )
+
+        def run():
+            fastest = self.model_controller.benchmark_models(on_progress)
+            self.after(0, lambda: finish(fastest))
+
+        def finish(fastest):
+            self.benchmark_button.config(state="normal")
+            refresh_model_dropdown(self, select=fastest.name if fastest else None)
+            if fastest is not None and fastest.benchmark is not None:
+                self.status_label.config(
+                    text=f"🏁 가장 빠른 모델: {fastest.display_name()} "
+                    "('모델 적용'을 누르면 사용)"
+                )
+            else:
+                self.status_label.config(text="❌ 모델 측정 실패")
+
+        threading.Thread(target=run, daemon=True).start()
 
     def install_model_popup(self):
         import tkinter.simpledialog as simpledialog
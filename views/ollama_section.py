@@ -1,5 +1,6 @@
 # views/ollama_section.py
 
+import time
 import threading
 import tkinter as tk
 
@@ -8,13 +9,20 @@ import tkinter as tk
 from ttkbootstrap import ttk
 from tkinter import messagebox
 
-from viewmodels.prompt_viewmodel import viewmodel  # 전역 ViewModel
+from viewmodels.prompt_viewmodel import (
+    viewmodel,  # 전역 ViewModel
+    initialize_model_on_start,
+    DEFAULT_MODEL,
+)
+from utils.model_residency import POLL_INTERVAL, get_residency
+from utils.ollama_health import get_health_monitor
 from utils.ollama_manager import (
-    is_ollama_running,
     start_ollama_model_background,
     stop_ollama_process,
 )
 
+MODELS_LOADING_TEXT = "모델 목록 불러오는 중..."
+
 
 def setup_ollama_controls(parent, app):
     """
@@ -28,34 +36,19 @@ def setup_ollama_controls(parent, app):
         parent, text="🔄 Ollama 상태 확인 중...", command=lambda: toggle_ollama(app)
     )
     app.ollama_button.pack(side="left", padx=10, pady=10, anchor="w")
+    # 상태는 감시 스레드가 확인하고 바뀔 때만 알려줌
+    get_health_monitor().add_listener(
+        lambda snapshot: app.after(0, lambda: on_health_changed(app, snapshot))
+    )
     update_ollama_button(app)
 
-    # ✅ 모델 리스트 로드
-    models = app.model_controller.load_models()
-    model_names = [m.name for m in models]
-
-    # 모델 드롭다운
-    app.model_var = tk.StringVar()
+    # 모델 드롭다운 (목록은 창이 뜬 뒤 load_models_async 가 채움)
+    app.model_var = tk.StringVar(value=MODELS_LOADING_TEXT)
     app.model_dropdown = ttk.Combobox(
-        parent, textvariable=app.model_var, values=model_names, state="readonly"
+        parent, textvariable=app.model_var, state="readonly", width=40
     )
     app.model_dropdown.pack(side="left", padx=5, pady=5)
 
-    # # 기본 선택값 지정 (선택적)
-    # if model_names:
-    #     app.model_var.set(model_names[0])
-    #     app.viewmodel.set_current_model(model_names[0])
-
-    # 값이 목록에 있을 경우 해당 인덱스 선택
-    values = app.model_dropdown["values"]
-    current_model = viewmodel.get_current_model()
-
-    if values:  # 값이 있을 때만 처리
-        if isinstance(current_model, str) and current_model in values:
-            app.model_dropdown.current(values.index(current_model))
-        else:
-            app.model_dropdown.current(0)  # fallback
-
     # 모델 적용 버튼
     app.apply_model_btn = ttk.Button(
         parent, text="모델 적용", command=app.on_apply_model
@@ -68,29 +61,103 @@ def setup_ollama_controls(parent, app):
     )
     app.install_model_button.pack(side="left", padx=5, pady=5)
 
+    # 모델 속도 측정 버튼
+    app.benchmark_button = ttk.Button(
+        parent, text="속도 측정", command=app.on_benchmark_models
+    )
+    app.benchmark_button.pack(side="left", padx=5, pady=5)
+
+    # 모델 상주 상태 (올리는 중/로드됨/내려감): 선택 변경, 상태 변경, 주기적 /api/ps 확인 때 갱신
+    app.residency_label = ttk.Label(parent, text="")
+    app.residency_label.pack(side="left", padx=5, pady=5)
+    app.model_dropdown.bind(
+        "<<ComboboxSelected>>", lambda event: update_residency_label(app)
+    )
+    get_residency().add_listener(
+        lambda: app.after(0, lambda: update_residency_label(app))
+    )
+    start_residency_polling(app)
+
+
+def refresh_model_dropdown(app, select=None):
+    """
+    드롭다운 값을 모델 표시 이름으로 갱신하고 선택값 지정
+    (select → 사용 중인 모델 → 측정 결과가 가장 빠른 모델 순)
+    """
+    controller = app.model_controller
+    app.model_dropdown["values"] = controller.display_names()
+    model = (
+        controller.find_model(select or "")
+        or controller.find_model(viewmodel.get_current_model() or "")
+        or controller.select_fastest_model()
+    )
+    app.model_var.set(model.display_name() if model is not None else "")
+    update_residency_label(app)
+
+
+def update_residency_label(app):
+    """드롭다운에서 고른 모델(없으면 사용 중인 모델)의 상주 상태 표시"""
+    model = app.model_controller.find_model(app.model_var.get())
+    name = model.name if model is not None else viewmodel.get_current_model()
+    app.residency_label.config(text=get_residency().status_text(name) if name else "")
+
+
+def start_residency_polling(app, interval=POLL_INTERVAL):
+    """keep_alive 만료나 다른 프로그램 때문에 모델이 내려간 것도 표시되도록 주기적으로 확인"""
+
+    def loop():
+        residency = get_residency()
+        monitor = get_health_monitor()
+        while True:
+            if monitor.snapshot.up:
+                residency.refresh()
+            time.sleep(interval)
+
+    threading.Thread(target=loop, daemon=True).start()
+
+
+def load_models_async(app):
+    """
+    모델 목록 조회 → 드롭다운 채우기 → 기본 모델 예열을 작업 스레드에서 실행
+    (Ollama 응답/모델 로드를 기다리느라 창이 늦게 뜨지 않도록)
+    """
+
+    def run():
+        # ✅ 모델 리스트 로드 (속도 측정 결과가 있으면 이름 옆에 표시)
+        models = app.model_controller.load_models()
+        app.after(0, lambda: refresh_model_dropdown(app))
+
+        applied = initialize_model_on_start(viewmodel, [m.name for m in models])
+        if applied:
+            app.after(0, lambda: on_default_model_applied(applied))
 
-def update_ollama_status(app):
-    def check_status():
-        running = is_ollama_running()
-        app.after(
-            0,
-            lambda: app.submit_button.config(state="normal" if running else "disabled"),
-        )
+    def on_default_model_applied(name):
+        refresh_model_dropdown(app, select=name)
+        app.update_current_model_label()
 
-    threading.Thread(target=check_status, daemon=True).start()
+    threading.Thread(target=run, daemon=True).start()
 
 
-def update_ollama_button(app):
-    def check_and_update():
-        running = is_ollama_running()
-        label = "🟢 Ollama 실행 중" if running else "🔴 Ollama 꺼짐"
-        app.after(0, lambda: app.ollama_button.config(text=label))
+def update_ollama_status(app, snapshot=None):
+    """상태 스냅샷으로 제출 버튼 활성화 (네트워크 대기 없음, 분석 중에도 대기열에 추가 가능)"""
+    snapshot = snapshot or get_health_monitor().snapshot
+    app.submit_button.config(state="normal" if snapshot.up else "disabled")
 
-    threading.Thread(target=check_and_update, daemon=True).start()
+
+def update_ollama_button(app, snapshot=None):
+    snapshot = snapshot or get_health_monitor().snapshot
+    app.ollama_button.config(text=snapshot.status_text())
+
+
+def on_health_changed(app, snapshot):
+    update_ollama_button(app, snapshot)
+    # 첫 확인 전에는 켜져 있다고 보고 제출 버튼을 막지 않음
+    if snapshot.checked:
+        update_ollama_status(app, snapshot)
 
 
 def toggle_ollama(app):
-    if is_ollama_running():
+    if get_health_monitor().snapshot.up:
         confirm = messagebox.askyesno("Ollama 종료", "Ollama를 종료하시겠습니까?")
         if confirm:
             success = stop_ollama_process()
@@ -101,11 +168,12 @@ def toggle_ollama(app):
     else:
         confirm = messagebox.askyesno("Ollama 실행", "Ollama를 실행하시겠습니까?")
         if confirm:
-            model_name = app.viewmodel.selected_model.get()
+            model = app.model_controller.find_model(app.model_var.get())
+            model_name = model.name if model else DEFAULT_MODEL
             start_ollama_model_background(model_name)
             messagebox.showinfo(
                 "Ollama 실행됨", "새 CMD 창에서 Ollama가 실행되었습니다."
             )
 
-    update_ollama_status(app)
-    update_ollama_button(app)
+    # 켜고/끈 결과는 감시 스레드가 바로 다시 확인해서 알려줌
+    get_health_monitor().check_now()
@@ -1,12 +1,15 @@
 # views/prompt_section.py
 
-import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
 
 from controllers.output_handler import start_ollama_analysis
 from controllers.popup_handlers import show_custom_toast
+from utils.ollama_health import get_health_monitor
+from utils.request_scheduler import FAILED
 from viewmodels.prompt_viewmodel import viewmodel  # 전역 ViewModel
+from views.status_section import update_token_label
+from views.stream_renderer import StreamRenderer
 
 
 def setup_prompt_controls(parent, app):
@@ -16,6 +19,9 @@ def setup_prompt_controls(parent, app):
     :param app: MainView 인스턴스
     """
 
+    app.foreground_ticket = None  # 출력창을 쓰는 요청 표시 (on_user_submit)
+    app.foreground_request = None
+
     # 입력창
     app.input_entry = tk.Entry(parent, width=80)
     app.input_entry.pack(padx=10, pady=5, fill="x")
@@ -37,7 +43,9 @@ def setup_prompt_controls(parent, app):
 
     # 중지 버튼
     app.stop_button = tk.Button(
-        upper_btn_area, text="⛔ 답변 중지", command=lambda: viewmodel.stop_streaming()
+        upper_btn_area,
+        text="⛔ 답변 중지",
+        command=lambda: stop_foreground_request(app),
     )
     app.stop_button.grid(row=0, column=1, padx=5, pady=5, sticky="w")
 
@@ -71,79 +79,111 @@ def setup_prompt_controls(parent, app):
     app.func_summary_button.pack(side="left", padx=5)
 
 
-def append_streaming_token(app, token):
-    app.output_box.insert(tk.END, token)
-    app.output_box.see(tk.END)
-
-
-def run_ollama_stream_thread(app, user_input):
-    def on_token_callback(token):
-        app.after(0, lambda: append_streaming_token(app, token))
-
-    def on_complete_callback(final_result):
-        # ✅ 분석 결과 저장
-        app.viewmodel.set_last_ollama_result(final_result)
-
-        # ✅ 전체 prompt 구성 후 출력
-        full_prompt = app.viewmodel.generate_prompt(user_input)
-        app.after(0, lambda: update_output(app, full_prompt))
-
-    # ✅ 스트리밍 분석 시작
-    start_ollama_analysis(
-        app.viewmodel,
-        user_input=user_input,
-        on_token_callback=on_token_callback,
-        on_complete_callback=on_complete_callback,
-    )
-
-
 def on_user_submit(app):
     print("🧪 호출됨", app.project_loaded)
     user_input = app.input_entry.get()
     if not app.project_loaded:
         messagebox.showwarning("경고", "먼저 프로젝트를 열어주세요.")
         return
+    health = get_health_monitor().snapshot
+    if health.checked and not health.up:
+        messagebox.showwarning("경고", "Ollama가 꺼져 있습니다. 먼저 실행해주세요.")
+        return
 
-    app.viewmodel.reset_stop_flag()
-    app.status_label.config(text="⏳ GPT 응답 대기 중...")
-    app.submit_button.config(state="disabled")
-    app.output_box.delete("1.0", tk.END)
-
-    threading.Thread(
-        target=lambda: run_ollama_stream_thread(app, user_input),
-        daemon=True,
-    ).start()
+    # ✅ 출력창은 가장 최근 요청만 그림 (이전 요청은 백그라운드에서 끝까지 진행)
+    ticket = object()
+    previous_ticket = app.foreground_ticket
+    app.foreground_ticket = ticket
 
+    # 토큰은 버퍼에만 쌓고, 출력창은 프레임 단위(30~60Hz)로 한 번에 갱신
+    renderer = StreamRenderer(
+        app.output_box,
+        # 분석 단계 프롬프트의 토큰 내역 표시
+        on_first_flush=lambda: update_token_label(app),
+    )
 
-def run_gpt_prompt_thread(app, user_input):
-    app.output_box.delete("1.0", "end")
+    def is_foreground():
+        return app.foreground_ticket is ticket
 
     def on_token(token):
-        app.output_box.insert("end", token)
-        app.output_box.see("end")  # 자동 스크롤
-
-    def on_complete(full_result):
-        app.viewmodel.last_ollama_result = full_result
-        app.status_label.config(text="✅ 완료")
-        app.submit_button.config(state="normal")
-        app.show_custom_toast("프롬프트 생성이 완료되었습니다.")
-
-    prompt_text = app.viewmodel.build_stream_prompt(user_input)
-    from utils.ollama_client import ask_ollama_stream
-
-    ask_ollama_stream(
-        app.viewmodel.get_current_model(),
-        prompt_text,
-        on_token,
-        on_complete,
-        app.viewmodel.should_stop,
+        if is_foreground():
+            renderer.buffer.push(token)
+
+    def on_start(request):
+        app.after(0, lambda: start_render(request))
+
+    def start_render(request):
+        if is_foreground():
+            app.status_label.config(text=f"⏳ 요청 #{request.id} 응답 대기 중...")
+            app.output_box.delete("1.0", tk.END)
+            renderer.start()
+
+    def on_complete(request):
+        renderer.buffer.close()
+        if request.state == FAILED:
+            full_prompt = str(request.error)  # 실패 문구를 분석 결과로 쓰지 않음
+        else:
+            # ✅ 이 요청의 분석 결과로 전체 prompt 구성 (다른 요청 결과와 섞이지 않음)
+            full_prompt = app.viewmodel.generate_prompt(
+                user_input, request.result or ""
+            )
+        app.after(
+            0, lambda: finish_request(app, request, renderer, full_prompt, ticket)
+        )
+
+    # ✅ 스트리밍 분석 요청 (대기열/중복 합치기는 스케줄러가 처리)
+    request, is_new = start_ollama_analysis(
+        app.viewmodel,
+        user_input=user_input,
+        on_token_callback=on_token,
+        on_complete_callback=on_complete,
+        on_start=on_start,
     )
+    if not is_new:
+        # 같은 요청이 이미 대기/실행 중 → 새로 생성하지 않음 (출력창도 그대로)
+        app.foreground_ticket = previous_ticket
+        app.status_label.config(
+            text=f"⏳ 같은 요청(#{request.id})이 이미 진행 중입니다."
+        )
+        return
+
+    app.foreground_request = request
+    app.viewmodel.reset_stop_flag()
+    position = app.viewmodel.scheduler.queue_position(request)
+    if position is not None:
+        app.status_label.config(
+            text=f"⏳ 요청 #{request.id} 대기 중 (앞에 {position}개) · "
+            f"{app.viewmodel.scheduler.status_text()}"
+        )
+
+
+def stop_foreground_request(app):
+    """⛔ 답변 중지: 출력창에 보이는 요청만 중지 (다른 요청은 계속)"""
+    request = app.foreground_request
+    if request is not None and not request.finished:
+        app.viewmodel.stop_streaming(request.id)
+
+
+def finish_request(app, request, renderer, result, ticket):
+    print("🕒 요청 상태:", request.summary_text())
+    if app.foreground_ticket is not ticket:
+        # 더 최근 요청이 출력창을 쓰는 중 → 결과는 응답 캐시에 남고 알림만
+        show_custom_toast(app, f"요청 #{request.id}이 백그라운드에서 끝났습니다.")
+        return
+    renderer.finish()
+    print("🖋️ 스트림 렌더링:", renderer.summary_text())
+    update_output(app, result)
+    if request.state == FAILED:
+        app.status_label.config(text=f"⚠️ {request.summary_text()}")
+    else:
+        app.status_label.config(text=f"✅ 분석 완료 ({request.summary_text()})")
 
 
 def update_output(app, result):
     app.output_box.delete("1.0", tk.END)
     app.output_box.insert(tk.END, result)
     app.status_label.config(text="✅ 분석 완료")
+    update_token_label(app)
     app.submit_button.config(state="normal")
     show_custom_toast(app, "분석 결과가 정리되었습니다.")
     print("🧾 최종 프롬프트 출력:", result[:100])
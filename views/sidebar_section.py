@@ -1,7 +1,19 @@
 # views/sidebar_section.py
 
+import os
 import tkinter as tk
-from tkinter import scrolledtext
+from tkinter import ttk
+
+# 📌 프로젝트 구조 사이드바 (ttk.Treeview)
+#   - 폴더를 펼칠 때만 자식 항목을 만듦 (처음에는 루트 한 단계만)
+#   - 한 폴더의 자식은 TREE_CHUNK개씩 → 나머지는 "더 보기" 항목으로
+#   - 새로고침/자동 갱신 때는 이미 만든 항목만 새 트리와 비교해 추가/삭제 (펼침 상태 유지)
+#   - 항목 ID = code_root 기준 상대 경로 (루트는 ROOT_IID)
+
+TREE_CHUNK = 500
+ROOT_IID = "."
+_STUB_PREFIX = "::stub::"  # 펼침 화살표 표시용 빈 자식
+_MORE_PREFIX = "::more::"
 
 
 def setup_sidebar(parent, app):
@@ -22,19 +34,157 @@ def setup_sidebar(parent, app):
     )
     sidebar_label.pack(anchor="w")
 
-    app.tree_box = scrolledtext.ScrolledText(sidebar_frame, wrap=tk.WORD, width=40)
-    app.tree_box.pack(fill="both", expand=True)
-    app.tree_box.insert("1.0", "(아직 로드되지 않음)")
-    app.tree_box.config(state="disabled")
+    tree_frame = tk.Frame(sidebar_frame)
+    tree_frame.pack(fill="both", expand=True)
+
+    app.tree_view = ttk.Treeview(tree_frame, show="tree", selectmode="browse")
+    app.tree_view.column("#0", width=320, stretch=True)
+    scrollbar = ttk.Scrollbar(
+        tree_frame, orient="vertical", command=app.tree_view.yview
+    )
+    app.tree_view.configure(yscrollcommand=scrollbar.set)
+    scrollbar.pack(side="right", fill="y")
+    app.tree_view.pack(side="left", fill="both", expand=True)
+
+    app.tree_loaded = {}  # 자식을 만든 폴더 ID → 보여주는 자식 수
+    app.tree_project = None
+    app.tree_view.insert("", "end", text="(아직 로드되지 않음)")
+
+    app.tree_view.bind("<<TreeviewOpen>>", lambda e: _on_open(app))
+    app.tree_view.bind("<<TreeviewSelect>>", lambda e: _on_select(app))
 
     return sidebar_frame
 
 
+def _label(trie, node):
+    icon = "📁" if trie.is_dir[node] else "📄"
+    return f"{icon} {trie.name_of(node)}"
+
+
+def _path(iid):
+    return "" if iid == ROOT_IID else iid
+
+
+def _set_stub(view, trie, iid, node):
+    """펼치지 않은 폴더: 자식이 있을 때만 빈 자식 하나를 둬서 화살표 표시"""
+    stub = _STUB_PREFIX + iid
+    wanted = (stub,) if trie.is_dir[node] and len(trie.children(node)) else ()
+    existing = view.get_children(iid)
+    if existing == wanted:
+        return
+    if existing:
+        view.delete(*existing)
+    if wanted:
+        view.insert(iid, "end", iid=stub)
+
+
+def _fill(app, iid, node):
+    """iid 폴더의 자식 항목을 trie 기준으로 맞춤 (보여줄 개수 = tree_loaded[iid])"""
+    view = app.tree_view
+    trie = app.viewmodel.context.project_tree
+    children = trie.children(node)
+    shown = min(app.tree_loaded[iid], len(children))
+    base = _path(iid)
+
+    wanted = []
+    for child in children[:shown]:
+        kind = "dir" if trie.is_dir[child] else "file"
+        wanted.append((os.path.join(base, trie.name_of(child)), child, kind))
+
+    current = [c for c in view.get_children(iid) if not c.startswith("::")]
+    wanted_ids = [cid for cid, _, _ in wanted]
+    if current != wanted_ids:
+        keep = set(wanted_ids)
+        gone = [c for c in current if c not in keep]
+        if gone:
+            view.delete(*gone)
+        for index, (cid, child, kind) in enumerate(wanted):
+            if view.exists(cid) and view.item(cid, "tags") != (kind,):
+                view.delete(cid)  # 파일 ↔ 폴더로 바뀐 경우
+            if view.exists(cid):
+                view.move(cid, iid, index)
+                continue
+            view.insert(iid, index, iid=cid, text=_label(trie, child), tags=(kind,))
+            _set_stub(view, trie, cid, child)
+
+    # 자식을 만들지 않은 하위 폴더는 화살표 표시만 새 트리에 맞춤
+    for cid, child, kind in wanted:
+        if kind == "dir" and cid not in app.tree_loaded:
+            _set_stub(view, trie, cid, child)
+
+    for extra in (_STUB_PREFIX + iid, _MORE_PREFIX + iid):
+        if view.exists(extra):
+            view.delete(extra)
+    if shown < len(children):
+        view.insert(
+            iid,
+            "end",
+            iid=_MORE_PREFIX + iid,
+            text=f"… {len(children) - shown:,}개 더 보기",
+        )
+
+
+def _on_open(app):
+    iid = app.tree_view.focus()
+    trie = app.viewmodel.context.project_tree
+    if not iid or trie is None or iid in app.tree_loaded:
+        return
+    node = trie.find(_path(iid))
+    if node is None:
+        return
+    app.tree_loaded[iid] = TREE_CHUNK
+    _fill(app, iid, node)
+
+
+def _on_select(app):
+    selection = app.tree_view.selection()
+    if not selection or not selection[0].startswith(_MORE_PREFIX):
+        return
+    iid = selection[0][len(_MORE_PREFIX) :]
+    trie = app.viewmodel.context.project_tree
+    node = trie.find(_path(iid)) if trie is not None else None
+    if node is None or iid not in app.tree_loaded:
+        return
+    app.tree_loaded[iid] += TREE_CHUNK
+    _fill(app, iid, node)
+
+
 def update_tree_structure(app):
     """
-    ViewModel의 context로부터 프로젝트 트리 문자열을 불러와 출력창 갱신
+    ViewModel의 프로젝트 트리(PathTrie)로 사이드바 갱신
+    - 같은 프로젝트면 이미 펼친 폴더만 비교해서 바뀐 항목만 추가/삭제
     """
-    app.tree_box.config(state="normal")
-    app.tree_box.delete("1.0", tk.END)
-    app.tree_box.insert("1.0", app.viewmodel.context.tree_structure or "(없음)")
-    app.tree_box.config(state="disabled")
+    view = app.tree_view
+    context = app.viewmodel.context
+    trie = context.project_tree
+
+    if trie is None or context.project_path != app.tree_project:
+        view.delete(*view.get_children(""))
+        app.tree_loaded = {}
+        app.tree_project = context.project_path if trie is not None else None
+        if trie is None:
+            view.insert("", "end", text="(없음)")
+            return
+        view.insert(
+            "",
+            "end",
+            iid=ROOT_IID,
+            text=_label(trie, trie.ROOT),
+            open=True,
+            tags=("dir",),
+        )
+        app.tree_loaded[ROOT_IID] = TREE_CHUNK
+    else:
+        view.item(ROOT_IID, text=_label(trie, trie.ROOT))
+
+    # 부모 폴더부터 비교 (부모에서 지워진 폴더는 건너뜀)
+    for iid in sorted(
+        app.tree_loaded, key=lambda i: _path(i).count(os.sep) + bool(_path(i))
+    ):
+        if iid not in app.tree_loaded:
+            continue
+        node = trie.find(_path(iid))
+        if not view.exists(iid) or node is None or not trie.is_dir[node]:
+            del app.tree_loaded[iid]
+            continue
+        _fill(app, iid, node)
@@ -1,9 +1,17 @@
+import tkinter as tk
 import tkinter.ttk as ttk
 
 
-def build_status_section(parent, on_open_project, on_refresh):
+def build_status_section(
+    parent,
+    on_open_project,
+    on_refresh,
+    on_toggle_watch=None,
+    on_toggle_semantic=None,
+):
     """
-    프로젝트 열기 버튼, 새로고침 버튼, 캐시 상태 라벨, 상태 라벨을 포함한 섹션을 생성합니다.
+    프로젝트 열기 버튼, 새로고침 버튼, 자동 갱신(파일 감시)/의미 검색 체크박스,
+    캐시 상태 라벨, 상태 라벨을 포함한 섹션을 생성합니다.
     """
 
     frame = ttk.Frame(parent)
@@ -15,16 +23,47 @@ def build_status_section(parent, on_open_project, on_refresh):
     refresh_button = ttk.Button(frame, text="🔄 새로고침", command=on_refresh)
     refresh_button.pack(side="left", padx=(0, 5))
 
+    watch_var = tk.BooleanVar(value=False)
+    watch_check = ttk.Checkbutton(
+        frame,
+        text="👁️ 자동 갱신",
+        variable=watch_var,
+        command=lambda: on_toggle_watch and on_toggle_watch(watch_var.get()),
+    )
+    watch_check.pack(side="left", padx=(0, 5))
+
+    semantic_var = tk.BooleanVar(value=False)
+    semantic_check = ttk.Checkbutton(
+        frame,
+        text="🧠 의미 검색",
+        variable=semantic_var,
+        command=lambda: on_toggle_semantic and on_toggle_semantic(semantic_var.get()),
+    )
+    semantic_check.pack(side="left", padx=(0, 5))
+
     cache_label = ttk.Label(frame, text="❓ 캐시 상태 미정")
     cache_label.pack(side="left", padx=(10, 0))
 
     status_label = ttk.Label(frame, text="GPT 상태: ❌")
     status_label.pack(side="right")
 
+    # 마지막으로 만든 프롬프트의 섹션별 토큰 내역
+    token_label = ttk.Label(frame, text="")
+    token_label.pack(side="right", padx=(0, 10))
+
     return {
         "frame": frame,
         "select_button": select_button,
         "refresh_button": refresh_button,
+        "watch_var": watch_var,
+        "watch_check": watch_check,
+        "semantic_var": semantic_var,
+        "semantic_check": semantic_check,
         "cache_label": cache_label,
         "status_label": status_label,
+        "token_label": token_label,
     }
+
+
+def update_token_label(app):
+    app.token_label.config(text=app.viewmodel.token_summary_text())
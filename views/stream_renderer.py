@@ -0,0 +1,77 @@
+# views/stream_renderer.py
+
+import time
+import tkinter as tk
+
+from utils.stream_buffer import TokenBuffer
+
+# 📌 스트리밍 출력창 갱신 (토큰마다 after/insert/see 하지 않음)
+#   - 프레임마다 TokenBuffer를 비워 insert 한 번 + see 한 번
+#   - 기본 60Hz, 갱신이 느려지면(긴 줄, 큰 문서) 30Hz까지 주기를 늘리고 여유가 생기면 복귀
+
+MAX_FPS = 60
+MIN_FPS = 30
+
+
+class StreamRenderer:
+    def __init__(self, widget, buffer=None, on_first_flush=None):
+        self.widget = widget
+        self.buffer = buffer or TokenBuffer()
+        self.on_first_flush = on_first_flush
+        self.interval = 1.0 / MAX_FPS
+        self.flush_time = 0.0
+        self._after_id = None
+        self._running = False
+
+    def start(self):
+        """UI 스레드에서 호출"""
+        self._running = True
+        self._schedule()
+
+    def _schedule(self):
+        self._after_id = self.widget.after(int(self.interval * 1000), self._tick)
+
+    def _flush(self):
+        text = self.buffer.drain()
+        if not text:
+            return
+        start = time.perf_counter()
+        self.widget.insert(tk.END, text)
+        self.widget.see(tk.END)
+        cost = time.perf_counter() - start
+        self.flush_time += cost
+
+        # 프레임 예산의 절반 넘게 쓰면 주기를 늘리고, 여유가 있으면 다시 줄임
+        if cost > self.interval / 2:
+            self.interval = min(1.0 / MIN_FPS, self.interval * 1.5)
+        else:
+            self.interval = max(1.0 / MAX_FPS, self.interval * 0.9)
+
+        if self.on_first_flush:
+            callback, self.on_first_flush = self.on_first_flush, None
+            callback()
+
+    def _tick(self):
+        self._after_id = None
+        if not self._running:
+            return
+        self._flush()
+        if self.buffer.closed:
+            self._running = False
+            return
+        self._schedule()
+
+    def finish(self):
+        """UI 스레드에서 호출: 남은 토큰을 쓰고 갱신 중지"""
+        self.buffer.close()
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._running = False
+        self._flush()
+
+    def summary_text(self):
+        return (
+            f"{self.buffer.summary_text()}, "
+            f"출력창 갱신 {self.flush_time * 1000:.0f}ms"
+        )